@@ -0,0 +1,94 @@
+"""
+Задержка и пиковая память захвата областей экрана для способов mss и PIL
+
+Каждый замер выполняется в отдельном процессе, чтобы пиковое потребление
+памяти одного способа не влияло на другой.
+
+Запуск (на Linux без дисплея - в Xvfb, например тройной 4K рабочий стол):
+    xvfb-run -s "-screen 0 11520x2160x24" python -m benchmarks.capture
+    python -m benchmarks.capture --repeat 50
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import time
+
+from benchmarks.common import percentile
+from translator.utils.screenshot import ScreenCapture
+
+# Размеры областей: строка субтитров, окно и весь экран 4K
+REGIONS = {
+    "subtitle 800x120": (800, 120),
+    "window 1280x720": (1280, 720),
+    "screen 3840x2160": (3840, 2160)
+}
+
+def peak_memory():
+    """Пиковый объем памяти процесса в байтах"""
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # На Linux значение в килобайтах, на macOS - в байтах
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+
+def measure(backend, width, height, repeat):
+    """
+    Замер в дочернем процессе
+
+    Returns:
+        dict: задержка (мс) и прирост пиковой памяти (МБ) или описание ошибки
+    """
+    capture = ScreenCapture(backend)
+    if capture.backend != backend:
+        return {"error": f"способ {backend} недоступен"}
+
+    # Первый захват подключается к дисплею и не входит в замер
+    if capture.grab_area(0, 0, 16, 16) is None:
+        return {"error": "захват экрана недоступен"}
+    baseline = peak_memory()
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        image = capture.grab_area(0, 0, width, height)
+        latencies.append(time.perf_counter() - start)
+        if image is None:
+            return {"error": "область выходит за пределы экрана"}
+        del image
+
+    capture.cleanup()
+    return {
+        "latency_p50_ms": statistics.median(latencies) * 1000,
+        "latency_p95_ms": percentile(latencies, 0.95) * 1000,
+        "peak_memory_mb": (peak_memory() - baseline) / 2 ** 20
+    }
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Задержка и память захвата областей экрана")
+    parser.add_argument("--repeat", type=int, default=20, help="количество захватов каждой области")
+    parser.add_argument("--backends", nargs="*", default=[ScreenCapture.BACKEND_MSS, ScreenCapture.BACKEND_PIL],
+                        help="способы захвата")
+    args = parser.parse_args()
+
+    print(f"{'способ':<6} {'область':<18} {'p50, мс':>9} {'p95, мс':>9} {'память, МБ':>11}")
+    context = multiprocessing.get_context("spawn")
+    for backend in args.backends:
+        for name, (width, height) in REGIONS.items():
+            with context.Pool(1) as pool:
+                stats = pool.apply(measure, (backend, width, height, args.repeat))
+            if "error" in stats:
+                print(f"{backend:<6} {name:<18} {stats['error']}")
+                continue
+            print(
+                f"{backend:<6} {name:<18} {stats['latency_p50_ms']:>9.2f} "
+                f"{stats['latency_p95_ms']:>9.2f} {stats['peak_memory_mb']:>11.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Пропускная способность разовых захватов: последовательная обработка
+(захват, OCR и перевод одного снимка за другим, как в прежних потоках
+вкладок) и конвейер сервиса с этапами, связанными очередями
+
+Снимки - синтетические изображения с текстом, распознаются выбранным OCR
+движком; перевод имитируется задержкой ответа сервера (--translate-latency),
+чтобы не требовать ключа API; перевод поступает частями, как потоковый
+ответ сервера. Кроме полного времени обработки выводится время до первого
+результата, видимого пользователю (распознанного текста): при
+последовательной обработке текст показывался только вместе с переводом.
+Для конвейера выводится максимальная глубина очереди каждого этапа за
+время прогона.
+
+Запуск:
+    python -m benchmarks.capture_pipeline --jobs 20 --translate-latency 0.3
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from PyQt5.QtCore import QSettings
+
+from benchmarks.common import percentile
+from translator.utils.cancellation import CancelledError
+from translator.utils.ocr_backends import RapidOCRBackend
+from translator.utils.pipeline_service import PipelineService
+
+class SimulatedTranslationService(PipelineService):
+    """Сервис с имитацией задержки сервера перевода"""
+
+    def __init__(self, settings, latency):
+        super().__init__(settings, db_path=os.path.join(tempfile.mkdtemp(), "translations.db"))
+        self.latency = latency
+
+    def translate(self, text, source_lang, target_lang, cancel_token=None, on_delta=None):
+        # Слова ответа поступают равномерно за время задержки; отмена
+        # прерывает ожидание, как закрытие соединения в LLMTranslator
+        words = text.split(" ")
+        for index, word in enumerate(words):
+            delay = self.latency / len(words)
+            if cancel_token is None:
+                time.sleep(delay)
+            elif cancel_token.wait(delay):
+                raise CancelledError()
+            if on_delta is not None:
+                on_delta(word if index == 0 else " " + word)
+        return text
+
+def render_text(index, width=900, height=300):
+    """Синтетический снимок с несколькими строками текста (BGRA)"""
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", 24)
+    except OSError:
+        font = ImageFont.load_default()
+    for row in range(4):
+        draw.text((20, 20 + row * 60), f"Capture {index} line {row}: the quick brown fox", fill="black", font=font)
+    rgb = np.asarray(image)
+    return np.dstack([rgb[:, :, ::-1], np.full(rgb.shape[:2], 255, dtype=np.uint8)])
+
+def run_sequential(service, images, capture_time):
+    """
+    Последовательная обработка снимков
+
+    Returns:
+        tuple: (общее время, задержки заданий, задержки первого результата)
+    """
+    latencies = []
+    start = time.perf_counter()
+    for image in images:
+        begin = time.perf_counter()
+        time.sleep(capture_time)
+        engine = service.ocr_engine("area")
+        text = engine.result_to_text(engine.recognize(image))
+        service.translate(text, "en", "ru")
+        latencies.append(time.perf_counter() - begin)
+    # Текст и перевод отправлялись вкладке одним сигналом
+    return time.perf_counter() - start, latencies, latencies
+
+def run_pipeline(service, images, capture_time):
+    """
+    Обработка снимков конвейером сервиса
+
+    Returns:
+        tuple: (общее время, задержки заданий, задержки первого результата,
+            максимальные глубины очередей)
+    """
+    pipeline = service.capture_pipeline
+    latencies = []
+    first_content = []
+    max_depths = {stage.name: 0 for stage in pipeline.stages}
+    finished = threading.Event()
+
+    def monitor():
+        while not finished.is_set():
+            for name, depth in pipeline.queue_depths().items():
+                max_depths[name] = max(max_depths[name], depth)
+            finished.wait(0.005)
+
+    def grabber(image):
+        def grab():
+            time.sleep(capture_time)
+            return image
+        return grab
+
+    def done(job):
+        latencies.append(time.monotonic() - job.created)
+        first_content.append(job.timings.get("first_content", latencies[-1]))
+
+    watcher = threading.Thread(target=monitor, daemon=True)
+    watcher.start()
+    start = time.perf_counter()
+    for image in images:
+        # Снимки поступают быстрее, чем обрабатываются; при заполненной
+        # очереди захвата отправка ждет
+        service.submit_capture(grabber(image), "area", "en", "ru", callback=done, block=True)
+    pipeline.join()
+    elapsed = time.perf_counter() - start
+    finished.set()
+    watcher.join()
+    return elapsed, latencies, first_content, max_depths
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Последовательная обработка захватов и конвейер этапов")
+    parser.add_argument("--jobs", type=int, default=20, help="количество снимков")
+    parser.add_argument("--engine", default=RapidOCRBackend.name, help="OCR движок")
+    parser.add_argument("--capture-time", type=float, default=0.02, help="время захвата снимка в секундах")
+    parser.add_argument("--translate-latency", type=float, default=0.3, help="задержка перевода в секундах")
+    args = parser.parse_args()
+
+    settings = QSettings(os.path.join(tempfile.mkdtemp(), "settings.ini"), QSettings.IniFormat)
+    settings.setValue("ocr/engine", args.engine)
+    service = SimulatedTranslationService(settings, args.translate_latency)
+    images = [render_text(index) for index in range(args.jobs)]
+
+    # Прогрев: загрузка моделей OCR
+    engine = service.ocr_engine("area")
+    engine.recognize(images[0])
+    print(f"OCR движок: {engine.backend.name}, ядер: {os.cpu_count()}")
+
+    print(f"{'способ':<12} {'задач/с':>8} {'p50, с':>8} {'p95, с':>8} {'текст p50, с':>13}")
+    elapsed, latencies, first_content = run_sequential(service, images, args.capture_time)
+    print(f"{'sequential':<12} {len(images) / elapsed:>8.2f} "
+          f"{statistics.median(latencies):>8.2f} {percentile(latencies, 0.95):>8.2f} "
+          f"{statistics.median(first_content):>13.2f}")
+
+    elapsed, latencies, first_content, max_depths = run_pipeline(service, images, args.capture_time)
+    print(f"{'pipeline':<12} {len(images) / elapsed:>8.2f} "
+          f"{statistics.median(latencies):>8.2f} {percentile(latencies, 0.95):>8.2f} "
+          f"{statistics.median(first_content):>13.2f}")
+
+    print("\nэтап         обработчиков  макс. очередь  среднее время, с")
+    for item in service.capture_pipeline.stats():
+        print(f"{item['stage']:<12} {item['workers']:>12} {max_depths[item['stage']]:>14} {item['average']:>17.3f}")
+
+    service.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Общие функции для бенчмарков OCR
+"""
+
+import json
+import os
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+
+def load_dataset(dataset_dir, language="en"):
+    """
+    Загрузка набора изображений с эталонным текстом
+
+    Если в каталоге есть manifest.json, образцы берутся из него. Иначе каждому
+    изображению должен соответствовать файл <имя>.gt.txt с эталонным текстом.
+
+    Args:
+        dataset_dir: каталог с изображениями
+        language: язык образцов, если он не указан в манифесте
+
+    Returns:
+        list: список словарей {"image": путь, "text": эталон, "language": код языка}
+    """
+    manifest_path = os.path.join(dataset_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        samples = []
+        for sample in manifest["samples"]:
+            samples.append({
+                "image": os.path.join(dataset_dir, sample["image"]),
+                "text": sample["text"],
+                "language": sample.get("language", language)
+            })
+        return samples
+
+    samples = []
+    for filename in sorted(os.listdir(dataset_dir)):
+        if not filename.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        gt_path = os.path.join(dataset_dir, os.path.splitext(filename)[0] + ".gt.txt")
+        if not os.path.exists(gt_path):
+            continue
+        with open(gt_path, encoding="utf-8") as f:
+            text = f.read()
+        samples.append({
+            "image": os.path.join(dataset_dir, filename),
+            "text": text,
+            "language": language
+        })
+    return samples
+
+def percentile(values, fraction):
+    """Перцентиль по отсортированному списку (без интерполяции)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def normalize_text(text):
+    """Приведение текста к виду для сравнения: схлопывание пробельных символов"""
+    return " ".join(text.split())
+
+def character_error_rate(reference, hypothesis):
+    """
+    Доля ошибок на уровне символов (расстояние Левенштейна / длина эталона)
+
+    Args:
+        reference: эталонный текст
+        hypothesis: распознанный текст
+
+    Returns:
+        float: CER (0.0 - полное совпадение)
+    """
+    reference = normalize_text(reference)
+    hypothesis = normalize_text(hypothesis)
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_char in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_char in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_char != hyp_char)
+            ))
+        previous = current
+    return previous[-1] / len(reference)
@@ -0,0 +1,255 @@
+"""
+Генератор синтетического набора скриншотов с эталонным текстом
+
+Рисует строки на английском, русском и японском языках разными шрифтами,
+размерами, на разных фонах и с разными искажениями. Результат - каталог с
+изображениями и manifest.json в формате benchmarks.common.load_dataset.
+
+Запуск:
+    python -m benchmarks.corpus путь/к/набору --per-language 30 --seed 1
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+# Эталонные фразы: короткие строки интерфейса, реплики и абзацы
+PHRASES = {
+    "en": [
+        "File not found",
+        "Press any key to continue",
+        "Settings saved successfully",
+        "The quick brown fox jumps over the lazy dog",
+        "Do you want to save changes before closing?",
+        "Connection lost. Reconnecting in 5 seconds...",
+        "Level 12 completed! Score: 48 250",
+        "Open the door with the silver key",
+        "Download complete: 3 files, 24.5 MB",
+        "Your session will expire in 10 minutes",
+        "I told you not to go there alone.",
+        "New message from Alice: see you at 7 pm",
+    ],
+    "ru": [
+        "Файл не найден",
+        "Нажмите любую клавишу, чтобы продолжить",
+        "Настройки успешно сохранены",
+        "Съешь же ещё этих мягких французских булок",
+        "Сохранить изменения перед закрытием?",
+        "Соединение потеряно. Повторная попытка через 5 секунд",
+        "Уровень 12 пройден! Счёт: 48 250",
+        "Откройте дверь серебряным ключом",
+        "Загрузка завершена: 3 файла, 24,5 МБ",
+        "Сеанс завершится через 10 минут",
+        "Я же говорил тебе не ходить туда одной.",
+        "Новое сообщение от Алисы: увидимся в семь",
+    ],
+    "ja": [
+        "ファイルが見つかりません",
+        "続行するには何かキーを押してください",
+        "設定を保存しました",
+        "閉じる前に変更を保存しますか？",
+        "接続が切断されました。再接続しています",
+        "レベル12クリア！スコア：48250",
+        "銀の鍵で扉を開けてください",
+        "ダウンロード完了：3ファイル",
+        "セッションは10分後に終了します",
+        "一人で行くなと言ったでしょう。",
+        "アリスから新しいメッセージ",
+        "今日はいい天気ですね",
+    ],
+}
+
+# Каталоги системных шрифтов
+FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+]
+
+# Шаблоны имен файлов шрифтов с нужными символами
+FONT_PATTERNS = {
+    "en": ["DejaVu*", "Liberation*", "FreeSans*", "FreeSerif*", "Noto*Sans-*", "arial*", "times*", "verdana*", "tahoma*"],
+    "ru": ["DejaVu*", "Liberation*", "FreeSans*", "FreeSerif*", "Noto*Sans-*", "arial*", "times*", "verdana*", "tahoma*"],
+    "ja": ["Noto*CJK*", "NotoSansJP*", "SourceHan*", "ipa*", "Takao*", "VL-Gothic*", "msgothic*", "meiryo*", "YuGoth*", "Hiragino*"],
+}
+
+FONT_SIZES = [12, 14, 16, 20, 24, 32, 40]
+
+BACKGROUNDS = ["light", "dark", "gradient", "texture"]
+
+NOISE = ["none", "gaussian", "blur", "jpeg"]
+
+def find_fonts(language, font_dirs=FONT_DIRS):
+    """
+    Поиск файлов шрифтов, подходящих для языка
+
+    Args:
+        language: код языка
+        font_dirs: каталоги для поиска
+
+    Returns:
+        list: отсортированный список путей к шрифтам
+    """
+    fonts = set()
+    for font_dir in font_dirs:
+        if not os.path.isdir(font_dir):
+            continue
+        for pattern in FONT_PATTERNS[language]:
+            for extension in (".ttf", ".otf", ".ttc"):
+                fonts.update(glob.glob(os.path.join(font_dir, "**", pattern + extension), recursive=True))
+                fonts.update(glob.glob(os.path.join(font_dir, "**", pattern + extension.upper()), recursive=True))
+    return sorted(fonts)
+
+def render_background(rng, width, height, kind):
+    """
+    Фон изображения
+
+    Returns:
+        tuple: (изображение RGB, цвет текста)
+    """
+    if kind == "light":
+        shade = rng.randint(215, 255)
+        color = tuple(min(255, shade + rng.randint(-10, 10)) for _ in range(3))
+        return Image.new("RGB", (width, height), color), (rng.randint(0, 60),) * 3
+
+    if kind == "dark":
+        shade = rng.randint(10, 50)
+        color = tuple(max(0, shade + rng.randint(-8, 8)) for _ in range(3))
+        return Image.new("RGB", (width, height), color), (rng.randint(200, 255),) * 3
+
+    if kind == "gradient":
+        start = np.array([rng.randint(180, 255) for _ in range(3)], dtype=np.float32)
+        end = np.array([rng.randint(120, 200) for _ in range(3)], dtype=np.float32)
+        ramp = np.linspace(0.0, 1.0, width, dtype=np.float32)[None, :, None]
+        pixels = start + (end - start) * ramp
+        pixels = np.broadcast_to(pixels, (height, width, 3)).astype(np.uint8)
+        return Image.fromarray(pixels), (rng.randint(0, 40),) * 3
+
+    # Неоднородная текстура: шум низкой частоты поверх светлого фона
+    np_rng = np.random.default_rng(rng.randint(0, 2 ** 31))
+    coarse = np_rng.integers(170, 240, size=(max(1, height // 16), max(1, width // 16), 3), dtype=np.uint8)
+    texture = Image.fromarray(coarse).resize((width, height), Image.BILINEAR)
+    return texture, (rng.randint(0, 40),) * 3
+
+def apply_noise(rng, image, kind):
+    """Искажение изображения: гауссов шум, размытие или сжатие JPEG"""
+    if kind == "gaussian":
+        np_rng = np.random.default_rng(rng.randint(0, 2 ** 31))
+        pixels = np.asarray(image, dtype=np.int16)
+        pixels = pixels + np_rng.normal(0, rng.uniform(4, 14), pixels.shape).astype(np.int16)
+        return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    if kind == "blur":
+        return image.filter(ImageFilter.GaussianBlur(rng.uniform(0.4, 1.0)))
+    if kind == "jpeg":
+        from io import BytesIO
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", quality=rng.randint(25, 60))
+        buffer.seek(0)
+        return Image.open(buffer).convert("RGB")
+    return image
+
+def render_sample(rng, text, font_path, size, background, noise):
+    """
+    Отрисовка одного скриншота
+
+    Текст размещается в случайной позиции на холсте больше самого текста,
+    как на реальном снимке окна.
+
+    Returns:
+        Image: изображение RGB
+    """
+    font = ImageFont.truetype(font_path, size)
+    left, top, right, bottom = font.getbbox(text)
+    text_width, text_height = right - left, bottom - top
+
+    margin_x = rng.randint(size, size * 6)
+    margin_y = rng.randint(size // 2, size * 4)
+    width = text_width + margin_x * 2
+    height = text_height + margin_y * 2
+
+    image, color = render_background(rng, width, height, background)
+    draw = ImageDraw.Draw(image)
+    position = (rng.randint(size // 2, margin_x * 2 - size // 2) - left, rng.randint(size // 4, margin_y * 2 - size // 4) - top)
+    draw.text(position, text, font=font, fill=color)
+
+    return apply_noise(rng, image, noise)
+
+def generate(output_dir, per_language=30, languages=("en", "ru", "ja"), seed=0, font_dirs=FONT_DIRS):
+    """
+    Генерация набора
+
+    Args:
+        output_dir: каталог для изображений и manifest.json
+        per_language: количество изображений на язык
+        languages: коды языков
+        seed: зерно генератора случайных чисел (набор воспроизводим)
+        font_dirs: каталоги для поиска шрифтов
+
+    Returns:
+        dict: манифест набора
+    """
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {"seed": seed, "samples": []}
+
+    for language in languages:
+        fonts = find_fonts(language, font_dirs)
+        if not fonts:
+            print(f"Пропуск языка {language}: не найдены шрифты с нужными символами")
+            continue
+
+        for i in range(per_language):
+            text = rng.choice(PHRASES[language])
+            font_path = rng.choice(fonts)
+            size = rng.choice(FONT_SIZES)
+            background = rng.choice(BACKGROUNDS)
+            noise = rng.choice(NOISE)
+
+            try:
+                image = render_sample(rng, text, font_path, size, background, noise)
+            except OSError as e:
+                print(f"Ошибка шрифта {font_path}: {str(e)}")
+                continue
+
+            filename = f"{language}_{i:04d}.png"
+            image.save(os.path.join(output_dir, filename))
+            manifest["samples"].append({
+                "image": filename,
+                "text": text,
+                "language": language,
+                "font": os.path.basename(font_path),
+                "size": size,
+                "background": background,
+                "noise": noise
+            })
+
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    return manifest
+
+def main():
+    """Точка входа генератора"""
+    parser = argparse.ArgumentParser(description="Генерация синтетического набора скриншотов")
+    parser.add_argument("output", help="каталог для набора")
+    parser.add_argument("--per-language", type=int, default=30, help="изображений на язык")
+    parser.add_argument("--languages", nargs="*", default=["en", "ru", "ja"], help="языки набора")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора случайных чисел")
+    parser.add_argument("--fonts-dir", action="append", help="дополнительный каталог шрифтов")
+    args = parser.parse_args()
+
+    font_dirs = (args.fonts_dir or []) + FONT_DIRS
+    manifest = generate(args.output, args.per_language, args.languages, args.seed, font_dirs)
+    print(f"Создано изображений: {len(manifest['samples'])} в {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Время сравнения кадров детектором изменений
+
+Запуск:
+    python -m benchmarks.frame_diff --repeat 500
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.common import percentile
+from translator.utils.frame_diff import FrameDiffDetector
+
+SIZES = {
+    "subtitle 800x120": (800, 120),
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160)
+}
+
+# Мелкие символы для проверки изменения одного символа
+GLYPHS = "il.,:x"
+
+def add_glyph(image, rng):
+    """Копия кадра с одним мелким символом в случайном месте"""
+    height, width = image.shape[:2]
+    image = image.copy()
+    position = (rng.randrange(10, width - 10), rng.randrange(10, height - 4))
+    cv2.putText(image, rng.choice(GLYPHS), position, cv2.FONT_HERSHEY_PLAIN, 0.8, (20, 20, 20, 255), 1)
+    return image
+
+def glyph_detection_rate(base, trials, seed=0):
+    """Доля кадров с одним добавленным символом, признанных изменившимися"""
+    rng = random.Random(seed)
+    detected = 0
+    for _ in range(trials):
+        detector = FrameDiffDetector()
+        detector.compare(base)
+        detected += detector.compare(add_glyph(base, rng)).changed
+    return detected / float(trials)
+
+def make_frames(width, height):
+    """
+    Исходный кадр с текстом, кадр с одним добавленным символом, кадр с
+    измененной строкой и полностью другой кадр
+    """
+    base = np.full((height, width, 4), 235, dtype=np.uint8)
+    for row, y in enumerate(range(30, height - 10, 40)):
+        cv2.putText(base, f"Line {row}: the quick brown fox", (20, y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (20, 20, 20, 255), 2)
+    partial = base.copy()
+    cv2.rectangle(partial, (20, height // 2 - 30), (width // 3, height // 2 + 10), (235, 235, 235, 255), -1)
+    cv2.putText(partial, "New message arrived", (20, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (20, 20, 20, 255), 2)
+    glyph = add_glyph(base, random.Random(0))
+    return {"unchanged": base.copy(), "glyph": glyph, "partial": partial, "full": 255 - base}, base
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Время сравнения кадров FrameDiffDetector")
+    parser.add_argument("--repeat", type=int, default=300, help="количество сравнений каждого случая")
+    parser.add_argument("--glyph-trials", type=int, default=40, help="количество кадров с одним добавленным символом")
+    args = parser.parse_args()
+
+    print(f"{'кадр':<18} {'случай':<10} {'результат':<10} {'p50, мс':>9} {'p95, мс':>9}")
+    for name, (width, height) in SIZES.items():
+        frames, base = make_frames(width, height)
+        for case, frame in frames.items():
+            detector = FrameDiffDetector()
+            latencies = []
+            for _ in range(args.repeat):
+                # Эталоном каждый раз служит исходный кадр
+                detector.reset()
+                detector.compare(base)
+                start = time.perf_counter()
+                change = detector.compare(frame)
+                latencies.append(time.perf_counter() - start)
+            print(
+                f"{name:<18} {case:<10} {change.kind:<10} "
+                f"{statistics.median(latencies) * 1000:>9.3f} {percentile(latencies, 0.95) * 1000:>9.3f}"
+            )
+        rate = glyph_detection_rate(base, args.glyph_trials)
+        print(f"{name:<18} один символ в случайном месте найден в {rate:.0%} кадров")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Инкрементальное распознавание и полное повторное распознавание на записи
+прокручиваемого чата
+
+Синтетический чат: сообщения нарисованы на длинном холсте, каждый кадр -
+окно, прокрученное так, чтобы внизу появилось новое сообщение.
+
+Запуск:
+    python -m benchmarks.incremental_ocr --frames 20 --engine "Tesseract OCR"
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from benchmarks.common import character_error_rate
+from benchmarks.corpus import PHRASES, find_fonts
+from translator.utils.frame_diff import FrameDiffDetector
+from translator.utils.incremental_ocr import IncrementalOCR
+from translator.utils.ocr import OCREngine
+
+def render_chat(messages, width=900, font_size=18, seed=0):
+    """
+    Отрисовка всех сообщений чата на одном холсте
+
+    Returns:
+        tuple: (холст BGR, список нижних границ сообщений)
+    """
+    rng = random.Random(seed)
+    fonts = find_fonts("en")
+    font = ImageFont.truetype(fonts[0], font_size) if fonts else ImageFont.load_default()
+
+    line_height = font_size + 10
+    height = line_height * 2 * len(messages) + 40
+    canvas = Image.new("RGB", (width, height), (245, 245, 245))
+    draw = ImageDraw.Draw(canvas)
+
+    bottoms = []
+    y = 20
+    for index, message in enumerate(messages):
+        author = rng.choice(["Alice", "Bob", "Carol"])
+        x = 20 if index % 2 else width // 3
+        # Сообщение - "пузырь" с автором и текстом
+        draw.rectangle((x - 8, y - 4, x + width // 2 + 40, y + line_height * 2 - 8), fill=(225, 235, 250))
+        draw.text((x, y), f"{author}:", font=font, fill=(40, 40, 120))
+        draw.text((x, y + line_height - 4), message, font=font, fill=(20, 20, 20))
+        y += line_height * 2
+        bottoms.append(y)
+
+    return cv2.cvtColor(np.asarray(canvas), cv2.COLOR_RGB2BGR), bottoms
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Инкрементальное и полное распознавание прокручиваемого чата")
+    parser.add_argument("--frames", type=int, default=20, help="количество кадров (новых сообщений)")
+    parser.add_argument("--window-height", type=int, default=600, help="высота окна чата")
+    parser.add_argument("--engine", default="Tesseract OCR", help="имя OCR движка")
+    parser.add_argument("--tesseract", default="", help="путь к исполняемому файлу Tesseract")
+    args = parser.parse_args()
+
+    messages = [PHRASES["en"][i % len(PHRASES["en"])] for i in range(args.frames + 20)]
+    canvas, bottoms = render_chat(messages)
+
+    # Кадры: окно высотой window_height, нижний край которого - последнее сообщение
+    frames = []
+    for bottom in bottoms:
+        if bottom >= args.window_height:
+            frames.append(canvas[bottom - args.window_height:bottom])
+    frames = frames[:args.frames]
+
+    engine = OCREngine(args.tesseract, engine=args.engine)
+    if not engine.is_available:
+        print("OCR движок недоступен")
+        return
+    incremental = IncrementalOCR(engine)
+    # Изменения кадра передаются так же, как в режиме реального времени
+    detector = FrameDiffDetector()
+
+    full_times, incremental_times, disagreement = [], [], []
+    hits = misses = 0
+    for frame in frames:
+        start = time.perf_counter()
+        full_text = engine.recognize(frame).text()
+        full_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        change = detector.compare(frame)
+        incremental_text = incremental.recognize(frame, change=change).text()
+        incremental_times.append(time.perf_counter() - start)
+
+        hits += incremental.last_hits
+        misses += incremental.last_misses
+        disagreement.append(character_error_rate(full_text, incremental_text))
+
+    # Первый кадр одинаково дорог для обоих способов
+    print(f"Кадров: {len(frames)}, размер {frames[0].shape[1]}x{frames[0].shape[0]}, движок: {engine.backend.name}")
+    print(f"{'способ':<16} {'первый, мс':>11} {'далее p50, мс':>14} {'всего, с':>9}")
+    for name, times in (("полный", full_times), ("инкрементальный", incremental_times)):
+        print(
+            f"{name:<16} {times[0] * 1000:>11.1f} {statistics.median(times[1:]) * 1000:>14.1f} "
+            f"{sum(times):>9.2f}"
+        )
+    print(f"Блоков из кэша: {hits}/{hits + misses}")
+    print(f"Расхождение текста с полным распознаванием (CER): {statistics.mean(disagreement):.3f}")
+
+if __name__ == "__main__":
+    main()
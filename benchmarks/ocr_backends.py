@@ -0,0 +1,77 @@
+"""
+Сравнение OCR движков: задержка, пропускная способность и точность по языкам
+
+Запуск:
+    python -m benchmarks.ocr_backends путь/к/набору --languages en ru ja
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.common import character_error_rate, load_dataset, percentile
+from translator.utils.ocr import OCREngine
+from translator.utils.ocr_backends import BACKENDS
+
+def benchmark_backend(engine, samples):
+    """
+    Прогон движка по образцам одного языка
+
+    Args:
+        engine: экземпляр OCREngine с нужным движком
+        samples: образцы набора данных
+
+    Returns:
+        dict: медианная и p95 задержка (мс), изображений в секунду, средний CER
+    """
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    for sample in samples:
+        began = time.perf_counter()
+        result = engine.recognize(sample["image"], sample["language"])
+        latencies.append(time.perf_counter() - began)
+        errors.append(character_error_rate(sample["text"], result.text() if result.ok else ""))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "latency_p50_ms": statistics.median(latencies) * 1000,
+        "latency_p95_ms": percentile(latencies, 0.95) * 1000,
+        "images_per_second": len(samples) / elapsed if elapsed else 0.0,
+        "cer": statistics.mean(errors)
+    }
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Сравнение OCR движков")
+    parser.add_argument("dataset", help="каталог с изображениями и эталонным текстом")
+    parser.add_argument("--languages", nargs="*", default=["en", "ru", "ja"], help="языки для сравнения")
+    parser.add_argument("--backends", nargs="*", default=list(BACKENDS), help="имена движков")
+    parser.add_argument("--tesseract", default="", help="путь к исполняемому файлу Tesseract")
+    args = parser.parse_args()
+
+    samples = load_dataset(args.dataset)
+    print(f"{'Движок':<20} {'язык':<5} {'p50, мс':>9} {'p95, мс':>9} {'изобр./с':>9} {'CER':>7}")
+
+    for name in args.backends:
+        engine = OCREngine(args.tesseract, engine=name)
+        if engine.backend.name != name or not engine.is_available:
+            print(f"{name:<20} недоступен")
+            continue
+
+        for language in args.languages:
+            language_samples = [sample for sample in samples if sample["language"] == language]
+            if not language_samples:
+                continue
+            if not engine.backend.supports_language(language):
+                print(f"{name:<20} {language:<5} язык не поддерживается")
+                continue
+
+            stats = benchmark_backend(engine, language_samples)
+            print(
+                f"{name:<20} {language:<5} {stats['latency_p50_ms']:>9.1f} {stats['latency_p95_ms']:>9.1f} "
+                f"{stats['images_per_second']:>9.2f} {stats['cer']:>7.3f}"
+            )
+
+if __name__ == "__main__":
+    main()
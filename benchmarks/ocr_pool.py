@@ -0,0 +1,57 @@
+"""
+Масштабирование пакетного OCR по количеству процессов
+
+Запуск:
+    python -m benchmarks.ocr_pool путь/к/набору --max-processes 8
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.common import load_dataset
+from translator.utils.ocr_pool import OCRWorkerPool
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Пропускная способность recognize_many от 1 до N процессов")
+    parser.add_argument("dataset", help="каталог с изображениями")
+    parser.add_argument("--language", default="en", help="язык распознавания (en, ru, ja)")
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1, help="максимальное количество процессов")
+    parser.add_argument("--engine", default="Tesseract OCR", help="имя OCR движка")
+    parser.add_argument("--tesseract", default="", help="путь к исполняемому файлу Tesseract")
+    args = parser.parse_args()
+
+    images = [sample["image"] for sample in load_dataset(args.dataset, args.language)]
+    if not images:
+        print("В наборе нет изображений с эталонным текстом")
+        return
+
+    print(f"{'процессов':>9} {'время, с':>9} {'изобр./с':>9} {'ускорение':>10} {'ошибок':>7}")
+    # Степени двойки, количество ядер (оно может не быть степенью двойки,
+    # например 6 или 12) и заданный максимум
+    counts = {2 ** power for power in range(args.max_processes.bit_length())}
+    counts.update(count for count in (os.cpu_count() or 1, args.max_processes) if count <= args.max_processes)
+
+    baseline = None
+    for processes in sorted(counts):
+        pool = OCRWorkerPool(processes, tesseract_path=args.tesseract, engine=args.engine)
+        # Запуск процессов и загрузка движков не входят в замер
+        pool.start()
+
+        start = time.perf_counter()
+        failures = sum(
+            1 for _, result in pool.recognize_many(images, args.language, ordered=False)
+            if not result.ok
+        )
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+
+        baseline = baseline or elapsed
+        print(
+            f"{processes:>9} {elapsed:>9.2f} {len(images) / elapsed:>9.2f} "
+            f"{baseline / elapsed:>9.2f}x {failures:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Сравнение скорости OCR: распознавание изображения целиком и по текстовым блокам
+
+Запуск:
+    python -m benchmarks.ocr_regions screenshot1.png screenshot2.png --language en --repeat 3
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from translator.utils.ocr import OCREngine
+
+def measure(engine, image_path, language, repeat):
+    """
+    Замер времени распознавания одного изображения
+
+    Args:
+        engine: экземпляр OCREngine
+        image_path: путь к изображению
+        language: язык распознавания
+        repeat: количество повторов
+
+    Returns:
+        tuple: (медианное время в секундах, распознанный текст)
+    """
+    timings = []
+    text = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = engine.recognize_text(image_path, language)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), text
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="OCR целиком против OCR по текстовым блокам")
+    parser.add_argument("images", nargs="+", help="скриншоты (весь экран или окно)")
+    parser.add_argument("--language", default="en", help="язык распознавания (en, ru, ja)")
+    parser.add_argument("--repeat", type=int, default=3, help="количество повторов для каждого изображения")
+    parser.add_argument("--tesseract", default="", help="путь к исполняемому файлу Tesseract")
+    args = parser.parse_args()
+
+    full_engine = OCREngine(args.tesseract, use_text_regions=False)
+    region_engine = OCREngine(args.tesseract, use_text_regions=True)
+
+    print(f"{'Изображение':<40} {'целиком, с':>12} {'по блокам, с':>14} {'ускорение':>10}")
+    for image_path in args.images:
+        full_time, _ = measure(full_engine, image_path, args.language, args.repeat)
+        region_time, _ = measure(region_engine, image_path, args.language, args.repeat)
+        speedup = full_time / region_time if region_time else 0.0
+        name = os.path.basename(image_path)[:40]
+        print(f"{name:<40} {full_time:>12.3f} {region_time:>14.3f} {speedup:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
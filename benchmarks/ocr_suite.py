@@ -0,0 +1,157 @@
+"""
+Набор бенчмарков OCR: пропускная способность, задержка и CER для каждого
+сочетания движка, профиля OCR и профиля предварительной обработки по языкам
+
+Результаты сохраняются в JSON (по умолчанию benchmarks/results/<время>.json),
+чтобы отслеживать регрессии между версиями. С параметром --baseline
+выводится разница с предыдущим прогоном.
+
+Запуск:
+    python -m benchmarks.corpus /tmp/ocr-corpus
+    python -m benchmarks.ocr_suite /tmp/ocr-corpus --baseline benchmarks/results/<файл>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+from benchmarks.common import load_dataset
+from benchmarks.ocr_backends import benchmark_backend
+from translator.utils.ocr import OCREngine
+from translator.utils.ocr_backends import BACKENDS
+from translator.utils.ocr_profiles import DEFAULT_OCR_PROFILE, OCR_PROFILES
+from translator.utils.preprocessing import PROFILES
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def describe_environment():
+    """Сведения о машине и версии кода для сравнения прогонов"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+def run_suite(samples, backends, profiles, languages, tesseract_path="", ocr_profiles=(DEFAULT_OCR_PROFILE,),
+              tessdata_dirs=None):
+    """
+    Прогон всех сочетаний движка, профиля OCR и профиля обработки
+
+    Returns:
+        list: записи {"backend", "ocr_profile", "profile", "language", "samples", метрики}
+    """
+    results = []
+    combinations = [(ocr_profile, profile) for ocr_profile in ocr_profiles for profile in profiles]
+    for backend in backends:
+        for ocr_profile, profile in combinations:
+            engine = OCREngine(
+                tesseract_path, engine=backend, preprocessing=profile,
+                profile=ocr_profile, tessdata_dirs=tessdata_dirs
+            )
+            if engine.backend.name != backend or not engine.is_available:
+                print(f"{backend:<20} недоступен")
+                break
+
+            for language in languages:
+                language_samples = [sample for sample in samples if sample["language"] == language]
+                if not language_samples or not engine.backend.supports_language(language):
+                    continue
+
+                # Первое распознавание загружает модели и не входит в замер
+                engine.recognize(language_samples[0]["image"], language)
+
+                stats = benchmark_backend(engine, language_samples)
+                results.append({
+                    "backend": backend,
+                    "ocr_profile": ocr_profile,
+                    "profile": profile,
+                    "language": language,
+                    "samples": len(language_samples),
+                    **stats
+                })
+                print(
+                    f"{backend:<20} {ocr_profile:<9} {profile:<9} {language:<5} {stats['latency_p50_ms']:>9.1f} "
+                    f"{stats['latency_p95_ms']:>9.1f} {stats['images_per_second']:>9.2f} {stats['cer']:>7.3f}"
+                )
+    return results
+
+def compare(results, baseline):
+    """Вывод изменения задержки и CER относительно предыдущего прогона"""
+    def key(item):
+        return item["backend"], item.get("ocr_profile", DEFAULT_OCR_PROFILE), item["profile"], item["language"]
+
+    previous = {key(item): item for item in baseline["results"]}
+    print(f"\nСравнение с {baseline.get('created', '?')} ({baseline.get('environment', {}).get('commit', '?')})")
+    print(f"{'Движок':<20} {'OCR':<9} {'профиль':<9} {'язык':<5} {'Δ p50, %':>9} {'Δ CER':>8}")
+    for item in results:
+        old = previous.get(key(item))
+        if old is None:
+            continue
+        latency_change = (item["latency_p50_ms"] / old["latency_p50_ms"] - 1) * 100 if old["latency_p50_ms"] else 0.0
+        print(
+            f"{item['backend']:<20} {item['ocr_profile']:<9} {item['profile']:<9} {item['language']:<5} "
+            f"{latency_change:>+9.1f} {item['cer'] - old['cer']:>+8.3f}"
+        )
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Набор бенчмарков OCR с сохранением результатов в JSON")
+    parser.add_argument("dataset", help="каталог набора (см. benchmarks.corpus)")
+    parser.add_argument("--languages", nargs="*", default=["en", "ru", "ja"], help="языки")
+    parser.add_argument("--backends", nargs="*", default=list(BACKENDS), help="имена движков")
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES), help="профили предварительной обработки")
+    parser.add_argument("--ocr-profiles", nargs="*", default=[DEFAULT_OCR_PROFILE],
+                        help=f"профили OCR ({', '.join(OCR_PROFILES)})")
+    parser.add_argument("--tessdata-fast", default="", help="каталог моделей tessdata_fast")
+    parser.add_argument("--tessdata-best", default="", help="каталог моделей tessdata_best")
+    parser.add_argument("--tesseract", default="", help="путь к исполняемому файлу Tesseract")
+    parser.add_argument("--output", help="файл результатов (по умолчанию benchmarks/results/<время>.json)")
+    parser.add_argument("--baseline", help="файл предыдущего прогона для сравнения")
+    args = parser.parse_args()
+
+    samples = load_dataset(args.dataset)
+    if not samples:
+        print("В наборе нет изображений с эталонным текстом")
+        return
+
+    print(f"{'Движок':<20} {'OCR':<9} {'профиль':<9} {'язык':<5} {'p50, мс':>9} {'p95, мс':>9} {'изобр./с':>9} {'CER':>7}")
+    start = time.perf_counter()
+    results = run_suite(
+        samples, args.backends, args.profiles, args.languages, args.tesseract, args.ocr_profiles,
+        {"fast": args.tessdata_fast, "best": args.tessdata_best}
+    )
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "dataset": os.path.abspath(args.dataset),
+        "environment": describe_environment(),
+        "duration_s": time.perf_counter() - start,
+        "results": results
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты сохранены: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Время этапов предварительной обработки и точность OCR для каждого профиля
+
+Запуск:
+    python -m benchmarks.preprocessing путь/к/набору --language en
+"""
+
+import argparse
+import statistics
+import time
+from collections import defaultdict
+
+from benchmarks.common import character_error_rate, load_dataset
+from translator.utils.ocr import OCREngine
+from translator.utils.preprocessing import PROFILES, PreprocessingPipeline, load_image
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Сравнение профилей предварительной обработки")
+    parser.add_argument("dataset", help="каталог с изображениями и эталонным текстом")
+    parser.add_argument("--language", default="en", help="язык образцов без манифеста (en, ru, ja)")
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES), help="профили для сравнения")
+    parser.add_argument("--tesseract", default="", help="путь к исполняемому файлу Tesseract")
+    args = parser.parse_args()
+
+    samples = load_dataset(args.dataset, args.language)
+    if not samples:
+        print("В наборе нет изображений с эталонным текстом")
+        return
+
+    # Движок нужен только для настройки пути к Tesseract; обработка
+    # выполняется здесь, чтобы замерить каждый профиль отдельно
+    engine = OCREngine(args.tesseract)
+    images = [(sample, load_image(sample["image"])) for sample in samples]
+
+    for profile in args.profiles:
+        pipeline = PreprocessingPipeline.from_profile(profile)
+        stage_timings = defaultdict(list)
+        ocr_timings = []
+        errors = []
+
+        for sample, image in images:
+            processed = pipeline.run(image)
+            for name, elapsed in pipeline.last_timings.items():
+                stage_timings[name].append(elapsed)
+
+            start = time.perf_counter()
+            text = engine.backend.recognize(processed, sample["language"]).text()
+            ocr_timings.append(time.perf_counter() - start)
+            errors.append(character_error_rate(sample["text"], text))
+
+        print(f"\nПрофиль: {profile} ({len(images)} изображений)")
+        for name in pipeline.stage_names:
+            print(f"  {name:<12} {statistics.mean(stage_timings[name]) * 1000:8.2f} мс")
+        print(f"  {'OCR':<12} {statistics.mean(ocr_timings) * 1000:8.2f} мс")
+        print(f"  CER          {statistics.mean(errors):8.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Задержка интерактивного распознавания (захват по горячей клавише) без
+нагрузки и во время пакетной обработки файлов
+
+Пакет непрерывно распознается в пуле процессов, а основной процесс
+периодически распознает один снимок, как конвейер захвата области:
+    baseline   - пул без планировщика с обычным приоритетом процессов
+    scheduled  - пакетные слоты JobScheduler и пониженный приоритет пула
+
+Запуск:
+    python -m benchmarks.scheduler_latency --batch 60 --repeat 8
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+from benchmarks.capture_pipeline import render_text
+from benchmarks.common import percentile
+from translator.utils.cancellation import CancelToken
+from translator.utils.job_scheduler import INTERACTIVE, JobScheduler
+from translator.utils.ocr import OCREngine
+from translator.utils.ocr_backends import RapidOCRBackend
+from translator.utils.ocr_pool import BATCH_NICENESS, OCRWorkerPool
+
+def measure(engine, scheduler, image, repeat, pause):
+    """
+    Задержка интерактивного распознавания
+
+    Returns:
+        list: задержки в секундах
+    """
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if scheduler is not None:
+            with scheduler.slot(INTERACTIVE):
+                engine.recognize(image)
+        else:
+            engine.recognize(image)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(pause)
+    return latencies
+
+def run(engine, batch_images, image, args, scheduled):
+    """
+    Замер под пакетной нагрузкой
+
+    Returns:
+        tuple: (задержки, изображений пакета обработано)
+    """
+    scheduler = JobScheduler() if scheduled else None
+    pool = OCRWorkerPool(
+        args.processes, niceness=BATCH_NICENESS if scheduled else 0,
+        engine=args.engine, profile=engine.profile.name
+    )
+    pool.start()
+    token = CancelToken()
+    processed = [0]
+
+    def batch():
+        # Пакет повторяется, пока идет замер
+        while not token.cancelled:
+            for _ in pool.recognize_many(batch_images, cancel_token=token, scheduler=scheduler):
+                processed[0] += 1
+
+    worker = threading.Thread(target=batch, daemon=True)
+    worker.start()
+    # Пул успевает заполниться задачами пакета
+    time.sleep(1.0)
+    latencies = measure(engine, scheduler, image, args.repeat, args.pause)
+    token.cancel()
+    worker.join()
+    pool.shutdown()
+    return latencies, processed[0]
+
+def report(name, latencies, processed=None):
+    """Строка результатов"""
+    line = f"{name:<22} {statistics.median(latencies):>8.2f} {percentile(latencies, 0.95):>8.2f}"
+    if processed is not None:
+        line += f" {processed:>10}"
+    print(line)
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Задержка интерактивного OCR под пакетной нагрузкой")
+    parser.add_argument("--batch", type=int, default=60, help="количество изображений пакета")
+    parser.add_argument("--repeat", type=int, default=8, help="количество интерактивных распознаваний")
+    parser.add_argument("--pause", type=float, default=0.2, help="пауза между ними в секундах")
+    parser.add_argument("--processes", type=int, default=None, help="процессов пула (по умолчанию - ядер)")
+    parser.add_argument("--engine", default=RapidOCRBackend.name, help="OCR движок")
+    args = parser.parse_args()
+
+    engine = OCREngine(engine=args.engine)
+    image = render_text(0)
+    batch_images = [render_text(index, 1200, 800) for index in range(args.batch)]
+    engine.recognize(image)
+    print(f"OCR движок: {engine.backend.name}, ядер: {os.cpu_count()}")
+
+    print(f"{'режим':<22} {'p50, с':>8} {'p95, с':>8} {'пакет, шт':>10}")
+    report("idle", measure(engine, None, image, args.repeat, args.pause))
+    report("batch / baseline", *run(engine, batch_images, image, args, scheduled=False))
+    report("batch / scheduled", *run(engine, batch_images, image, args, scheduled=True))
+
+if __name__ == "__main__":
+    main()
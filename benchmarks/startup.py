@@ -0,0 +1,118 @@
+"""
+Время запуска приложения: от старта интерпретатора до первой отрисовки
+главного окна и до создания всех вкладок
+
+Каждый замер - отдельный процесс, который запускает приложение так же, как
+translator.main, и завершается после создания вкладок. Для каждого этапа
+выводятся медиана и минимум по запускам, а также тяжелые модули, загруженные
+к моменту первой отрисовки окна (их импорт задерживает появление окна).
+
+Настройки и база переводов создаются во временном домашнем каталоге; первый
+запуск (с записью настроек по умолчанию) не учитывается. Без дисплея
+используется платформа Qt offscreen.
+
+Запуск:
+    python -m benchmarks.startup --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Переменная окружения с моментом запуска процесса замера
+START_VARIABLE = "TRANSLATOR_STARTUP_T0"
+
+# Модули, импорт которых до появления окна замедляет запуск
+HEAVY_MODULES = (
+    "openai", "requests", "pytesseract", "PIL", "cv2", "numpy",
+    "rapidocr_onnxruntime", "mss", "Xlib", "win32gui", "AppKit"
+)
+
+STAGES = (
+    ("import", "импорт translator.main"),
+    ("window", "первая отрисовка окна"),
+    ("tabs", "все вкладки созданы")
+)
+
+def measure_child():
+    """Замер в дочернем процессе; результат - строка JSON в stdout"""
+    started = float(os.environ[START_VARIABLE])
+    from PyQt5.QtCore import QEvent, QObject
+    from PyQt5.QtWidgets import QApplication
+
+    from translator import main as entry
+    marks = {"import": time.time() - started}
+
+    class PaintWatcher(QObject):
+        """Момент первой отрисовки окна"""
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and "window" not in marks:
+                marks["window"] = time.time() - started
+                marks["heavy_modules"] = [name for name in HEAVY_MODULES if name in sys.modules]
+            return False
+
+    def on_tabs_ready():
+        marks["tabs"] = time.time() - started
+        print(json.dumps(marks))
+        sys.stdout.flush()
+        # Потоки прогрева и горячих клавиш не задерживают завершение замера
+        os._exit(0)
+
+    app = QApplication(sys.argv)
+    entry.load_settings()
+    entry.init_database()
+    watcher = PaintWatcher()
+    window = entry.create_main_window(app)
+    window.installEventFilter(watcher)
+    window.tabs_ready.connect(on_tabs_ready)
+    app.exec_()
+
+def run_once(env):
+    """
+    Один запуск приложения в отдельном процессе
+
+    Returns:
+        dict: время этапов в секундах и список тяжелых модулей
+    """
+    env = dict(env, **{START_VARIABLE: repr(time.time())})
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        env=env, capture_output=True, text=True, timeout=300, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Время до появления главного окна")
+    parser.add_argument("--repeat", type=int, default=5, help="количество запусков")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child()
+        return
+
+    home = tempfile.mkdtemp()
+    env = dict(os.environ, HOME=home, XDG_CONFIG_HOME=os.path.join(home, ".config"))
+    if sys.platform.startswith("linux") and not (env.get("DISPLAY") or env.get("WAYLAND_DISPLAY")):
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    # Первый запуск записывает настройки по умолчанию и не учитывается
+    run_once(env)
+    runs = [run_once(env) for _ in range(args.repeat)]
+
+    print(f"{'этап':<26} {'медиана, с':>11} {'минимум, с':>11}")
+    for key, title in STAGES:
+        values = [run[key] for run in runs]
+        print(f"{title:<26} {statistics.median(values):>11.3f} {min(values):>11.3f}")
+    heavy = runs[-1]["heavy_modules"]
+    print(f"\nЗагружены до первой отрисовки: {', '.join(heavy) if heavy else 'нет'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Задержка захвата окна на Linux: прямое чтение пикселей окна (X11) и захват
+области экрана под окном
+
+Бенчмарк создает синтетические окна с текстом на X сервере и захватывает их
+всеми способами:
+    fullscreen  - снимок всего экрана PIL и вырезание окна (исходный способ)
+    region      - геометрия из WindowManager и захват области через mss
+    x11         - GetImage к окну через постоянное соединение (X11WindowCapture)
+    x11-shm     - область под окном через XShmGetImage (X11WindowCapture(use_shm=True))
+
+Запуск (без дисплея - в Xvfb):
+    xvfb-run -s "-screen 0 3840x2160x24" python -m benchmarks.window_capture
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+import Xlib.display
+from PIL import ImageGrab
+
+from benchmarks.common import percentile
+from translator.utils.screenshot import ScreenCapture
+from translator.utils.window_manager import WindowManager
+from translator.utils.x11_capture import X11WindowCapture
+
+# Размеры синтетических окон
+WINDOWS = {
+    "800x600": (800, 600),
+    "1280x720": (1280, 720),
+    "1920x1080": (1920, 1080)
+}
+
+def create_window(display, width, height, title):
+    """
+    Создание окна с текстом на светлом фоне
+
+    Returns:
+        Xlib window: отображенное и отрисованное окно
+    """
+    screen = display.screen()
+    window = screen.root.create_window(
+        40, 40, width, height, 0, screen.root_depth,
+        background_pixel=screen.white_pixel
+    )
+    window.set_wm_name(title)
+    window.map()
+    display.sync()
+
+    gc = window.create_gc(foreground=screen.black_pixel, background=screen.white_pixel)
+    for row, y in enumerate(range(20, height, 18)):
+        window.image_text(gc, 10, y, f"Line {row}: The quick brown fox jumps over the lazy dog".encode())
+    display.sync()
+    return window
+
+def measure(grab, repeat):
+    """
+    Задержка захвата
+
+    Returns:
+        tuple: (p50, p95) в миллисекундах или None, если захват не удался
+    """
+    # Первый захват открывает соединения и не входит в замер
+    if grab() is None:
+        return None
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        grab()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000, percentile(latencies, 0.95) * 1000
+
+def main():
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Задержка захвата окна на Linux (X11)")
+    parser.add_argument("--repeat", type=int, default=30, help="количество захватов каждым способом")
+    args = parser.parse_args()
+
+    display = Xlib.display.Display()
+    screenshot = ScreenCapture(ScreenCapture.BACKEND_MSS)
+    direct = X11WindowCapture()
+    shm = X11WindowCapture(use_shm=True)
+
+    print(f"{'окно':<10} {'способ':<11} {'p50, мс':>9} {'p95, мс':>9}")
+    for name, (width, height) in WINDOWS.items():
+        title = f"benchmark {name}"
+        window = create_window(display, width, height, title)
+
+        # Без оконного менеджера _NET_CLIENT_LIST пуст, поэтому окно
+        # добавляется в WindowManager напрямую
+        window_manager = WindowManager()
+        window_manager.window_handles[title] = window.id
+
+        def fullscreen():
+            x, y, w, h = window_manager.capture_window(title)
+            return np.asarray(ImageGrab.grab().crop((x, y, x + w, y + h)))
+
+        def region():
+            x, y, w, h = window_manager.capture_window(title)
+            return screenshot.grab_area(x, y, x + w, y + h)
+
+        paths = {
+            "fullscreen": fullscreen,
+            "region": region,
+            "x11": lambda: direct.grab_window(window.id),
+            "x11-shm": lambda: shm.grab_window(window.id)
+        }
+        for path, grab in paths.items():
+            stats = measure(grab, args.repeat)
+            if stats is None:
+                print(f"{name:<10} {path:<11} захват не удался")
+                continue
+            print(f"{name:<10} {path:<11} {stats[0]:>9.2f} {stats[1]:>9.2f}")
+
+        window.destroy()
+        display.sync()
+
+    direct.close()
+    shm.close()
+    screenshot.cleanup()
+
+if __name__ == "__main__":
+    main()
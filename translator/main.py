@@ -9,8 +9,6 @@ from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QSettings
 
 from translator.ui.main_window import MainWindow
-from translator.utils.ocr import OCREngine
-from translator.models.translator import LLMTranslator
 
 def init_database():
     """Инициализация базы данных"""
@@ -81,8 +79,15 @@ def load_settings():
         settings.setValue("ocr/engine", "Tesseract OCR")
         if os.name == 'nt':  # Windows
             settings.setValue("ocr/tesseract_path", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
-        settings.setValue("ocr/update_interval", "1 секунда")
-        settings.setValue("ocr/max_duration", "1 минута")
+        settings.setValue("ocr/update_interval", "1 second")
+        settings.setValue("ocr/max_duration", "1 minute")
+        settings.setValue("ocr/stable_frames", "2")
+        settings.setValue("ocr/stable_time", "0.5 seconds")
+        settings.setValue("ocr/adaptive_interval", True)
+        settings.setValue("ocr/cpu_budget", "50%")
+        from translator.utils.ocr_profiles import CAPTURE_MODE_PROFILES
+        for mode, profile in CAPTURE_MODE_PROFILES.items():
+            settings.setValue(f"ocr/profile/{mode}", profile)
         
         # Прочие
         settings.setValue("other/autostart", False)
@@ -90,41 +95,40 @@ def load_settings():
         settings.setValue("other/confirm_exit", True)
         settings.setValue("other/error_logging", True)
 
-def init_ocr():
-    """Инициализация движка OCR"""
-    settings = QSettings("TranslatorApp", "Translator")
-    
-    # Путь к Tesseract
-    tesseract_path = settings.value("ocr/tesseract_path", "")
+def init_pipeline(app):
+    """
+    Инициализация общего сервиса распознавания и перевода
     
-    # Инициализация OCR движка
-    ocr_engine = OCREngine(tesseract_path)
+    Вызывается после первой отрисовки главного окна: модуль сервиса
+    загружает OCR, переводчик и библиотеки захвата, а их импорт не должен
+    задерживать появление окна.
+    """
+    from translator.utils.pipeline_service import get_pipeline_service
     
-    return ocr_engine
-
-def init_translator(db_path):
-    """Инициализация переводчика"""
-    settings = QSettings("TranslatorApp", "Translator")
+    service = get_pipeline_service()
+    app.aboutToQuit.connect(service.shutdown)
     
-    # Создание переводчика
-    translator = LLMTranslator(db_path)
+    # OCR движок захвата области и переводчик создаются в фоне, чтобы
+    # первое нажатие горячей клавиши не ждало их инициализации
+    service.warm_up(("area",))
     
-    # Выбор провайдера по умолчанию
-    default_provider = settings.value("translator/provider", "openai")
-    translator.set_default_provider(default_provider)
-    
-    # Установка API ключей
-    openai_api_key = settings.value("openai/api_key", "")
-    openai_base_url = settings.value("openai/base_url", "https://api.openai.com/v1")
-    if openai_api_key:
-        translator.set_api_key("openai", openai_api_key, openai_base_url)
+    return service
+
+def create_main_window(app):
+    """
+    Создание и показ главного окна
     
-    deepseek_api_key = settings.value("deepseek/api_key", "")
-    deepseek_base_url = settings.value("deepseek/base_url", "https://api.aiguoguo199.com/v1")
-    if deepseek_api_key:
-        translator.set_api_key("deepseek", deepseek_api_key, deepseek_base_url)
+    Вкладки, сервис распознавания и перевода и прогрев OCR движка
+    запускаются после первой отрисовки окна.
     
-    return translator
+    Returns:
+        MainWindow: главное окно
+    """
+    main_window = MainWindow()
+    main_window.setWindowTitle("Translator Pro 2025")
+    main_window.first_painted.connect(lambda: init_pipeline(app))
+    main_window.show()
+    return main_window
 
 def main():
     """Основная функция для запуска приложения"""
@@ -137,16 +141,11 @@ def main():
     load_settings()
     
     # Инициализация базы данных
-    db_path = init_database()
-    
-    # Инициализация OCR движка и переводчика
-    ocr_engine = init_ocr()
-    translator = init_translator(db_path)
+    init_database()
     
-    # Создание главного окна
-    main_window = MainWindow()
-    main_window.setWindowTitle("Translator Pro 2025")
-    main_window.show()
+    # Создание главного окна (OCR движок и переводчик готовятся после его
+    # первой отрисовки)
+    main_window = create_main_window(app)
     
     # Запуск цикла событий
     sys.exit(app.exec_())
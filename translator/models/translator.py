@@ -6,10 +6,17 @@ import json
 import sqlite3
 import time
 import os
-import requests
-from openai import OpenAI
+import socket
 from datetime import datetime
 
+from translator.utils.cancellation import CancelledError, run_cancellable
+
+# Имена провайдеров в сообщениях
+PROVIDER_NAMES = {
+    'openai': 'OpenAI',
+    'deepseek': 'DeepSeek'
+}
+
 class LLMTranslator:
     """Класс для перевода текста с помощью больших языковых моделей (LLM)"""
     
@@ -124,7 +131,7 @@ class LLMTranslator:
         conn.commit()
         conn.close()
         
-    def translate_with_openai(self, text, source_lang, target_lang):
+    def translate_with_openai(self, text, source_lang, target_lang, cancel_token=None, on_delta=None):
         """
         Перевод текста с помощью OpenAI API
         
@@ -132,61 +139,23 @@ class LLMTranslator:
             text: исходный текст
             source_lang: язык исходного текста ('en', 'ja', 'ru')
             target_lang: целевой язык ('en', 'ja', 'ru')
+            cancel_token: CancelToken для прерывания запроса
+            on_delta: функция on_delta(фрагмент), получающая перевод по мере
+                поступления ответа
             
         Returns:
             str: переведенный текст
         """
         if not self.openai_api_key:
             raise ValueError("API ключ OpenAI не установлен")
-            
-        # Проверка кэша
-        cached = self._get_cached_translation(text, source_lang, target_lang, 'openai')
-        if cached:
-            return cached
-            
-        # Формирование промпта для перевода
-        client = OpenAI(
-            api_key=self.openai_api_key,
-            base_url=self.openai_base_url
-        )
-        
-        # Подготовка правильного наименования языков
-        lang_names = {
-            'en': 'English',
-            'ru': 'Russian',
-            'ja': 'Japanese'
-        }
-        
-        source_lang_name = lang_names.get(source_lang, source_lang)
-        target_lang_name = lang_names.get(target_lang, target_lang)
         
-        # Создание промпта
-        prompt = f"""You are a professional translator. 
-Translate the following text from {source_lang_name} to {target_lang_name}, preserving the meaning, tone, and style. 
-Respond only with the translated text, without any additional commentary or explanations.
-
-Text: {text}"""
-        
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4",  # Можно использовать другую модель, например "gpt-3.5-turbo"
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,  # Низкая температура для более строгого перевода
-                max_tokens=2048
-            )
-            
-            # Получение текста ответа
-            translated_text = response.choices[0].message.content.strip()
-            
-            # Кэширование результата
-            self._cache_translation(text, translated_text, source_lang, target_lang, 'openai')
-            
-            return translated_text
-        except Exception as e:
-            print(f"Ошибка при переводе через OpenAI: {e}")
-            return f"Ошибка перевода: {e}"
+        return self._translate_chat(
+            'openai', self.openai_api_key, self.openai_base_url,
+            "gpt-4",  # Можно использовать другую модель, например "gpt-3.5-turbo"
+            text, source_lang, target_lang, cancel_token, on_delta
+        )
             
-    def translate_with_deepseek(self, text, source_lang, target_lang):
+    def translate_with_deepseek(self, text, source_lang, target_lang, cancel_token=None, on_delta=None):
         """
         Перевод текста с помощью DeepSeek API
         
@@ -194,22 +163,57 @@ Text: {text}"""
             text: исходный текст
             source_lang: язык исходного текста ('en', 'ja', 'ru')
             target_lang: целевой язык ('en', 'ja', 'ru')
+            cancel_token: CancelToken для прерывания запроса
+            on_delta: функция on_delta(фрагмент), получающая перевод по мере
+                поступления ответа
             
         Returns:
             str: переведенный текст
         """
         if not self.deepseek_api_key:
             raise ValueError("API ключ DeepSeek не установлен")
+        
+        return self._translate_chat(
+            'deepseek', self.deepseek_api_key, self.deepseek_base_url,
+            "deepseek-chat",  # Модель DeepSeek
+            text, source_lang, target_lang, cancel_token, on_delta
+        )
+    
+    def _translate_chat(self, provider, api_key, base_url, model, text, source_lang, target_lang, cancel_token=None,
+                        on_delta=None):
+        """
+        Перевод через API чата, совместимый с OpenAI
+        
+        Args:
+            provider: имя провайдера (для кэша и сообщений)
+            api_key: API ключ
+            base_url: базовый URL API
+            model: имя модели
+            text: исходный текст
+            source_lang: язык исходного текста
+            target_lang: целевой язык
+            cancel_token: CancelToken для прерывания запроса
+            on_delta: функция on_delta(фрагмент) для частей ответа
             
+        Returns:
+            str: переведенный текст или сообщение об ошибке
+        
+        Raises:
+            CancelledError: перевод отменен (результат не кэшируется)
+        """
         # Проверка кэша
-        cached = self._get_cached_translation(text, source_lang, target_lang, 'deepseek')
+        cached = self._get_cached_translation(text, source_lang, target_lang, provider)
         if cached:
             return cached
             
+        # Пакет openai загружается при первом запросе: его импорт занимает
+        # заметную часть времени запуска приложения
+        from openai import OpenAI
+        
         # Формирование промпта для перевода
         client = OpenAI(
-            api_key=self.deepseek_api_key,
-            base_url=self.deepseek_base_url
+            api_key=api_key,
+            base_url=base_url
         )
         
         # Подготовка правильного наименования языков
@@ -230,25 +234,87 @@ Respond only with the translated text, without any additional commentary or expl
 Text: {text}"""
         
         try:
-            response = client.chat.completions.create(
-                model="deepseek-chat",  # Модель DeepSeek
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=2048
-            )
-            
-            # Получение текста ответа
-            translated_text = response.choices[0].message.content.strip()
+            translated_text = self._request_translation(client, model, prompt, cancel_token, on_delta)
             
             # Кэширование результата
-            self._cache_translation(text, translated_text, source_lang, target_lang, 'deepseek')
+            self._cache_translation(text, translated_text, source_lang, target_lang, provider)
             
             return translated_text
+        except CancelledError:
+            raise
         except Exception as e:
-            print(f"Ошибка при переводе через DeepSeek: {e}")
+            print(f"Ошибка при переводе через {PROVIDER_NAMES.get(provider, provider)}: {e}")
             return f"Ошибка перевода: {e}"
+        finally:
+            client.close()
+    
+    def _request_translation(self, client, model, prompt, cancel_token=None, on_delta=None):
+        """
+        Запрос перевода к API
+        
+        Без cancel_token и on_delta ответ запрашивается целиком. Иначе ответ
+        передается потоком: части ответа передаются on_delta по мере
+        поступления, а с cancel_token чтение выполняется в отдельном потоке
+        выполнения, и отмена сразу возвращает управление и закрывает
+        соединение с сервером.
+        
+        Returns:
+            str: текст ответа
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if cancel_token is None and on_delta is None:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.3,  # Низкая температура для более строгого перевода
+                max_tokens=2048
+            )
+            
+            # Получение текста ответа
+            return response.choices[0].message.content.strip()
+        
+        state = {"stream": None}
+        
+        def request():
+            stream = state["stream"] = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.3,
+                max_tokens=2048,
+                stream=True
+            )
+            parts = []
+            try:
+                for chunk in stream:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        break
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        if on_delta is not None:
+                            on_delta(chunk.choices[0].delta.content)
+            finally:
+                stream.close()
+            return "".join(parts).strip()
+        
+        def abort():
+            # Закрытие сокета прерывает чтение ответа в потоке запроса;
+            # до получения заголовков ответа закрывается клиент
+            stream = state["stream"]
+            if stream is not None:
+                network_stream = stream.response.extensions.get("network_stream")
+                sock = network_stream.get_extra_info("socket") if network_stream is not None else None
+                if sock is not None:
+                    try:
+                        sock.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+            client.close()
+        
+        if cancel_token is None:
+            return request()
+        return run_cancellable(request, cancel_token, abort)
     
-    def translate(self, text, source_lang, target_lang, provider=None):
+    def translate(self, text, source_lang, target_lang, provider=None, cancel_token=None, on_delta=None):
         """
         Перевод текста с использованием указанного провайдера
         
@@ -257,17 +323,23 @@ Text: {text}"""
             source_lang: язык исходного текста ('en', 'ja', 'ru')
             target_lang: целевой язык ('en', 'ja', 'ru')
             provider: провайдер перевода (если None, используется провайдер по умолчанию)
+            cancel_token: CancelToken; отмена прерывает HTTP запрос
+            on_delta: функция on_delta(фрагмент), получающая перевод частями
+                по мере ответа сервера (переводы из кэша не передаются)
             
         Returns:
             str: переведенный текст
+        
+        Raises:
+            CancelledError: перевод отменен
         """
         if not provider:
             provider = self.default_provider
             
         if provider == 'openai':
-            return self.translate_with_openai(text, source_lang, target_lang)
+            return self.translate_with_openai(text, source_lang, target_lang, cancel_token, on_delta)
         elif provider == 'deepseek':
-            return self.translate_with_deepseek(text, source_lang, target_lang)
+            return self.translate_with_deepseek(text, source_lang, target_lang, cancel_token, on_delta)
         else:
             raise ValueError(f"Неизвестный провайдер: {provider}")
             
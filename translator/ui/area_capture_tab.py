@@ -2,21 +2,41 @@
 Вкладка захвата произвольной области экрана
 """
 
-import os
 import sys
 import time
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-    QTextEdit, QGroupBox, QApplication, QDesktopWidget, QComboBox
+    QTextEdit, QGroupBox, QApplication, QDesktopWidget, QComboBox, QCheckBox
 )
-from PyQt5.QtCore import Qt, QSettings, QTimer, pyqtSignal, QThread, QRect
+from PyQt5.QtCore import Qt, QSettings, QTimer, pyqtSignal, QThread, QRect, QPoint
 from PyQt5.QtGui import QPixmap, QImage, QColor, QPainter, QCursor
 
-from translator.utils.screenshot import ScreenCapture
-from translator.utils.ocr import OCREngine
-from translator.models.translator import LLMTranslator
+from translator.ui.pipeline_bridge import PipelineBridge
+from translator.ui.preview import image_to_pixmap
+from translator.utils.cancellation import CancelledError, CancelToken
+from translator.utils.incremental_ocr import IncrementalOCR
+from translator.utils.job_scheduler import REALTIME
+from translator.utils.pipeline_service import get_pipeline_service
+from translator.utils.realtime import AdaptiveScheduler, FrameSource, area_grabber, parse_duration, parse_percent
+from translator.utils.stabilizer import TextStabilizer
 from translator.utils.hotkeys import HotkeyManager
 
+def get_languages(settings):
+    """
+    Языки оригинала и перевода из настроек
+    
+    Returns:
+        tuple: (код языка оригинала, код языка перевода)
+    """
+    lang_map = {
+        "Английский": "en",
+        "Русский": "ru",
+        "Японский": "ja"
+    }
+    source_lang_text = settings.value("language/source", "Английский")
+    target_lang_text = settings.value("language/target", "Русский")
+    return lang_map.get(source_lang_text, "en"), lang_map.get(target_lang_text, "ru")
+
 class SelectAreaDialog(QWidget):
     """Диалог для выбора области экрана"""
     area_selected = pyqtSignal(int, int, int, int)
@@ -24,22 +44,28 @@ class SelectAreaDialog(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Dialog)
-        self.setWindowState(Qt.WindowFullScreen)
+        # Окно во весь экран закрывает только один монитор, поэтому диалог
+        # растягивается на объединение геометрий всех мониторов
+        desktop = QRect()
+        for screen in QApplication.screens():
+            desktop = desktop.united(screen.geometry())
+        self.setGeometry(desktop)
         self.setStyleSheet("background-color: rgba(0, 0, 0, 100);")
         self.setMouseTracking(True)
         
-        # Начальные координаты выделения
+        # Начальные координаты выделения (в координатах диалога)
         self.start_x = 0
         self.start_y = 0
         self.end_x = 0
         self.end_y = 0
         self.is_selecting = False
         
-        # Добавляем инструкцию для пользователя
+        # Добавляем инструкцию для пользователя над основным монитором
+        primary = QApplication.primaryScreen().geometry()
         instruction = QLabel("Перетащите для выделения области. Нажмите Esc для отмены.", self)
         instruction.setStyleSheet("color: white; font-size: 16px; background-color: rgba(0, 0, 0, 150);")
         instruction.setAlignment(Qt.AlignCenter)
-        instruction.setGeometry(0, 10, self.width(), 30)
+        instruction.setGeometry(primary.x() - desktop.x(), primary.y() - desktop.y() + 10, primary.width(), 30)
     
     def paintEvent(self, event):
         """Отрисовка интерфейса выделения области"""
@@ -70,6 +96,26 @@ class SelectAreaDialog(QWidget):
             self.end_y = event.pos().y()
             self.update()
     
+    def to_screen_pixels(self, point):
+        """
+        Перевод точки диалога в пиксели виртуального рабочего стола
+        
+        Координаты Qt логические: при масштабировании экрана размеры
+        монитора в них меньше физических, поэтому смещение от угла монитора
+        умножается на его коэффициент масштабирования.
+        
+        Returns:
+            tuple: (x, y) в координатах захвата экрана
+        """
+        global_point = self.mapToGlobal(point)
+        screen = QApplication.screenAt(global_point) or QApplication.primaryScreen()
+        origin = screen.geometry().topLeft()
+        ratio = screen.devicePixelRatio()
+        return (
+            origin.x() + round((global_point.x() - origin.x()) * ratio),
+            origin.y() + round((global_point.y() - origin.y()) * ratio)
+        )
+    
     def mouseReleaseEvent(self, event):
         """Обработка отпускания кнопки мыши"""
         if event.button() == Qt.LeftButton and self.is_selecting:
@@ -77,13 +123,10 @@ class SelectAreaDialog(QWidget):
             self.end_y = event.pos().y()
             self.is_selecting = False
             
-            # Отправляем сигнал с координатами выделенной области
-            self.area_selected.emit(
-                min(self.start_x, self.end_x),
-                min(self.start_y, self.end_y),
-                max(self.start_x, self.end_x),
-                max(self.start_y, self.end_y)
-            )
+            # Отправляем сигнал с координатами выделенной области на экране
+            x1, y1 = self.to_screen_pixels(QPoint(min(self.start_x, self.end_x), min(self.start_y, self.end_y)))
+            x2, y2 = self.to_screen_pixels(QPoint(max(self.start_x, self.end_x), max(self.start_y, self.end_y)))
+            self.area_selected.emit(x1, y1, x2, y2)
             self.close()
     
     def keyPressEvent(self, event):
@@ -91,88 +134,125 @@ class SelectAreaDialog(QWidget):
         if event.key() == Qt.Key_Escape:
             self.close()
 
-class AreaCaptureThread(QThread):
-    """Поток для захвата области экрана и выполнения OCR + перевода"""
+class RealtimeCaptureThread(QThread):
+    """Поток непрерывного наблюдения за областью экрана (режим реального времени)"""
     result_ready = pyqtSignal(str, str)
     preview_ready = pyqtSignal(QPixmap)
+    # Распознанный текст (до перевода) и перевод на данный момент
+    text_ready = pyqtSignal(str)
+    translation_progress = pyqtSignal(str)
+    status_changed = pyqtSignal(str)
     
     def __init__(self, x1, y1, x2, y2, settings):
         super().__init__()
-        self.x1 = x1
-        self.y1 = y1
-        self.x2 = x2
-        self.y2 = y2
         self.settings = settings
-        self.screenshot = ScreenCapture()
-        self.ocr = OCREngine(settings.value("ocr/tesseract_path", ""))
-        
-        # Создание переводчика
-        db_dir = os.path.join(os.path.expanduser("~"), ".translator")
-        if not os.path.exists(db_dir):
-            os.makedirs(db_dir)
-        db_path = os.path.join(db_dir, "translations.db")
-        
-        self.translator = LLMTranslator(db_path)
-        
-        # Настройка API ключей
-        provider = self.settings.value("translator/provider", "openai")
-        
-        if provider == "openai":
-            api_key = self.settings.value("openai/api_key", "")
-            base_url = self.settings.value("openai/base_url", "https://api.openai.com/v1")
-            if api_key:
-                self.translator.set_api_key("openai", api_key, base_url)
-        else:
-            api_key = self.settings.value("deepseek/api_key", "")
-            base_url = self.settings.value("deepseek/base_url", "https://api.aiguoguo199.com/v1")
-            if api_key:
-                self.translator.set_api_key("deepseek", api_key, base_url)
-                
-        self.translator.set_default_provider(provider)
+        # OCR движок профиля ocr/profile/realtime, переводчик и захват
+        # экрана - общие прогретые экземпляры сервиса
+        self.service = get_pipeline_service()
+        self.screenshot = self.service.screenshot
+        self.ocr = self.service.ocr_engine("realtime")
+        self.translator = self.service.translator
+        interval = parse_duration(settings.value("ocr/update_interval", "1 second"), 1.0)
+        # Адаптивный интервал: выбранный в настройках интервал - начальный
+        scheduler = None
+        if settings.value("ocr/adaptive_interval", True, type=bool):
+            scheduler = AdaptiveScheduler(
+                interval,
+                cpu_budget=parse_percent(settings.value("ocr/cpu_budget", "50%"), 0.5)
+            )
+        self.source = FrameSource(
+            area_grabber(self.screenshot, x1, y1, x2, y2),
+            interval=interval,
+            max_duration=parse_duration(settings.value("ocr/max_duration", "1 minute"), 60.0),
+            scheduler=scheduler
+        )
+        # Повторно распознаются только изменившиеся текстовые блоки
+        self.incremental_ocr = IncrementalOCR(self.ocr)
+        # Перевод только устоявшегося текста (субтитры появляются плавно)
+        self.stabilizer = TextStabilizer(
+            min_frames=int(settings.value("ocr/stable_frames", 2)),
+            min_duration=parse_duration(settings.value("ocr/stable_time", "0.5 seconds"), 0.5)
+        )
+        # Остановка прерывает запрос перевода, результат которого уже не нужен
+        self.cancel_token = CancelToken()
+    
+    def translate(self, text, source_lang, target_lang, cancel_token=None):
+        """
+        Перевод с отправкой накопленного перевода по мере ответа сервера
+        (провайдером, которого настроил сервис при создании переводчика)
+        """
+        parts = []
+        
+        def on_delta(delta):
+            parts.append(delta)
+            self.translation_progress.emit("".join(parts))
+        
+        provider = self.translator.default_provider
+        return self.translator.translate(text, source_lang, target_lang, provider, cancel_token, on_delta)
+    
+    def stop(self):
+        """Остановка наблюдения"""
+        self.cancel_token.cancel()
+        self.source.stop()
+    
+    def format_status(self):
+        """Строка состояния: счетчики кадров, кэша, переводов и частота захвата"""
+        status = (
+            f"Кадров: {self.source.captured_frames}, обработано: {self.source.delivered_frames}, "
+            f"без изменений: {self.source.unchanged_frames}, пропущено: {self.source.dropped_frames}, "
+            f"блоков из кэша: {self.incremental_ocr.last_hits}/"
+            f"{self.incremental_ocr.last_hits + self.incremental_ocr.last_misses}, "
+            f"переводов: {self.stabilizer.emitted}, повторов: {self.stabilizer.suppressed}\n"
+            f"Частота захвата: {1.0 / self.source.interval:.1f} кадр/с (интервал {self.source.interval:.2f} с)"
+        )
+        scheduler = self.source.scheduler
+        if scheduler is not None and scheduler.cpu_budget:
+            status += (
+                f", ЦП: {scheduler.cpu_usage:.0%} из {scheduler.cpu_budget:.0%} "
+                f"(бюджет использован на {scheduler.budget_usage:.0%})"
+            )
+        return status
     
     def run(self):
-        # Захват области экрана
+        text = ""
         try:
-            screenshot_path = self.screenshot.capture_area(self.x1, self.y1, self.x2, self.y2)
-            
-            # Отправляем превью
-            pixmap = QPixmap(screenshot_path)
-            self.preview_ready.emit(pixmap)
-            
-            # OCR
-            text = self.ocr.recognize_text(screenshot_path)
-            
-            # Определение языков
-            source_lang_map = {
-                "Английский": "en",
-                "Русский": "ru",
-                "Японский": "ja"
-            }
-            
-            target_lang_map = {
-                "Английский": "en",
-                "Русский": "ru",
-                "Японский": "ja"
-            }
-            
-            # Получение языков из настроек
-            source_lang_text = self.settings.value("language/source", "Английский")
-            target_lang_text = self.settings.value("language/target", "Русский")
-            
-            source_lang = source_lang_map.get(source_lang_text, "en")
-            target_lang = target_lang_map.get(target_lang_text, "ru")
-            
-            # Перевод
-            translated = self.translator.translate(
-                text, source_lang, target_lang, 
-                self.settings.value("translator/provider", "openai")
-            )
-            
-            # Отправка результатов
-            self.result_ready.emit(text, translated)
+            source_lang, target_lang = get_languages(self.settings)
             
+            # Кадры без изменений не распознаются повторно, но передаются
+            # стабилизатору: по ним отсчитывается время неизменности текста.
+            # Если обработка не успевает за интервалом, промежуточные кадры
+            # отбрасываются
+            for frame in self.source.frames(include_unchanged=True):
+                if frame.change.changed:
+                    self.preview_ready.emit(image_to_pixmap(frame.image))
+                    # Кадры реального времени уступают слоты распознавания
+                    # захватам по горячей клавише
+                    with self.service.scheduler.slot(REALTIME, cancel_token=self.cancel_token):
+                        result = self.incremental_ocr.recognize(frame.image, source_lang, frame.change)
+                    if result.ok:
+                        text = result.text(self.ocr.DEFAULT_MIN_CONFIDENCE).strip()
+                    else:
+                        text = ""
+                        self.status_changed.emit(result.error)
+                
+                # Перевод выполняется, только когда текст устоялся и
+                # отличается от последнего переведенного
+                stable_text = self.stabilizer.update(text, frame.timestamp)
+                if stable_text:
+                    self.text_ready.emit(stable_text)
+                    translated = self.translate(
+                        stable_text, source_lang, target_lang, self.cancel_token
+                    )
+                    self.result_ready.emit(stable_text, translated)
+                
+                self.status_changed.emit(self.format_status())
+        except CancelledError:
+            pass
         except Exception as e:
-            self.result_ready.emit("Ошибка при обработке области", str(e))
+            self.result_ready.emit("Ошибка в режиме реального времени", str(e))
+        finally:
+            self.source.stop()
+            self.screenshot.release_thread()
 
 class AreaCaptureTab(QWidget):
     """Вкладка захвата произвольной области экрана"""
@@ -187,8 +267,14 @@ class AreaCaptureTab(QWidget):
         # Создание интерфейса
         self.init_ui()
         
+        # Разовые захваты обрабатываются конвейером общего сервиса
+        self.bridge = PipelineBridge(self)
+        self.bridge.job_progress.connect(self.on_job_progress)
+        self.bridge.job_finished.connect(self.on_job_finished)
+        
         # Инициализация переменных
-        self.capture_thread = None
+        self.realtime_thread = None
+        self.stopping_threads = []
         self.select_dialog = None
         self.last_capture_coords = None
         
@@ -216,6 +302,15 @@ class AreaCaptureTab(QWidget):
         area_button.clicked.connect(self.select_area)
         layout.addWidget(area_button)
         
+        # Режим реального времени: непрерывное наблюдение за выделенной областью
+        realtime_layout = QHBoxLayout()
+        self.realtime_checkbox = QCheckBox("Режим реального времени")
+        self.realtime_checkbox.toggled.connect(self.on_realtime_toggled)
+        realtime_layout.addWidget(self.realtime_checkbox)
+        self.realtime_status = QLabel("")
+        realtime_layout.addWidget(self.realtime_status, 1)
+        layout.addLayout(realtime_layout)
+        
         # Группа "Последнее выделение"
         last_capture_group = QGroupBox("Последнее выделение")
         last_capture_layout = QVBoxLayout()
@@ -319,16 +414,104 @@ class AreaCaptureTab(QWidget):
         self.settings.setValue("language/source", self.source_lang.currentText())
         self.settings.setValue("language/target", self.target_lang.currentText())
         
-        # Создаем и запускаем поток захвата
-        self.capture_thread = AreaCaptureThread(x1, y1, x2, y2, self.settings)
-        self.capture_thread.result_ready.connect(self.on_result_ready)
-        self.capture_thread.preview_ready.connect(self.on_preview_ready)
-        self.capture_thread.start()
+        # В режиме реального времени область наблюдается непрерывно
+        if self.realtime_checkbox.isChecked():
+            self.bridge.cancel()
+            self.start_realtime(x1, y1, x2, y2)
+            return
+        
+        # Отправляем захват в конвейер; незавершенный предыдущий захват
+        # отменяется, и его результат уже не отобразится
+        job = self.bridge.submit(
+            area_grabber(self.bridge.service.screenshot, x1, y1, x2, y2),
+            "area", *get_languages(self.settings)
+        )
+        if job is None:
+            self.original_text.setText("Очередь захвата заполнена")
+            self.translated_text.setText("Дождитесь обработки предыдущих областей")
+            return
         
         # Показываем сообщение о процессе
         self.original_text.setText("Захват области и распознавание текста...")
         self.translated_text.setText("Пожалуйста, подождите...")
     
+    def on_realtime_toggled(self, checked):
+        """Включение и выключение режима реального времени"""
+        if not checked:
+            self.stop_realtime()
+        elif self.last_capture_coords:
+            self.start_realtime(*self.last_capture_coords)
+        else:
+            self.select_area()
+    
+    def start_realtime(self, x1, y1, x2, y2):
+        """Запуск наблюдения за областью"""
+        self.stop_realtime()
+        
+        self.realtime_thread = RealtimeCaptureThread(x1, y1, x2, y2, self.settings)
+        self.realtime_thread.result_ready.connect(self.on_result_ready)
+        self.realtime_thread.preview_ready.connect(self.on_preview_ready)
+        self.realtime_thread.text_ready.connect(self.original_text.setText)
+        self.realtime_thread.translation_progress.connect(self.translated_text.setText)
+        self.realtime_thread.status_changed.connect(self.realtime_status.setText)
+        self.realtime_thread.finished.connect(self.on_realtime_finished)
+        self.realtime_thread.start()
+        self.realtime_status.setText("Наблюдение за областью...")
+    
+    def stop_realtime(self):
+        """Остановка наблюдения за областью"""
+        thread = self.realtime_thread
+        if thread is None:
+            return
+        self.realtime_thread = None
+        
+        # Поток завершится после обработки текущего кадра; его результаты
+        # больше не отображаются, а ссылка хранится до завершения потока
+        thread.result_ready.disconnect()
+        thread.preview_ready.disconnect()
+        thread.text_ready.disconnect()
+        thread.translation_progress.disconnect()
+        thread.status_changed.disconnect()
+        thread.stop()
+        self.stopping_threads.append(thread)
+        thread.finished.connect(lambda: self.stopping_threads.remove(thread))
+    
+    def on_realtime_finished(self):
+        """Завершение наблюдения (по достижении максимальной длительности или остановке)"""
+        if self.sender() is not self.realtime_thread:
+            return
+        self.realtime_thread = None
+        self.realtime_checkbox.blockSignals(True)
+        self.realtime_checkbox.setChecked(False)
+        self.realtime_checkbox.blockSignals(False)
+        self.realtime_status.setText("Режим реального времени остановлен")
+    
+    def on_job_progress(self, job, stage):
+        """
+        Ход обработки задания конвейера: части результата показываются по
+        мере готовности - превью после захвата, распознанный текст после OCR
+        (пока перевод еще выполняется) и перевод по мере ответа сервера
+        """
+        if stage == "capture":
+            self.on_preview_ready(image_to_pixmap(job.image))
+            self.original_text.setText("Распознавание текста...")
+        elif stage == "ocr" and job.text:
+            self.original_text.setText(job.text)
+        elif stage == "translate_delta":
+            self.translated_text.setText(job.translated)
+    
+    def on_job_finished(self, job):
+        """Результат задания конвейера"""
+        if job.failed_stage == "capture":
+            self.on_result_ready("Ошибка при обработке области", "Не удалось захватить область экрана")
+        elif job.failed_stage == "translate":
+            # Распознанный текст показывается и при ошибке перевода
+            self.on_result_ready(job.text, job.error)
+        elif not job.ok:
+            self.on_result_ready("Ошибка при обработке области", job.error)
+        else:
+            self.on_result_ready(job.text or "Текст не обнаружен", job.translated)
+    
     def on_preview_ready(self, pixmap):
         """Обработка готового предпросмотра"""
         # Масштабируем изображение, чтобы оно вписалось в размер метки
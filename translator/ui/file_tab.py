@@ -11,55 +11,86 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QSettings, QTimer, pyqtSignal, QThread
 from PyQt5.QtGui import QPixmap, QImage, QColor, QPainter, QCursor, QDragEnterEvent, QDropEvent
 
-from translator.utils.ocr import OCREngine
-from translator.models.translator import LLMTranslator
+from translator.utils.cancellation import CancelledError, CancelToken
+from translator.utils.job_scheduler import INTERACTIVE
+from translator.utils.pipeline_service import get_pipeline_service
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
 
 class FileProcessThread(QThread):
-    """Поток для обработки файла и выполнения OCR + перевода"""
+    """Поток для обработки файлов и выполнения OCR + перевода"""
     result_ready = pyqtSignal(str, str)
     preview_ready = pyqtSignal(QPixmap)
+    # Распознанный текст (до перевода) и перевод на данный момент
+    text_ready = pyqtSignal(str)
+    translation_progress = pyqtSignal(str)
     
-    def __init__(self, file_path, settings):
+    def __init__(self, file_paths, settings):
         super().__init__()
-        self.file_path = file_path
+        # Поддерживается как один путь, так и список путей
+        self.file_paths = [file_paths] if isinstance(file_paths, str) else list(file_paths)
+        self.file_path = self.file_paths[0]
         self.settings = settings
-        self.ocr = OCREngine(settings.value("ocr/tesseract_path", ""))
+        # Общие прогретые OCR движок и переводчик; пул процессов пакетной
+        # обработки сохраняется между запусками
+        service = get_pipeline_service()
+        self.scheduler = service.scheduler
+        self.ocr = service.ocr_engine("file")
+        self.translator = service.translator
+        # Отмена снимает изображения с пула OCR и прерывает запрос перевода
+        self.cancel_token = CancelToken()
+    
+    def cancel(self):
+        """Отмена обработки; результаты не отправляются"""
+        self.cancel_token.cancel()
+    
+    def translate(self, text, source_lang, target_lang, prefix=""):
+        """
+        Перевод с отправкой накопленного перевода по мере ответа сервера
         
-        # Создание переводчика
-        db_dir = os.path.join(os.path.expanduser("~"), ".translator")
-        if not os.path.exists(db_dir):
-            os.makedirs(db_dir)
-        db_path = os.path.join(db_dir, "translations.db")
+        Провайдер берется из переводчика сервиса, а не из QSettings: так
+        запрос уходит провайдеру, которого сервис настроил.
         
-        self.translator = LLMTranslator(db_path)
+        Args:
+            prefix: уже готовые переводы (при пакетной обработке), к которым
+                добавляется перевод текущего текста
+        """
+        parts = [prefix]
         
-        # Настройка API ключей
-        provider = self.settings.value("translator/provider", "openai")
+        def on_delta(delta):
+            parts.append(delta)
+            self.translation_progress.emit("".join(parts))
         
-        if provider == "openai":
-            api_key = self.settings.value("openai/api_key", "")
-            base_url = self.settings.value("openai/base_url", "https://api.openai.com/v1")
-            if api_key:
-                self.translator.set_api_key("openai", api_key, base_url)
-        else:
-            api_key = self.settings.value("deepseek/api_key", "")
-            base_url = self.settings.value("deepseek/base_url", "https://api.aiguoguo199.com/v1")
-            if api_key:
-                self.translator.set_api_key("deepseek", api_key, base_url)
-                
-        self.translator.set_default_provider(provider)
+        provider = self.translator.default_provider
+        return self.translator.translate(text, source_lang, target_lang, provider, self.cancel_token, on_delta)
     
     def run(self):
+        try:
+            # Несколько файлов распознаются параллельно в пуле процессов
+            if len(self.file_paths) > 1:
+                self.run_batch()
+            else:
+                self.run_single()
+        except CancelledError:
+            pass
+    
+    def run_single(self):
+        """Обработка одного файла"""
+        
         # Обработка файла
         try:
             # Проверяем, является ли файл изображением
-            if self.file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
+            if self.file_path.lower().endswith(IMAGE_EXTENSIONS):
                 # Отправляем превью
                 pixmap = QPixmap(self.file_path)
                 self.preview_ready.emit(pixmap)
                 
                 # OCR
-                text = self.ocr.recognize_text(self.file_path)
+                with self.scheduler.slot(INTERACTIVE, cancel_token=self.cancel_token):
+                    text = self.ocr.recognize_text(self.file_path)
+                self.cancel_token.raise_if_cancelled()
+                # Текст показывается, не дожидаясь перевода
+                self.text_ready.emit(text)
             else:
                 # Для других типов файлов в будущих версиях
                 self.preview_ready.emit(QPixmap())
@@ -87,16 +118,70 @@ class FileProcessThread(QThread):
             target_lang = target_lang_map.get(target_lang_text, "ru")
             
             # Перевод
-            translated = self.translator.translate(
-                text, source_lang, target_lang, 
-                self.settings.value("translator/provider", "openai")
-            )
+            translated = self.translate(text, source_lang, target_lang)
             
             # Отправка результатов
             self.result_ready.emit(text, translated)
             
+        except CancelledError:
+            raise
         except Exception as e:
             self.result_ready.emit("Ошибка при обработке файла", str(e))
+    
+    def run_batch(self):
+        """Пакетная обработка нескольких изображений"""
+        try:
+            images = [path for path in self.file_paths if path.lower().endswith(IMAGE_EXTENSIONS)]
+            if not images:
+                self.preview_ready.emit(QPixmap())
+                self.result_ready.emit("Тип файла не поддерживается", "Поддерживаются только изображения (.png, .jpg, .jpeg, .bmp, .tiff)")
+                return
+            
+            # Превью первого изображения
+            self.preview_ready.emit(QPixmap(images[0]))
+            
+            lang_map = {
+                "Английский": "en",
+                "Русский": "ru",
+                "Японский": "ja"
+            }
+            source_lang = lang_map.get(self.settings.value("language/source", "Английский"), "en")
+            target_lang = lang_map.get(self.settings.value("language/target", "Русский"), "ru")
+            
+            # Количество процессов OCR (0 - по количеству ядер)
+            processes = int(self.settings.value("ocr/batch_workers", 0)) or None
+            
+            originals = []
+            translations = []
+            # Изображения пакета получают пакетные слоты планировщика и не
+            # задерживают захваты по горячей клавише
+            results = self.ocr.recognize_many(
+                images, source_lang, processes=processes,
+                cancel_token=self.cancel_token, scheduler=self.scheduler
+            )
+            # Результаты показываются по мере распознавания и перевода
+            # изображений, а не после обработки всего пакета
+            for index, result in results:
+                name = os.path.basename(images[index])
+                text = self.ocr.result_to_text(result)
+                originals.append(f"=== {name} ===\n{text}")
+                self.text_ready.emit("\n\n".join(originals))
+                
+                header = "\n\n".join(translations + [f"=== {name} ===\n"])
+                translated = (
+                    self.translate(text, source_lang, target_lang, header)
+                    if result.ok else text
+                )
+                translations.append(f"=== {name} ===\n{translated}")
+                self.translation_progress.emit("\n\n".join(translations))
+            
+            # После отмены перебор результатов завершается досрочно
+            self.cancel_token.raise_if_cancelled()
+            self.result_ready.emit("\n\n".join(originals), "\n\n".join(translations))
+        except CancelledError:
+            raise
+        except Exception as e:
+            self.result_ready.emit("Ошибка при обработке файлов", str(e))
 
 class FileTab(QWidget):
     """Вкладка для работы с файлами"""
@@ -113,7 +198,9 @@ class FileTab(QWidget):
         
         # Инициализация переменных
         self.process_thread = None
+        self.stopping_threads = []
         self.current_file = None
+        self.current_files = []
         
         # Настройка поддержки drag-and-drop
         self.setAcceptDrops(True)
@@ -126,19 +213,19 @@ class FileTab(QWidget):
         # Кнопки для выбора файла
         file_buttons_layout = QHBoxLayout()
         
-        select_file_button = QPushButton("Выбрать файл")
+        select_file_button = QPushButton("Выбрать файлы")
         select_file_button.clicked.connect(self.select_file)
         file_buttons_layout.addWidget(select_file_button)
         
         layout.addLayout(file_buttons_layout)
         
         # Область для drag-and-drop
-        dropzone_group = QGroupBox("Перетащите файл сюда")
+        dropzone_group = QGroupBox("Перетащите файлы сюда")
         dropzone_layout = QVBoxLayout()
         dropzone_group.setLayout(dropzone_layout)
         
         # Метка с информацией
-        dropzone_label = QLabel("или нажмите кнопку 'Выбрать файл'")
+        dropzone_label = QLabel("или нажмите кнопку 'Выбрать файлы'")
         dropzone_label.setAlignment(Qt.AlignCenter)
         dropzone_layout.addWidget(dropzone_label)
         
@@ -218,32 +305,46 @@ class FileTab(QWidget):
         layout.addWidget(results_group)
     
     def select_file(self):
-        """Открытие диалога выбора файла"""
-        file_path, _ = QFileDialog.getOpenFileName(
+        """Открытие диалога выбора файлов"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self, 
-            "Выберите изображение", 
+            "Выберите изображения", 
             "", 
             "Изображения (*.png *.jpg *.jpeg *.bmp *.tiff);;PDF (*.pdf);;Все файлы (*)"
         )
         
-        if file_path:
-            self.current_file = file_path
-            # Показываем имя файла
-            self.file_preview.setText(f"Выбран файл: {os.path.basename(file_path)}")
-            
-            # Если это изображение, показываем превью
-            if file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-                pixmap = QPixmap(file_path)
-                # Масштабируем для отображения
-                scaled_pixmap = pixmap.scaled(
-                    self.file_preview.width(), self.file_preview.height(),
-                    Qt.KeepAspectRatio, Qt.SmoothTransformation
-                )
-                self.file_preview.setPixmap(scaled_pixmap)
+        if file_paths:
+            self.set_files(file_paths)
             
             # Автоматически запускаем обработку
             self.process_file()
     
+    def set_files(self, file_paths):
+        """
+        Выбор файлов для обработки и отображение превью
+        
+        Args:
+            file_paths: список путей к файлам
+        """
+        self.current_files = list(file_paths)
+        self.current_file = self.current_files[0]
+        
+        # Показываем имя файла или количество файлов
+        if len(self.current_files) == 1:
+            self.file_preview.setText(f"Выбран файл: {os.path.basename(self.current_file)}")
+        else:
+            self.file_preview.setText(f"Выбрано файлов: {len(self.current_files)}")
+        
+        # Если это изображение, показываем превью
+        if self.current_file.lower().endswith(IMAGE_EXTENSIONS):
+            pixmap = QPixmap(self.current_file)
+            # Масштабируем для отображения
+            scaled_pixmap = pixmap.scaled(
+                self.file_preview.width(), self.file_preview.height(),
+                Qt.KeepAspectRatio, Qt.SmoothTransformation
+            )
+            self.file_preview.setPixmap(scaled_pixmap)
+    
     def process_file(self):
         """Обработка выбранного файла"""
         if not self.current_file:
@@ -254,18 +355,38 @@ class FileTab(QWidget):
         self.settings.setValue("language/source", self.source_lang.currentText())
         self.settings.setValue("language/target", self.target_lang.currentText())
         
+        # Незавершенная обработка прежних файлов отменяется
+        self.cancel_processing()
+        
         # Создаем и запускаем поток обработки
-        self.process_thread = FileProcessThread(self.current_file, self.settings)
+        self.process_thread = FileProcessThread(self.current_files or [self.current_file], self.settings)
         self.process_thread.result_ready.connect(self.on_result_ready)
         self.process_thread.preview_ready.connect(self.on_preview_ready)
+        self.process_thread.text_ready.connect(self.on_text_ready)
+        self.process_thread.translation_progress.connect(self.on_translation_progress)
         self.process_thread.start()
         
         # Показываем сообщение о процессе
         self.original_text.setText("Обработка файла и распознавание текста...")
         self.translated_text.setText("Пожалуйста, подождите...")
     
+    def cancel_processing(self):
+        """Отмена текущей обработки; ее результаты больше не отображаются"""
+        thread = self.process_thread
+        if thread is None:
+            return
+        self.process_thread = None
+        thread.cancel()
+        # Ссылка на поток хранится до его завершения
+        if thread.isRunning():
+            self.stopping_threads.append(thread)
+            thread.finished.connect(lambda: self.stopping_threads.remove(thread))
+    
     def on_preview_ready(self, pixmap):
         """Обработка готового предпросмотра"""
+        # Сигналы отмененных потоков, еще стоящие в очереди событий, пропускаются
+        if self.sender() is not self.process_thread:
+            return
         if not pixmap.isNull():
             # Масштабируем изображение, чтобы оно вписалось в размер метки
             scaled_pixmap = pixmap.scaled(
@@ -274,8 +395,22 @@ class FileTab(QWidget):
             )
             self.file_preview.setPixmap(scaled_pixmap)
     
+    def on_text_ready(self, text):
+        """Распознанный текст до завершения перевода"""
+        if self.sender() is not self.process_thread:
+            return
+        self.original_text.setText(text)
+    
+    def on_translation_progress(self, translated):
+        """Перевод по мере ответа сервера"""
+        if self.sender() is not self.process_thread:
+            return
+        self.translated_text.setText(translated)
+    
     def on_result_ready(self, original, translated):
         """Обработка результатов распознавания и перевода"""
+        if self.sender() is not self.process_thread:
+            return
         self.original_text.setText(original)
         self.translated_text.setText(translated)
     
@@ -341,28 +476,18 @@ class FileTab(QWidget):
     def dropEvent(self, event: QDropEvent):
         """Обработка события сброса файла на область"""
         if event.mimeData().hasUrls():
-            url = event.mimeData().urls()[0]
-            file_path = url.toLocalFile()
-            
             # Проверка, является ли файл изображением или PDF
-            valid_extensions = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.pdf')
-            if file_path.lower().endswith(valid_extensions):
-                self.current_file = file_path
-                # Показываем имя файла
-                self.file_preview.setText(f"Выбран файл: {os.path.basename(file_path)}")
-                
-                # Если это изображение, показываем превью
-                if file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-                    pixmap = QPixmap(file_path)
-                    # Масштабируем для отображения
-                    scaled_pixmap = pixmap.scaled(
-                        self.file_preview.width(), self.file_preview.height(),
-                        Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                    self.file_preview.setPixmap(scaled_pixmap)
+            valid_extensions = IMAGE_EXTENSIONS + ('.pdf',)
+            file_paths = [
+                url.toLocalFile() for url in event.mimeData().urls()
+                if url.toLocalFile().lower().endswith(valid_extensions)
+            ]
+            if file_paths:
+                self.set_files(file_paths)
                 
                 # Автоматически запускаем обработку
                 self.process_file()
             else:
                 self.file_preview.setText("Неподдерживаемый формат файла. Поддерживаются только изображения и PDF.")
-                self.current_file = None 
\ No newline at end of file
+                self.current_file = None
+                self.current_files = [] 
\ No newline at end of file
@@ -4,22 +4,40 @@
 
 import os
 import sys
+import importlib
 from PyQt5.QtWidgets import (
     QMainWindow, QTabWidget, QAction, QMenu, QMenuBar, 
-    QStatusBar, QSystemTrayIcon, QApplication
+    QStatusBar, QSystemTrayIcon, QApplication, QWidget, QVBoxLayout, QLabel
 )
-from PyQt5.QtCore import Qt, QSettings
+from PyQt5.QtCore import Qt, QSettings, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon
 
-from translator.ui.screen_capture_tab import ScreenCaptureTab
-from translator.ui.area_capture_tab import AreaCaptureTab
-from translator.ui.file_tab import FileTab
-from translator.ui.history_tab import HistoryTab
-from translator.ui.settings_tab import SettingsTab
 from translator.utils.hotkeys import HotkeyManager
 
+# Вкладки: (атрибут окна, заголовок, модуль, класс). Модули вкладок загружают
+# OCR движки, переводчик и библиотеки захвата, поэтому они импортируются и
+# создаются только после первой отрисовки окна
+TABS = (
+    ("area_capture_tab", "Область экрана", "translator.ui.area_capture_tab", "AreaCaptureTab"),
+    ("screen_capture_tab", "Захват окна", "translator.ui.screen_capture_tab", "ScreenCaptureTab"),
+    ("file_tab", "Файлы", "translator.ui.file_tab", "FileTab"),
+    ("history_tab", "История", "translator.ui.history_tab", "HistoryTab"),
+    ("settings_tab", "Настройки", "translator.ui.settings_tab", "SettingsTab"),
+)
+
 class MainWindow(QMainWindow):
-    """Главное окно приложения"""
+    """
+    Главное окно приложения
+    
+    Окно показывается сразу, с заглушками вместо вкладок. После первой
+    отрисовки вкладки создаются по одной за итерацию цикла событий (сначала
+    текущая), затем регистрируются глобальные горячие клавиши. Вкладка,
+    открытая пользователем раньше, создается сразу.
+    """
+    # Окно отрисовано в первый раз
+    first_painted = pyqtSignal()
+    # Все вкладки созданы
+    tabs_ready = pyqtSignal()
     
     def __init__(self):
         """Инициализация главного окна"""
@@ -28,12 +46,16 @@ class MainWindow(QMainWindow):
         # Загрузка настроек
         self.settings = QSettings("TranslatorApp", "Translator")
         
+        self._tabs = {}
+        self._tab_pages = {}
+        self._painted = False
+        self._pending_tabs = []
+        
         # Инициализация интерфейса
         self.init_ui()
         
-        # Инициализация менеджера горячих клавиш
+        # Менеджер горячих клавиш запускается после создания вкладок
         self.hotkey_manager = HotkeyManager()
-        self.setup_global_hotkeys()
     
     def init_ui(self):
         """Инициализация интерфейса"""
@@ -45,19 +67,15 @@ class MainWindow(QMainWindow):
         self.tab_widget = QTabWidget()
         self.setCentralWidget(self.tab_widget)
         
-        # Создание вкладок
-        self.screen_capture_tab = ScreenCaptureTab()
-        self.area_capture_tab = AreaCaptureTab()
-        self.file_tab = FileTab()
-        self.history_tab = HistoryTab()
-        self.settings_tab = SettingsTab()
-        
-        # Добавление вкладок в виджет
-        self.tab_widget.addTab(self.area_capture_tab, "Область экрана")
-        self.tab_widget.addTab(self.screen_capture_tab, "Захват окна")
-        self.tab_widget.addTab(self.file_tab, "Файлы")
-        self.tab_widget.addTab(self.history_tab, "История")
-        self.tab_widget.addTab(self.settings_tab, "Настройки")
+        # Страницы вкладок с заглушками; сами вкладки создаются позже
+        for name, title, _, _ in TABS:
+            page = QWidget()
+            layout = QVBoxLayout(page)
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.addWidget(QLabel("Загрузка...", alignment=Qt.AlignCenter))
+            self._tab_pages[name] = page
+            self.tab_widget.addTab(page, title)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         # Создание меню
         self.create_menu()
@@ -65,11 +83,105 @@ class MainWindow(QMainWindow):
         # Создание статусной строки
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
-        self.statusBar.showMessage("Готов к работе")
+        self.statusBar.showMessage("Загрузка...")
         
         # Настройка трея (иконки в системном лотке)
         self.setup_tray()
     
+    def tab(self, name):
+        """
+        Вкладка по имени атрибута (создается при первом обращении)
+        
+        Args:
+            name: имя из TABS ("area_capture_tab", "screen_capture_tab", ...)
+        
+        Returns:
+            QWidget: вкладка
+        """
+        tab = self._tabs.get(name)
+        if tab is None:
+            module_name, class_name = next(
+                (module_name, class_name) for tab_name, _, module_name, class_name in TABS if tab_name == name
+            )
+            tab = getattr(importlib.import_module(module_name), class_name)()
+            self._tabs[name] = tab
+            
+            # Вкладки разовых захватов сообщают состояние конвейера после
+            # каждого задания
+            bridge = getattr(tab, "bridge", None)
+            if bridge is not None:
+                bridge.stats_changed.connect(self.statusBar.showMessage)
+            
+            # Вкладка заменяет заглушку на своей странице
+            layout = self._tab_pages[name].layout()
+            placeholder = layout.takeAt(0).widget()
+            placeholder.deleteLater()
+            layout.addWidget(tab)
+        return tab
+    
+    @property
+    def area_capture_tab(self):
+        """Вкладка захвата области экрана"""
+        return self.tab("area_capture_tab")
+    
+    @property
+    def screen_capture_tab(self):
+        """Вкладка захвата окна"""
+        return self.tab("screen_capture_tab")
+    
+    @property
+    def file_tab(self):
+        """Вкладка файлов"""
+        return self.tab("file_tab")
+    
+    @property
+    def history_tab(self):
+        """Вкладка истории переводов"""
+        return self.tab("history_tab")
+    
+    @property
+    def settings_tab(self):
+        """Вкладка настроек"""
+        return self.tab("settings_tab")
+    
+    def on_tab_changed(self, index):
+        """Открытая пользователем вкладка создается, не дожидаясь очереди"""
+        if index >= 0:
+            self.tab(TABS[index][0])
+    
+    def paintEvent(self, event):
+        """Отрисовка окна; после первой запускается создание вкладок"""
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            # Продолжение - в следующей итерации цикла событий, когда кадр
+            # уже выведен на экран
+            QTimer.singleShot(0, self.on_first_paint)
+    
+    def on_first_paint(self):
+        """Первая отрисовка: создание вкладок, начиная с текущей"""
+        self.first_painted.emit()
+        current = TABS[self.tab_widget.currentIndex()][0]
+        self._pending_tabs = [current] + [name for name, _, _, _ in TABS if name != current]
+        self.create_next_tab()
+    
+    def create_next_tab(self):
+        """Создание следующей вкладки; окно остается отзывчивым между вкладками"""
+        if self._pending_tabs:
+            self.tab(self._pending_tabs.pop(0))
+            QTimer.singleShot(0, self.create_next_tab)
+            return
+        
+        # Обработчики горячих клавиш обращаются к вкладкам, поэтому
+        # регистрируются после их создания
+        self.setup_global_hotkeys()
+        self.statusBar.showMessage("Готов к работе")
+        self.tabs_ready.emit()
+    
+    def select_area(self):
+        """Выбор области экрана для захвата"""
+        self.area_capture_tab.select_area()
+    
     def create_menu(self):
         """Создание меню приложения"""
         # Создание меню
@@ -90,7 +202,7 @@ class MainWindow(QMainWindow):
         # Действие "Захват области экрана"
         area_action = QAction("Захват области экрана", self)
         area_action.setShortcut(self.settings.value("hotkeys/area_capture", "Alt+Shift+C"))
-        area_action.triggered.connect(self.area_capture_tab.select_area)
+        area_action.triggered.connect(self.select_area)
         tools_menu.addAction(area_action)
         
         # Действие "Захват окна"
@@ -129,7 +241,7 @@ class MainWindow(QMainWindow):
             
             # Действие "Захват области"
             area_action = QAction("Захват области экрана", self)
-            area_action.triggered.connect(self.area_capture_tab.select_area)
+            area_action.triggered.connect(self.select_area)
             tray_menu.addAction(area_action)
             
             # Действие "Захват окна"
@@ -163,7 +275,7 @@ class MainWindow(QMainWindow):
             show_hide_hotkey = self.settings.value("hotkeys/show_hide", "Alt+Shift+H")
             
             # Регистрация обработчиков
-            self.hotkey_manager.register_hotkey(area_hotkey, self.area_capture_tab.select_area)
+            self.hotkey_manager.register_hotkey(area_hotkey, self.select_area)
             self.hotkey_manager.register_hotkey(window_hotkey, self.capture_active_window)
             self.hotkey_manager.register_hotkey(show_hide_hotkey, self.toggle_window)
             
@@ -225,7 +337,7 @@ class MainWindow(QMainWindow):
     def capture_active_window(self):
         """Захват активного окна"""
         # Переключение на вкладку захвата окна
-        self.tab_widget.setCurrentWidget(self.screen_capture_tab)
+        self.tab_widget.setCurrentWidget(self._tab_pages["screen_capture_tab"])
         
         # Активация окна приложения
         self.show()
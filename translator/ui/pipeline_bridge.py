@@ -0,0 +1,115 @@
+"""
+Модуль передачи результатов конвейера захвата в поток интерфейса
+"""
+
+import queue
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from translator.utils.pipeline_service import get_pipeline_service
+
+class PipelineBridge(QObject):
+    """
+    Отправка заданий в конвейер захвата сервиса и сигналы об их ходе
+
+    Этапы конвейера выполняются в его потоках; сигналы доставляются
+    получателям в потоке интерфейса через очередь событий Qt.
+
+    Актуально только последнее отправленное задание: новое задание отменяет
+    предыдущее (прерывая его распознавание и запрос перевода), а сигналы
+    устаревших заданий отбрасываются в потоке интерфейса, поэтому результат
+    старого захвата не может заменить результат нового.
+    
+    Части результата передаются по мере готовности (см.
+    PipelineService.submit_capture): снимок, распознанный текст, части
+    перевода. Части перевода не накапливаются в очереди событий: пока
+    предыдущая не отображена, следующие только дополняют job.translated.
+    """
+    # Задание и имя готовой части результата ("capture", "ocr", "translate_delta")
+    job_progress = pyqtSignal(object, str)
+    # Задание после последнего этапа (успешное или с ошибкой)
+    job_finished = pyqtSignal(object)
+    # Строка состояния конвейера и планировщика после каждого задания
+    # (см. format_stats)
+    stats_changed = pyqtSignal(str)
+
+    # Сигналы из потоков конвейера, проверяемые в потоке интерфейса
+    _stage_done = pyqtSignal(object, str)
+    _job_done = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.service = get_pipeline_service()
+        self.current_job = None
+        # Задания, часть перевода которых ожидает отображения
+        self._pending_deltas = set()
+        self._stage_done.connect(self._on_stage_done)
+        self._job_done.connect(self._on_job_done)
+
+    def submit(self, grab, mode, source_lang, target_lang):
+        """
+        Отправка разового захвата; предыдущее задание отменяется
+
+        Args:
+            grab: функция захвата изображения
+            mode: режим захвата ("area", "window")
+            source_lang: код языка оригинала
+            target_lang: код языка перевода
+
+        Returns:
+            Job: задание или None, если очередь захвата заполнена
+        """
+        self.cancel()
+        try:
+            self.current_job = self.service.submit_capture(
+                grab, mode, source_lang, target_lang,
+                callback=self._job_done.emit, progress=self._on_progress
+            )
+        except queue.Full:
+            return None
+        return self.current_job
+
+    def cancel(self):
+        """Отмена текущего задания; его результаты не будут переданы"""
+        job, self.current_job = self.current_job, None
+        if job is not None:
+            job.cancel()
+
+    def is_current(self, job):
+        """True, если задание - последнее отправленное и не отменено"""
+        return job is self.current_job and not job.cancelled
+
+    def _on_progress(self, job, stage):
+        """Готовая часть результата (в потоке конвейера)"""
+        if stage == "translate_delta":
+            if job.id in self._pending_deltas:
+                return
+            self._pending_deltas.add(job.id)
+        self._stage_done.emit(job, stage)
+
+    def _on_stage_done(self, job, stage):
+        """Передача хода обработки актуального задания"""
+        if stage == "translate_delta":
+            # Получатель прочитает job.translated со всеми частями на этот момент
+            self._pending_deltas.discard(job.id)
+        if self.is_current(job):
+            self.job_progress.emit(job, stage)
+
+    def _on_job_done(self, job):
+        """Передача результата актуального задания"""
+        self._pending_deltas.discard(job.id)
+        if self.is_current(job):
+            self.current_job = None
+            self.job_finished.emit(job)
+        self.stats_changed.emit(self.format_stats())
+
+    def format_stats(self):
+        """
+        Состояние конвейера и планировщика: глубина очередей и занятость
+        этапов, медианные задержки первого и полного результата, занятые и
+        ожидающие слоты распознавания по классам приоритета
+        """
+        return (
+            f"Конвейер: {self.service.capture_pipeline.format_stats()}. "
+            f"Слоты OCR: {self.service.scheduler.format_stats()}"
+        )
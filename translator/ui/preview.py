@@ -0,0 +1,39 @@
+"""
+Модуль преобразования захваченных изображений для предпросмотра
+"""
+
+import numpy as np
+from PyQt5.QtGui import QImage, QPixmap
+
+def image_to_qimage(image):
+    """
+    Преобразование массива NumPy в QImage
+
+    Args:
+        image: изображение BGRA, BGR или в оттенках серого (массив NumPy)
+
+    Returns:
+        QImage: копия изображения (не зависит от памяти массива)
+    """
+    image = np.ascontiguousarray(image)
+    height, width = image.shape[:2]
+    if image.ndim == 2:
+        image_format = QImage.Format_Grayscale8
+    elif image.shape[2] == 4:
+        # Раскладка BGRA в памяти совпадает с форматом RGB32 на little-endian
+        image_format = QImage.Format_RGB32
+    else:
+        image_format = QImage.Format_BGR888
+    return QImage(image.data, width, height, image.strides[0], image_format).copy()
+
+def image_to_pixmap(image):
+    """
+    Преобразование массива NumPy в QPixmap для предпросмотра
+
+    Args:
+        image: изображение BGRA, BGR или в оттенках серого (массив NumPy)
+
+    Returns:
+        QPixmap: изображение для отображения
+    """
+    return QPixmap.fromImage(image_to_qimage(image))
@@ -2,7 +2,6 @@
 Tab for capturing application windows
 """
 
-import os
 import sys
 import time
 from PyQt5.QtWidgets import (
@@ -10,106 +9,29 @@ from PyQt5.QtWidgets import (
     QListWidget, QListWidgetItem, QComboBox, QTextEdit, QGroupBox,
     QApplication
 )
-from PyQt5.QtCore import Qt, QSettings, QTimer, pyqtSignal, QThread
-from PyQt5.QtGui import QPixmap, QImage, QColor, QPainter
+from PyQt5.QtCore import Qt, QSettings, QTimer
+from PyQt5.QtGui import QImage, QColor, QPainter
 
-from translator.utils.screenshot import ScreenCapture
-from translator.utils.ocr import OCREngine
-from translator.models.translator import LLMTranslator
-from translator.utils.window_manager import WindowManager
+from translator.ui.pipeline_bridge import PipelineBridge
+from translator.ui.preview import image_to_pixmap
+from translator.utils.realtime import window_grabber
+from translator.utils.window_manager import get_window_manager
 
-class WindowCaptureThread(QThread):
-    """Thread for window capture and OCR + translation"""
-    result_ready = pyqtSignal(str, str)
-    preview_ready = pyqtSignal(QPixmap)
+def get_languages(settings):
+    """
+    Source and target language codes from the settings
     
-    def __init__(self, window_title, settings):
-        super().__init__()
-        self.window_title = window_title
-        self.settings = settings
-        self.screenshot = ScreenCapture()
-        self.ocr = OCREngine(settings.value("ocr/tesseract_path", ""))
-        self.window_manager = WindowManager()
-        
-        # Create translator
-        db_dir = os.path.join(os.path.expanduser("~"), ".translator")
-        if not os.path.exists(db_dir):
-            os.makedirs(db_dir)
-        db_path = os.path.join(db_dir, "translations.db")
-        
-        self.translator = LLMTranslator(db_path)
-        
-        # Set up API keys
-        provider = self.settings.value("translator/provider", "openai")
-        
-        if provider == "openai":
-            api_key = self.settings.value("openai/api_key", "")
-            base_url = self.settings.value("openai/base_url", "https://api.openai.com/v1")
-            if api_key:
-                self.translator.set_api_key("openai", api_key, base_url)
-        else:
-            api_key = self.settings.value("deepseek/api_key", "")
-            base_url = self.settings.value("deepseek/base_url", "https://api.aiguoguo199.com/v1")
-            if api_key:
-                self.translator.set_api_key("deepseek", api_key, base_url)
-                
-        self.translator.set_default_provider(provider)
-    
-    def run(self):
-        # Window capture
-        try:
-            # Get current window list
-            self.window_manager.get_window_list()
-            
-            # Get coordinates of the window to capture
-            window_rect = self.window_manager.capture_window(self.window_title)
-            
-            if window_rect:
-                # Capture the specified area
-                x, y, width, height = window_rect
-                screenshot_path = self.screenshot.capture_area(x, y, x + width, y + height)
-            else:
-                # Fallback: use fullscreen capture
-                screenshot_path = self.screenshot.capture_fullscreen()
-            
-            # Send preview
-            pixmap = QPixmap(screenshot_path)
-            self.preview_ready.emit(pixmap)
-            
-            # OCR
-            text = self.ocr.recognize_text(screenshot_path)
-            
-            # Define languages
-            source_lang_map = {
-                "English": "en",
-                "Russian": "ru",
-                "Japanese": "ja"
-            }
-            
-            target_lang_map = {
-                "English": "en",
-                "Russian": "ru",
-                "Japanese": "ja"
-            }
-            
-            # Get languages from settings
-            source_lang_text = self.settings.value("language/source", "English")
-            target_lang_text = self.settings.value("language/target", "Russian")
-            
-            source_lang = source_lang_map.get(source_lang_text, "en")
-            target_lang = target_lang_map.get(target_lang_text, "ru")
-            
-            # Translation
-            translated = self.translator.translate(
-                text, source_lang, target_lang, 
-                self.settings.value("translator/provider", "openai")
-            )
-            
-            # Send results
-            self.result_ready.emit(text, translated)
-            
-        except Exception as e:
-            self.result_ready.emit("Error processing window", str(e))
+    Returns:
+        tuple: (source language code, target language code)
+    """
+    lang_map = {
+        "English": "en",
+        "Russian": "ru",
+        "Japanese": "ja"
+    }
+    source_lang_text = settings.value("language/source", "English")
+    target_lang_text = settings.value("language/target", "Russian")
+    return lang_map.get(source_lang_text, "en"), lang_map.get(target_lang_text, "ru")
 
 class ScreenCaptureTab(QWidget):
     """Window capture tab"""
@@ -125,8 +47,12 @@ class ScreenCaptureTab(QWidget):
         self.init_ui()
         
         # Initialize objects for working with windows
-        self.window_manager = WindowManager()
-        self.capture_thread = None
+        self.window_manager = get_window_manager()
+        
+        # Captures are processed by the shared service pipeline
+        self.bridge = PipelineBridge(self)
+        self.bridge.job_progress.connect(self.on_job_progress)
+        self.bridge.job_finished.connect(self.on_job_finished)
         
         # Update window list on startup
         self.update_window_list()
@@ -271,16 +197,54 @@ class ScreenCaptureTab(QWidget):
         self.settings.setValue("language/source", self.source_lang.currentText())
         self.settings.setValue("language/target", self.target_lang.currentText())
         
-        # Create and start the capture thread
-        self.capture_thread = WindowCaptureThread(window_title, self.settings)
-        self.capture_thread.result_ready.connect(self.on_result_ready)
-        self.capture_thread.preview_ready.connect(self.on_preview_ready)
-        self.capture_thread.start()
+        # Submit the capture to the pipeline; an unfinished previous capture
+        # is cancelled and its result is never shown. The window position
+        # is looked up when the capture stage runs
+        screenshot = self.bridge.service.screenshot
+        grab_window = window_grabber(screenshot, self.window_manager, window_title)
+        
+        def grab():
+            image = grab_window()
+            # Fallback: use fullscreen capture
+            return image if image is not None else screenshot.grab_fullscreen()
+        
+        job = self.bridge.submit(grab, "window", *get_languages(self.settings))
+        if job is None:
+            self.original_text.setText("Capture queue is full")
+            self.translated_text.setText("Wait for the previous captures to finish")
+            return
         
         # Show process message
         self.original_text.setText("Capturing window and recognizing text...")
         self.translated_text.setText("Please wait...")
     
+    def on_job_progress(self, job, stage):
+        """
+        Handle pipeline progress: each part of the result is shown as soon
+        as it is ready - the preview after capture, the recognized text
+        after OCR (while the translation is still pending) and the
+        translation as it streams in
+        """
+        if stage == "capture":
+            self.on_preview_ready(image_to_pixmap(job.image))
+            self.original_text.setText("Recognizing text...")
+        elif stage == "ocr" and job.text:
+            self.original_text.setText(job.text)
+        elif stage == "translate_delta":
+            self.translated_text.setText(job.translated)
+    
+    def on_job_finished(self, job):
+        """Handle the pipeline result"""
+        if job.failed_stage == "capture":
+            self.on_result_ready("Error processing window", "Failed to capture the window")
+        elif job.failed_stage == "translate":
+            # The recognized text is shown even if translation failed
+            self.on_result_ready(job.text, job.error)
+        elif not job.ok:
+            self.on_result_ready("Error processing window", job.error)
+        else:
+            self.on_result_ready(job.text or "No text detected", job.translated)
+    
     def on_preview_ready(self, pixmap):
         """Handle the ready preview"""
         # Scale the image to fit the label size
@@ -11,6 +11,17 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QSettings
 
+from translator.utils.ocr_backends import BACKENDS
+from translator.utils.ocr_profiles import CAPTURE_MODE_PROFILES, OCR_PROFILES
+from translator.utils.pipeline_service import get_pipeline_service
+
+# Language codes of the source language combo items
+SOURCE_LANGUAGE_CODES = {
+    "English": "en",
+    "Japanese": "ja",
+    "Russian": "ru"
+}
+
 class SettingsTab(QWidget):
     """Settings tab for the application"""
     
@@ -150,7 +161,7 @@ class SettingsTab(QWidget):
         default_langs_group.setLayout(default_langs_layout)
         
         self.source_language = QComboBox()
-        self.source_language.addItems(["English", "Japanese", "Russian"])
+        self.source_language.addItems(list(SOURCE_LANGUAGE_CODES))
         default_langs_layout.addRow("Source language:", self.source_language)
         
         self.target_language = QComboBox()
@@ -270,7 +281,8 @@ class SettingsTab(QWidget):
         engine_group.setLayout(engine_layout)
         
         self.ocr_engine = QComboBox()
-        self.ocr_engine.addItems(["Tesseract OCR"])
+        self.ocr_engine.addItems(list(BACKENDS))
+        self.ocr_engine.currentTextChanged.connect(self.update_source_languages)
         engine_layout.addWidget(self.ocr_engine)
         
         # Tesseract path
@@ -289,6 +301,42 @@ class SettingsTab(QWidget):
         path_layout.addWidget(browse_button)
         tesseract_layout.addRow("Tesseract path:", path_layout)
         
+        # Number of OCR processes for batch file processing
+        self.batch_workers = QComboBox()
+        self.batch_workers.addItems(["Auto", "1", "2", "4", "8"])
+        tesseract_layout.addRow("Batch OCR processes:", self.batch_workers)
+        
+        # Directories with tessdata_fast / tessdata_best models
+        self.tessdata_dirs = {}
+        for model in ("fast", "best"):
+            tessdata_edit = QLineEdit()
+            tessdata_edit.setPlaceholderText("Default tessdata")
+            tessdata_layout = QHBoxLayout()
+            tessdata_layout.addWidget(tessdata_edit)
+            tessdata_button = QPushButton("Browse")
+            tessdata_button.clicked.connect(lambda _, edit=tessdata_edit: self.browse_tessdata(edit))
+            tessdata_layout.addWidget(tessdata_button)
+            tesseract_layout.addRow(f"tessdata_{model} directory:", tessdata_layout)
+            self.tessdata_dirs[model] = tessdata_edit
+        
+        # Speed/accuracy profile for each capture mode
+        profiles_group = QGroupBox("OCR profiles (speed/accuracy)")
+        profiles_layout = QFormLayout()
+        profiles_group.setLayout(profiles_layout)
+        
+        mode_labels = {
+            "area": "Screen area:",
+            "window": "Window capture:",
+            "file": "Files:",
+            "realtime": "Real-time mode:"
+        }
+        self.ocr_profiles = {}
+        for mode in CAPTURE_MODE_PROFILES:
+            profile_combo = QComboBox()
+            profile_combo.addItems(list(OCR_PROFILES))
+            profiles_layout.addRow(mode_labels[mode], profile_combo)
+            self.ocr_profiles[mode] = profile_combo
+        
         # Real-time settings
         realtime_group = QGroupBox("Real-time mode")
         realtime_layout = QFormLayout()
@@ -302,9 +350,28 @@ class SettingsTab(QWidget):
         self.max_duration.addItems(["30 seconds", "1 minute", "2 minutes", "5 minutes", "Infinite"])
         realtime_layout.addRow("Maximum duration:", self.max_duration)
         
+        # Text is translated once it stays the same for N frames or for the given time
+        self.stable_frames = QComboBox()
+        self.stable_frames.addItems(["1", "2", "3", "4", "5"])
+        realtime_layout.addRow("Stable frames before translating:", self.stable_frames)
+        
+        self.stable_time = QComboBox()
+        self.stable_time.addItems(["0.3 seconds", "0.5 seconds", "1 second", "2 seconds"])
+        realtime_layout.addRow("Stable time before translating:", self.stable_time)
+        
+        # The update interval above is the starting point of the adaptive scheduler
+        self.adaptive_interval = QCheckBox("Adapt the interval to content changes and CPU load")
+        self.adaptive_interval.setChecked(True)
+        realtime_layout.addRow(self.adaptive_interval)
+        
+        self.cpu_budget = QComboBox()
+        self.cpu_budget.addItems(["10%", "25%", "50%", "75%", "100%"])
+        realtime_layout.addRow("CPU budget:", self.cpu_budget)
+        
         # Add groups to the tab
         ocr_layout.addWidget(engine_group)
         ocr_layout.addWidget(tesseract_group)
+        ocr_layout.addWidget(profiles_group)
         ocr_layout.addWidget(realtime_group)
         ocr_layout.addStretch()
         
@@ -353,6 +420,28 @@ class SettingsTab(QWidget):
         
         return other_widget
     
+    def update_source_languages(self, engine):
+        """
+        Grey out the source languages the selected OCR engine has no model for
+        
+        Args:
+            engine: OCR engine name (see BACKENDS)
+        """
+        languages = BACKENDS[engine].languages if engine in BACKENDS else {}
+        model = self.source_language.model()
+        for row, code in enumerate(SOURCE_LANGUAGE_CODES.values()):
+            item = model.item(row)
+            supported = code in languages
+            item.setEnabled(supported)
+            item.setToolTip("" if supported else f"Not supported by {engine}")
+        
+        # An unsupported selection would be recognized with a wrong model
+        if not model.item(self.source_language.currentIndex()).isEnabled():
+            for row in range(model.rowCount()):
+                if model.item(row).isEnabled():
+                    self.source_language.setCurrentIndex(row)
+                    break
+    
     def browse_tesseract(self):
         """Open dialog to select Tesseract path"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -364,6 +453,12 @@ class SettingsTab(QWidget):
         if file_path:
             self.tesseract_path.setText(file_path)
     
+    def browse_tessdata(self, edit):
+        """Open dialog to select a tessdata directory"""
+        directory = QFileDialog.getExistingDirectory(self, "Select tessdata directory", edit.text())
+        if directory:
+            edit.setText(directory)
+    
     def test_api_key(self):
         """Test API key"""
         try:
@@ -477,8 +572,18 @@ class SettingsTab(QWidget):
         # OCR
         self.settings.setValue("ocr/engine", self.ocr_engine.currentText())
         self.settings.setValue("ocr/tesseract_path", self.tesseract_path.text())
+        batch_workers = self.batch_workers.currentText()
+        self.settings.setValue("ocr/batch_workers", 0 if batch_workers == "Auto" else int(batch_workers))
+        for model, tessdata_edit in self.tessdata_dirs.items():
+            self.settings.setValue(f"ocr/tessdata_{model}", tessdata_edit.text())
+        for mode, profile_combo in self.ocr_profiles.items():
+            self.settings.setValue(f"ocr/profile/{mode}", profile_combo.currentText())
         self.settings.setValue("ocr/update_interval", self.update_interval.currentText())
         self.settings.setValue("ocr/max_duration", self.max_duration.currentText())
+        self.settings.setValue("ocr/stable_frames", self.stable_frames.currentText())
+        self.settings.setValue("ocr/stable_time", self.stable_time.currentText())
+        self.settings.setValue("ocr/adaptive_interval", self.adaptive_interval.isChecked())
+        self.settings.setValue("ocr/cpu_budget", self.cpu_budget.currentText())
         
         # Other
         self.settings.setValue("other/autostart", self.autostart.isChecked())
@@ -486,6 +591,9 @@ class SettingsTab(QWidget):
         self.settings.setValue("other/confirm_exit", self.confirm_exit.isChecked())
         self.settings.setValue("other/error_logging", self.error_logging.isChecked())
         
+        # Rebuild only the OCR engines or translator whose settings changed
+        get_pipeline_service().reload()
+        
         QMessageBox.information(
             self, 
             "Information", 
@@ -531,14 +639,25 @@ class SettingsTab(QWidget):
         
         # OCR
         self.ocr_engine.setCurrentText(self.settings.value("ocr/engine", "Tesseract OCR"))
+        self.update_source_languages(self.ocr_engine.currentText())
         
         default_tesseract_path = ""
         if os.name == 'nt':  # Windows
             default_tesseract_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
         
         self.tesseract_path.setText(self.settings.value("ocr/tesseract_path", default_tesseract_path))
+        batch_workers = int(self.settings.value("ocr/batch_workers", 0))
+        self.batch_workers.setCurrentText(str(batch_workers) if batch_workers else "Auto")
+        for model, tessdata_edit in self.tessdata_dirs.items():
+            tessdata_edit.setText(self.settings.value(f"ocr/tessdata_{model}", ""))
+        for mode, profile_combo in self.ocr_profiles.items():
+            profile_combo.setCurrentText(self.settings.value(f"ocr/profile/{mode}", CAPTURE_MODE_PROFILES[mode]))
         self.update_interval.setCurrentText(self.settings.value("ocr/update_interval", "1 second"))
         self.max_duration.setCurrentText(self.settings.value("ocr/max_duration", "1 minute"))
+        self.stable_frames.setCurrentText(str(self.settings.value("ocr/stable_frames", "2")))
+        self.stable_time.setCurrentText(self.settings.value("ocr/stable_time", "0.5 seconds"))
+        self.adaptive_interval.setChecked(self.settings.value("ocr/adaptive_interval", True, type=bool))
+        self.cpu_budget.setCurrentText(self.settings.value("ocr/cpu_budget", "50%"))
         
         # Other
         self.autostart.setChecked(self.settings.value("other/autostart", False, type=bool))
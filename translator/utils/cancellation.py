@@ -0,0 +1,133 @@
+"""
+Модуль кооперативной отмены заданий
+
+Задание получает CancelToken; код, выполняющий задание, проверяет его между
+шагами или регистрирует функцию, прерывающую долгую операцию (например,
+закрывающую HTTP соединение). Отмена не останавливает потоки принудительно:
+операция завершается в ближайшей точке проверки исключением CancelledError.
+"""
+
+import threading
+
+class CancelledError(Exception):
+    """Задание отменено"""
+
+class CancelToken:
+    """Признак отмены задания с обработчиками отмены"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        """True после вызова cancel"""
+        return self._event.is_set()
+
+    def cancel(self):
+        """
+        Отмена задания; зарегистрированные обработчики вызываются один раз
+
+        Returns:
+            bool: True, если задание отменено этим вызовом
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Ошибка в обработчике отмены: {e}")
+        return True
+
+    def on_cancel(self, callback):
+        """
+        Регистрация функции, вызываемой при отмене (в потоке, вызвавшем
+        cancel); если задание уже отменено, функция вызывается сразу
+
+        Args:
+            callback: функция без аргументов
+
+        Returns:
+            callable: функция без аргументов, снимающая регистрацию
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback):
+        """Снятие регистрации обработчика"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        """Исключение CancelledError, если задание отменено"""
+        if self._event.is_set():
+            raise CancelledError()
+
+    def wait(self, timeout=None):
+        """
+        Ожидание отмены (вместо time.sleep в циклах ожидания)
+
+        Returns:
+            bool: True, если задание отменено
+        """
+        return self._event.wait(timeout)
+
+def run_cancellable(func, cancel_token, abort=None):
+    """
+    Выполнение блокирующей операции с возможностью отмены
+
+    Операция выполняется во вспомогательном потоке; вызывающий поток ждет ее
+    завершения или отмены. При отмене вызывается abort (например, закрывающий
+    соединение, чтобы прервать операцию в ее потоке), и вызывающий поток
+    сразу получает CancelledError, не дожидаясь завершения операции.
+
+    Args:
+        func: функция без аргументов
+        cancel_token: CancelToken
+        abort: функция без аргументов, прерывающая операцию
+
+    Returns:
+        результат func
+
+    Raises:
+        CancelledError: операция отменена
+    """
+    cancel_token.raise_if_cancelled()
+    done = threading.Event()
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    threading.Thread(target=target, name="Cancellable", daemon=True).start()
+    unregister = cancel_token.on_cancel(done.set)
+    try:
+        done.wait()
+    finally:
+        unregister()
+
+    if cancel_token.cancelled:
+        if abort is not None:
+            try:
+                abort()
+            except Exception as e:
+                print(f"Ошибка при прерывании операции: {e}")
+        raise CancelledError()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
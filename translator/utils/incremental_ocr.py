@@ -0,0 +1,232 @@
+"""
+Модуль инкрементального распознавания кадров
+
+Кадр делится на текстовые блоки. Если детектор изменений (FrameDiffDetector)
+сообщил, что изменилась часть кадра, повторно распознаются только текстовые
+блоки, пересекающие изменившиеся блоки сетки, а результаты остальных берутся
+с предыдущего кадра без повторного чтения их пикселей. При изменении всего
+кадра результат каждого блока ищется в кэше по хэшу его пикселей и
+переносится на новое место: так при прокрутке чата распознается только
+появившееся сообщение, а не все окно.
+"""
+
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from translator.utils.frame_diff import FrameChange
+from translator.utils.ocr_result import OCRResult
+from translator.utils.preprocessing import to_grayscale
+
+class IncrementalOCR:
+    """Распознавание последовательности кадров с кэшем результатов по блокам"""
+
+    def __init__(self, engine, max_entries=256):
+        """
+        Инициализация
+
+        Args:
+            engine: экземпляр OCREngine (движок, профиль и поиск текстовых блоков)
+            max_entries: максимальное количество блоков в кэше; вытесняются
+                давно не встречавшиеся блоки
+        """
+        self.engine = engine
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+
+        # Результаты блоков предыдущего кадра {(x, y, width, height): OCRResult}
+        # и язык с размером кадра, для которых они получены
+        self.previous = {}
+        self.previous_key = None
+
+        # Статистика последнего кадра
+        self.last_hits = 0
+        self.last_misses = 0
+
+    def clear(self):
+        """Очистка кэша (например, при смене языка или области)"""
+        self.cache.clear()
+        self.previous = {}
+        self.previous_key = None
+
+    @staticmethod
+    def _block_key(block, language):
+        """Ключ кэша: язык, размер и хэш пикселей блока"""
+        digest = hashlib.blake2b(block.tobytes(), digest_size=16).hexdigest()
+        return language, block.shape, digest
+
+    @staticmethod
+    def _intersects(region, blocks):
+        """Пересекает ли блок (x, y, width, height) хотя бы один из блоков списка"""
+        x, y, w, h = region
+        return any(
+            x < bx + bw and bx < x + w and y < by + bh and by < y + h
+            for bx, by, bw, bh in blocks
+        )
+
+    def find_blocks(self, image):
+        """
+        Текстовые блоки кадра в порядке чтения
+
+        Args:
+            image: кадр (массив NumPy)
+
+        Returns:
+            list: список блоков (x, y, width, height); весь кадр, если блоки
+                не найдены, их слишком много или движок сам находит текст
+        """
+        height, width = image.shape[:2]
+        whole = [(0, 0, width, height)]
+        # Движки с собственным поиском текста (RapidOCR) распознают кадр
+        # целиком: на мелких фрагментах их детектор работает медленнее
+        if not self.engine.use_text_regions:
+            return whole
+        detector = self.engine.region_detector
+        try:
+            regions = detector.detect(to_grayscale(image))
+        except Exception as e:
+            print(f"Ошибка при поиске текстовых блоков: {e}")
+            return whole
+        if not regions or len(regions) > detector.max_regions:
+            return whole
+        return regions
+
+    def _recognize_block(self, block, language):
+        """
+        Распознавание одного блока исходного кадра
+
+        Returns:
+            OCRResult: результат в координатах блока
+        """
+        engine = self.engine
+        processed = engine.pipeline.run(block)
+        # Масштаб вычисляется здесь, а не берется из pipeline.last_scale,
+        # так как блоки обрабатываются параллельно
+        scale = processed.shape[1] / float(block.shape[1])
+        return engine.backend.recognize(
+            processed, language, (0, 0), scale,
+            config=engine.tesseract_config(language, psm=6)
+        )
+
+    def _recognize_blocks(self, blocks, language):
+        """
+        Параллельное распознавание блоков
+
+        Args:
+            blocks: список изображений блоков
+
+        Returns:
+            list: OCRResult в координатах блоков, в порядке списка
+        """
+        if not blocks:
+            return []
+        workers = min(self.engine.max_workers, len(blocks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda block: self._recognize_block(block, language), blocks))
+
+    def recognize(self, image, language="en", change=None):
+        """
+        Распознавание кадра с повторным использованием результатов блоков
+
+        Args:
+            image: кадр (массив NumPy BGRA, BGR или в оттенках серого)
+            language: код языка
+            change: FrameChange относительно предыдущего распознанного кадра;
+                при частичном изменении распознаются только текстовые блоки,
+                пересекающие change.blocks
+
+        Returns:
+            OCRResult: результат в координатах кадра, блоки в порядке чтения
+        """
+        if not self.engine.is_available:
+            return OCRResult.failure(self.engine.TESSERACT_UNAVAILABLE, language)
+        error = self.engine.language_error(language)
+        if error is not None:
+            return error
+
+        try:
+            regions = self.find_blocks(image)
+            frame_key = (language, image.shape)
+            if (change is not None and change.kind == FrameChange.PARTIAL
+                    and self.previous_key == frame_key):
+                results = self._recognize_changed(image, regions, language, change.blocks)
+            else:
+                results = self._recognize_cached(image, regions, language)
+
+            # Успешные результаты блоков переходят на следующий кадр
+            self.previous = {region: block_result for region, block_result in zip(regions, results) if block_result.ok}
+            self.previous_key = frame_key
+
+            placed = [block_result.transformed((x, y)) for (x, y, _, _), block_result in zip(regions, results)]
+            result = OCRResult.merge(placed, language)
+            result.profile = self.engine.profile.name
+            return result
+        except Exception as e:
+            # Следующее изменение отсчитывается от этого кадра, поэтому
+            # результаты более раннего кадра больше не годятся
+            self.previous = {}
+            self.previous_key = None
+            return OCRResult.failure(f"Ошибка OCR: {str(e)}", language)
+
+    def _recognize_changed(self, image, regions, language, changed_blocks):
+        """
+        Распознавание частично изменившегося кадра
+
+        Блок берется с предыдущего кадра, если он там был на том же месте и
+        не пересекает изменившиеся блоки сетки; пиксели таких блоков не читаются.
+
+        Returns:
+            list: OCRResult блоков в координатах блоков, в порядке regions
+        """
+        results = [None] * len(regions)
+        missing = []
+        for index, region in enumerate(regions):
+            if region in self.previous and not self._intersects(region, changed_blocks):
+                results[index] = self.previous[region]
+            else:
+                missing.append(index)
+
+        blocks = [image[y:y + h, x:x + w] for x, y, w, h in (regions[index] for index in missing)]
+        for index, block_result in zip(missing, self._recognize_blocks(blocks, language)):
+            results[index] = block_result
+
+        self.last_misses = len(missing)
+        self.last_hits = len(regions) - len(missing)
+        return results
+
+    def _recognize_cached(self, image, regions, language):
+        """
+        Распознавание кадра с поиском блоков в кэше по хэшу пикселей
+
+        Returns:
+            list: OCRResult блоков в координатах блоков, в порядке regions
+        """
+        keys = []
+        missing = {}
+        for x, y, w, h in regions:
+            block = image[y:y + h, x:x + w]
+            key = self._block_key(block, language)
+            keys.append(key)
+            if key not in self.cache and key not in missing:
+                missing[key] = block
+
+        # Новые блоки распознаются параллельно; ошибки не кэшируются
+        fresh = dict(zip(missing, self._recognize_blocks(list(missing.values()), language)))
+        for key, block_result in fresh.items():
+            if block_result.ok:
+                self.cache[key] = block_result
+
+        self.last_misses = len(missing)
+        self.last_hits = len(keys) - len(missing)
+
+        results = []
+        for key in keys:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                results.append(self.cache[key])
+            else:
+                results.append(fresh[key])
+
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return results
@@ -0,0 +1,262 @@
+"""
+Модуль распределения обработчиков OCR между заданиями разных классов
+
+Распознавание - самая затратная часть обработки, поэтому все пути (захват
+области и окна, режим реального времени, обработка файлов) перед
+распознаванием получают у общего планировщика слот обработчика:
+
+    INTERACTIVE - захват по горячей клавише или кнопке, ждет пользователь
+    REALTIME    - кадры режима реального времени
+    BATCH       - пакетная обработка файлов
+
+Свободный слот получает первое ожидающее интерактивное задание, затем
+задание реального времени, затем пакетное. Часть слотов зарезервирована для
+интерактивных заданий: фоновые классы никогда не занимают их, поэтому
+захват по горячей клавише не ждет в очереди за сотнями изображений пакета.
+Слоты пакетных заданий делятся поровну между одновременно выполняемыми
+пакетами (группами): следующий слот получает группа, у которой сейчас
+меньше всего выполняющихся заданий.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from translator.utils.cancellation import CancelledError
+
+# Классы приоритета (меньше - важнее)
+INTERACTIVE = 0
+REALTIME = 1
+BATCH = 2
+
+PRIORITY_NAMES = {
+    INTERACTIVE: "interactive",
+    REALTIME: "realtime",
+    BATCH: "batch"
+}
+
+class _Ticket:
+    """Запрос слота"""
+
+    __slots__ = ("priority", "group", "granted", "created")
+
+    def __init__(self, priority, group):
+        self.priority = priority
+        self.group = group
+        self.granted = False
+        self.created = time.monotonic()
+
+class JobScheduler:
+    """Слоты обработчиков с классами приоритета, резервом и равными долями пакетов"""
+
+    def __init__(self, workers=None, reserved=1):
+        """
+        Инициализация планировщика
+
+        Args:
+            workers: количество слотов (по умолчанию - количество ядер);
+                не меньше reserved + 1, чтобы фоновым заданиям оставался слот
+            reserved: количество слотов, доступных только интерактивным заданиям
+        """
+        self.reserved = max(0, reserved)
+        self.workers = max(workers or os.cpu_count() or 1, self.reserved + 1)
+
+        self._condition = threading.Condition()
+        self._running = {priority: 0 for priority in PRIORITY_NAMES}
+        self._group_running = {}
+        # Очереди интерактивных заданий и заданий реального времени, а также
+        # очереди пакетов по группам в порядке последнего обслуживания
+        self._waiting = {INTERACTIVE: deque(), REALTIME: deque()}
+        self._batches = OrderedDict()
+
+        # Счетчики для отображения состояния
+        self.granted = {priority: 0 for priority in PRIORITY_NAMES}
+        self.wait_time = {priority: 0.0 for priority in PRIORITY_NAMES}
+
+    @property
+    def background_workers(self):
+        """Количество слотов, доступных заданиям реального времени и пакетам"""
+        return self.workers - self.reserved
+
+    def _running_total(self):
+        return sum(self._running.values())
+
+    def _next_batch(self):
+        """
+        Группа пакета, получающая следующий слот
+
+        Returns:
+            очередь запросов группы или None, если пакетных запросов нет
+        """
+        best = None
+        for group, tickets in self._batches.items():
+            # Группы перебираются от давно обслуженных к недавно
+            # обслуженным, поэтому при равенстве побеждает первая
+            if best is None or self._group_running.get(group, 0) < self._group_running.get(best, 0):
+                best = group
+        if best is None:
+            return None
+        self._batches.move_to_end(best)
+        return self._batches[best]
+
+    def _grant(self, ticket):
+        """Выдача слота запросу"""
+        ticket.granted = True
+        self._running[ticket.priority] += 1
+        if ticket.group is not None:
+            self._group_running[ticket.group] = self._group_running.get(ticket.group, 0) + 1
+        self.granted[ticket.priority] += 1
+        self.wait_time[ticket.priority] += time.monotonic() - ticket.created
+
+    def _dispatch(self):
+        """Выдача свободных слотов ожидающим запросам в порядке приоритета"""
+        granted = False
+        while self._running_total() < self.workers:
+            if self._waiting[INTERACTIVE]:
+                self._grant(self._waiting[INTERACTIVE].popleft())
+                granted = True
+                continue
+
+            # Зарезервированные слоты фоновым классам недоступны
+            if self._running[REALTIME] + self._running[BATCH] >= self.background_workers:
+                break
+
+            if self._waiting[REALTIME]:
+                self._grant(self._waiting[REALTIME].popleft())
+                granted = True
+                continue
+
+            tickets = self._next_batch()
+            if tickets is None:
+                break
+            ticket = tickets.popleft()
+            if not tickets:
+                del self._batches[ticket.group]
+            self._grant(ticket)
+            granted = True
+
+        if granted:
+            self._condition.notify_all()
+
+    def _enqueue(self, ticket):
+        if ticket.priority == BATCH:
+            self._batches.setdefault(ticket.group, deque()).append(ticket)
+        else:
+            self._waiting[ticket.priority].append(ticket)
+
+    def _dequeue(self, ticket):
+        """Удаление невыданного запроса (отмена или истечение времени ожидания)"""
+        if ticket.priority == BATCH:
+            tickets = self._batches.get(ticket.group)
+            if tickets is not None and ticket in tickets:
+                tickets.remove(ticket)
+                if not tickets:
+                    del self._batches[ticket.group]
+        elif ticket in self._waiting[ticket.priority]:
+            self._waiting[ticket.priority].remove(ticket)
+
+    def acquire(self, priority=INTERACTIVE, group=None, cancel_token=None, timeout=None):
+        """
+        Получение слота обработчика
+
+        Args:
+            priority: класс приоритета (INTERACTIVE, REALTIME, BATCH)
+            group: идентификатор пакета для равного деления слотов между
+                пакетами (для BATCH)
+            cancel_token: CancelToken; отмена прекращает ожидание
+            timeout: максимальное время ожидания в секундах
+
+        Returns:
+            слот для release или None при отмене и истечении timeout
+        """
+        if priority not in PRIORITY_NAMES:
+            raise ValueError(f"Неизвестный класс приоритета: {priority}")
+        ticket = _Ticket(priority, group if priority == BATCH else None)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        unregister = None
+        if cancel_token is not None:
+            unregister = cancel_token.on_cancel(self._wake)
+        try:
+            with self._condition:
+                self._enqueue(ticket)
+                self._dispatch()
+                while not ticket.granted:
+                    remaining = deadline - time.monotonic() if deadline is not None else None
+                    cancelled = cancel_token is not None and cancel_token.cancelled
+                    if cancelled or (remaining is not None and remaining <= 0):
+                        self._dequeue(ticket)
+                        return None
+                    self._condition.wait(remaining)
+                return ticket
+        finally:
+            if unregister is not None:
+                unregister()
+
+    def _wake(self):
+        """Пробуждение ожидающих (при отмене одного из них)"""
+        with self._condition:
+            self._condition.notify_all()
+
+    def release(self, ticket):
+        """Освобождение слота, полученного acquire"""
+        with self._condition:
+            if not ticket.granted:
+                return
+            ticket.granted = False
+            self._running[ticket.priority] -= 1
+            if ticket.group is not None:
+                count = self._group_running.get(ticket.group, 0) - 1
+                if count > 0:
+                    self._group_running[ticket.group] = count
+                else:
+                    self._group_running.pop(ticket.group, None)
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, priority=INTERACTIVE, group=None, cancel_token=None):
+        """
+        Выполнение блока в слоте обработчика
+
+        Raises:
+            CancelledError: задание отменено во время ожидания слота
+        """
+        ticket = self.acquire(priority, group, cancel_token)
+        if ticket is None:
+            raise CancelledError()
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    def stats(self):
+        """
+        Состояние классов приоритета
+
+        Returns:
+            dict: {имя класса: {"running", "waiting", "granted", "average_wait"}}
+        """
+        with self._condition:
+            waiting = {
+                INTERACTIVE: len(self._waiting[INTERACTIVE]),
+                REALTIME: len(self._waiting[REALTIME]),
+                BATCH: sum(len(tickets) for tickets in self._batches.values())
+            }
+            return {
+                name: {
+                    "running": self._running[priority],
+                    "waiting": waiting[priority],
+                    "granted": self.granted[priority],
+                    "average_wait": self.wait_time[priority] / self.granted[priority] if self.granted[priority] else 0.0
+                }
+                for priority, name in PRIORITY_NAMES.items()
+            }
+
+    def format_stats(self):
+        """Строка состояния: занятые и ожидающие слоты по классам"""
+        return ", ".join(
+            f"{name}: {item['running']} выполняется, {item['waiting']} ожидает"
+            for name, item in self.stats().items()
+        )
@@ -4,107 +4,425 @@
 
 import os
 import sys
-import pytesseract
 import tempfile
-from PIL import Image, ImageEnhance, ImageFilter
+from concurrent.futures import ThreadPoolExecutor
+
+from translator.utils.cancellation import CancelledError
+from translator.utils.ocr_backends import DEFAULT_BACKEND, TesseractBackend, create_backend
+from translator.utils.ocr_pool import OCRWorkerPool
+from translator.utils.ocr_profiles import CAPTURE_MODE_PROFILES, DEFAULT_OCR_PROFILE, OCR_PROFILES
+from translator.utils.ocr_result import OCRResult
+from translator.utils.preprocessing import load_image, rescale_to_x_height
+from translator.utils.text_regions import TextRegionDetector
 
 class OCREngine:
     """Класс для распознавания текста с помощью OCR"""
     
-    def __init__(self, tesseract_path=""):
+    # Минимальная площадь изображения (в пикселях), начиная с которой
+    # выгодно искать текстовые блоки вместо распознавания целиком
+    REGION_MIN_IMAGE_AREA = 400 * 400
+    
+    # Максимальная доля площади, занятая блоками; при большем покрытии
+    # распознавание по частям не дает выигрыша
+    REGION_MAX_COVERAGE = 0.6
+    
+    # Слова с меньшей уверенностью (0-100) считаются шумом и не попадают
+    # в текст, передаваемый на перевод
+    DEFAULT_MIN_CONFIDENCE = 30
+    
+    # Сообщение об ошибке при недоступном Tesseract
+    TESSERACT_UNAVAILABLE = "Ошибка: Tesseract OCR не доступен. Проверьте, установлен ли Tesseract и указан ли корректный путь."
+    
+    # Сообщение об ошибке для языка, которого нет в моделях движка
+    UNSUPPORTED_LANGUAGE = "Ошибка: язык {language} не поддерживается OCR движком {engine}. Выберите другой движок в настройках."
+    
+    def __init__(self, tesseract_path="", use_text_regions=True, max_workers=None,
+                 preprocessing=None, engine=DEFAULT_BACKEND, profile=DEFAULT_OCR_PROFILE,
+                 tessdata_dirs=None):
         """
         Инициализация OCR движка
         
         Args:
             tesseract_path: путь к исполняемому файлу Tesseract OCR
+            use_text_regions: распознавать найденные текстовые блоки по отдельности
+            max_workers: количество параллельных процессов Tesseract
+                (по умолчанию - количество ядер процессора)
+            preprocessing: имя профиля предварительной обработки вместо
+                указанного в профиле OCR (см. translator.utils.preprocessing.PROFILES)
+            engine: имя OCR движка (см. translator.utils.ocr_backends.BACKENDS)
+            profile: имя профиля OCR (см. translator.utils.ocr_profiles.OCR_PROFILES)
+            tessdata_dirs: словарь {вариант моделей: каталог}, например
+                {"fast": путь к tessdata_fast, "best": путь к tessdata_best}
         """
-        # Установка пути к Tesseract, если он указан
-        if tesseract_path and os.path.exists(tesseract_path):
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+        # Параметры для создания таких же движков в процессах пакетной обработки
+        self.options = {
+            "tesseract_path": tesseract_path,
+            "use_text_regions": use_text_regions,
+            "preprocessing": preprocessing,
+            "engine": engine,
+            "profile": profile,
+            "tessdata_dirs": tessdata_dirs
+        }
+        self.pool = None
+        
+        # Создание движка; если выбранный движок недоступен, используется Tesseract
+        self.backend = create_backend(engine, tesseract_path)
+        if not self.backend.available and not isinstance(self.backend, TesseractBackend):
+            print(f"OCR движок {self.backend.name} недоступен, используется Tesseract OCR")
+            self.backend = TesseractBackend(tesseract_path)
         
-        # Проверка работоспособности Tesseract
-        self.is_tesseract_available = self._check_tesseract()
+        # Проверка работоспособности движка
+        self.is_available = self.backend.available
+        # Прежнее имя признака сохранено для совместимости
+        self.is_tesseract_available = self.is_available
         
         # Поддерживаемые языки
-        self.supported_languages = {
-            "en": "eng",  # Английский
-            "ru": "rus",  # Русский
-            "ja": "jpn"   # Японский
-        }
+        self.supported_languages = self.backend.languages
+        
+        # Поиск текстовых блоков и параллельное распознавание (не нужен
+        # движкам, которые сами находят текст на изображении)
+        self.use_text_regions = use_text_regions and not self.backend.detects_text_regions
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.region_detector = TextRegionDetector()
+        
+        # Профиль OCR и конвейер предварительной обработки с его масштабом
+        if profile not in OCR_PROFILES:
+            print(f"Неизвестный профиль OCR: {profile}, используется {DEFAULT_OCR_PROFILE}")
+            profile = DEFAULT_OCR_PROFILE
+        self.profile = OCR_PROFILES[profile]
+        self.tessdata_dirs = tessdata_dirs or {}
+        self.pipeline = self.profile.create_pipeline(preprocessing)
+        
+        # Каждый процесс Tesseract получает одно ядро, иначе параллельные
+        # процессы конкурируют за потоки OpenMP
+        if self.use_text_regions and self.max_workers > 1:
+            os.environ.setdefault("OMP_THREAD_LIMIT", "1")
     
-    def _check_tesseract(self):
+    def language_error(self, language):
         """
-        Проверка доступности Tesseract OCR
+        Проверка поддержки языка выбранным движком
+        
+        Модель другого языка выдает бессмысленный текст без ошибок, поэтому
+        такой запрос отклоняется до распознавания.
+        
+        Args:
+            language: код языка (en, ru, ja)
         
         Returns:
-            bool: True, если Tesseract доступен
+            OCRResult: результат с ошибкой или None, если язык поддерживается
         """
-        try:
-            # Проверка версии Tesseract
-            pytesseract.get_tesseract_version()
-            return True
-        except Exception as e:
-            print(f"Ошибка при проверке Tesseract OCR: {e}")
-            return False
+        if self.backend.supports_language(language):
+            return None
+        message = self.UNSUPPORTED_LANGUAGE.format(language=language, engine=self.backend.name)
+        return OCRResult.failure(message, language)
+    
+    @classmethod
+    def from_settings(cls, settings, mode="area", **options):
+        """
+        Создание движка по настройкам приложения для режима захвата
+
+        Args:
+            settings: объект QSettings
+            mode: режим захвата (area, window, file, realtime); профиль OCR
+                берется из ключа ocr/profile/<режим>
+            options: дополнительные параметры конструктора
+
+        Returns:
+            OCREngine: движок распознавания
+        """
+        return cls(
+            settings.value("ocr/tesseract_path", ""),
+            engine=settings.value("ocr/engine", DEFAULT_BACKEND),
+            profile=settings.value(f"ocr/profile/{mode}", CAPTURE_MODE_PROFILES.get(mode, DEFAULT_OCR_PROFILE)),
+            tessdata_dirs={
+                "fast": settings.value("ocr/tessdata_fast", ""),
+                "best": settings.value("ocr/tessdata_best", "")
+            },
+            **options
+        )
+    
+    def tesseract_config(self, language="en", psm=None):
+        """
+        Параметры Tesseract для профиля и языка
+        
+        Args:
+            language: код языка (en, ru, ja)
+            psm: режим сегментации вместо режима профиля
+        
+        Returns:
+            str: параметры командной строки Tesseract
+        """
+        language_code = self.backend.languages.get(language, "")
+        tessdata_dir = self.profile.find_tessdata_dir(self.tessdata_dirs, language_code)
+        return self.profile.tesseract_config(tessdata_dir, psm)
     
-    def preprocess_image(self, image_path):
+    def preprocess_image(self, image_path, area=None):
         """
         Предварительная обработка изображения для улучшения OCR
         
         Args:
-            image_path: путь к исходному изображению
+            image_path: путь к исходному изображению или изображение (массив NumPy)
+            area: кортеж (x1, y1, x2, y2) для обработки только части изображения
         
         Returns:
-            PIL.Image: обработанное изображение
+            numpy.ndarray: обработанное изображение
         """
         try:
-            # Открытие изображения
-            image = Image.open(image_path)
-            
-            # Базовое улучшение четкости
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(1.5)
+            # Загрузка изображения
+            image = load_image(image_path) if isinstance(image_path, str) else image_path
+            if image is None:
+                return None
             
-            # Увеличение резкости
-            image = image.filter(ImageFilter.SHARPEN)
+            # Вырезание области без копирования данных
+            if area is not None:
+                x1, y1, x2, y2 = area
+                image = image[y1:y2, x1:x2]
+                if image.size == 0:
+                    return None
             
-            return image
+            return self.pipeline.run(image)
         except Exception as e:
             print(f"Ошибка при обработке изображения: {e}")
             return None
     
-    def recognize_text(self, image_path, language="en"):
+    @property
+    def last_timings(self):
+        """Время этапов предварительной обработки при последнем распознавании"""
+        return self.pipeline.last_timings
+    
+    def recognize(self, image_path, language="en", area=None):
+        """
+        Структурированное распознавание текста: блоки, строки и слова с координатами
+        
+        Args:
+            image_path: путь к изображению или изображение (массив NumPy)
+            language: язык распознаваемого текста (en, ru, ja)
+            area: кортеж (x1, y1, x2, y2) для распознавания только части изображения
+        
+        Returns:
+            OCRResult: результат с рамками в координатах исходного изображения
+                и именем профиля OCR; при ошибке заполнено поле error
+        """
+        result = self._recognize(image_path, language, area)
+        result.profile = self.profile.name
+        return result
+    
+    def _recognize(self, image_path, language="en", area=None):
+        """Распознавание без отметки профиля (см. recognize)"""
+        if not self.is_available:
+            return OCRResult.failure(self.TESSERACT_UNAVAILABLE, language)
+        error = self.language_error(language)
+        if error is not None:
+            return error
+        
+        try:
+            prepared = self.prepare(image_path, area)
+            if prepared is None:
+                return OCRResult.failure("Ошибка: не удалось обработать изображение.", language)
+            return self._recognize_prepared(prepared, language)
+        except Exception as e:
+            return OCRResult.failure(f"Ошибка OCR: {str(e)}", language)
+    
+    def prepare(self, image_path, area=None):
+        """
+        Предварительная обработка изображения для последующего распознавания
+        
+        Отделена от распознавания, чтобы в конвейере захвата обработка
+        следующего снимка выполнялась одновременно с распознаванием текущего.
+        
+        Args:
+            image_path: путь к изображению или изображение (массив NumPy)
+            area: кортеж (x1, y1, x2, y2) для обработки только части изображения
+        
+        Returns:
+            tuple: (обработанное изображение, масштаб, смещение в исходном
+                изображении) или None в случае ошибки
+        """
+        image = self.preprocess_image(image_path, area)
+        if image is None:
+            return None
+        # Координаты результата пересчитываются в систему исходного снимка
+        offset = (area[0], area[1]) if area is not None else (0, 0)
+        return image, self.pipeline.last_scale, offset
+    
+    def recognize_prepared(self, prepared, language="en", cancel_token=None):
+        """
+        Распознавание изображения, обработанного методом prepare
+        
+        Args:
+            prepared: результат prepare
+            language: язык распознаваемого текста (en, ru, ja)
+            cancel_token: CancelToken; после отмены текстовые блоки, еще не
+                переданные движку, не распознаются
+        
+        Returns:
+            OCRResult: результат с рамками в координатах исходного изображения
+        
+        Raises:
+            CancelledError: задание отменено
+        """
+        if not self.is_available:
+            return OCRResult.failure(self.TESSERACT_UNAVAILABLE, language)
+        result = self.language_error(language)
+        if result is not None:
+            result.profile = self.profile.name
+            return result
+        try:
+            result = self._recognize_prepared(prepared, language, cancel_token)
+        except CancelledError:
+            raise
+        except Exception as e:
+            result = OCRResult.failure(f"Ошибка OCR: {str(e)}", language)
+        result.profile = self.profile.name
+        return result
+    
+    def _recognize_prepared(self, prepared, language, cancel_token=None):
+        """Распознавание текста по блокам или целиком"""
+        image, scale, offset = prepared
+        regions = self.find_text_regions(image)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        if regions:
+            return self.recognize_regions(image, regions, language, scale, offset, cancel_token)
+        
+        return self.backend.recognize(image, language, offset, scale, self.tesseract_config(language))
+    
+    def recognize_text(self, image_path, language="en", min_conf=None):
         """
         Распознавание текста из изображения
         
         Args:
             image_path: путь к изображению
             language: язык распознаваемого текста (en, ru, ja)
+            min_conf: минимальная уверенность слов (по умолчанию DEFAULT_MIN_CONFIDENCE)
         
         Returns:
             str: распознанный текст
         """
-        if not self.is_tesseract_available:
-            return "Ошибка: Tesseract OCR не доступен. Проверьте, установлен ли Tesseract и указан ли корректный путь."
+        return self.result_to_text(self.recognize(image_path, language), min_conf)
+    
+    def recognize_many(self, images, language="en", ordered=True, processes=None, max_in_flight=None,
+                       cancel_token=None, scheduler=None, group=None):
+        """
+        Пакетное распознавание изображений в пуле процессов
+        
+        Args:
+            images: итерируемый набор путей к изображениям или массивов NumPy
+            language: язык распознаваемого текста (en, ru, ja)
+            ordered: True - результаты в порядке изображений, False - по мере готовности
+            processes: количество процессов пула (при первом вызове)
+            max_in_flight: максимальное количество изображений в пуле одновременно
+            cancel_token: CancelToken; после отмены изображения, еще не
+                начатые процессами пула, снимаются с обработки
+            scheduler: JobScheduler, выдающий пакетные слоты
+            group: идентификатор пакета в планировщике
+        
+        Yields:
+            tuple: (индекс изображения, OCRResult)
+        """
+        if self.pool is None:
+            self.pool = OCRWorkerPool(processes, max_in_flight, **self.options)
+        return self.pool.recognize_many(images, language, ordered, cancel_token, scheduler, group)
+    
+    def shutdown(self):
+        """Остановка пула процессов пакетной обработки"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+    
+    def result_to_text(self, result, min_conf=None):
+        """
+        Преобразование структурированного результата в строку
+        
+        Args:
+            result: OCRResult
+            min_conf: минимальная уверенность слов
+        
+        Returns:
+            str: текст, сообщение об ошибке или "Текст не обнаружен"
+        """
+        if not result.ok:
+            return result.error
+        
+        if min_conf is None:
+            min_conf = self.DEFAULT_MIN_CONFIDENCE
+        
+        text = result.text(min_conf).strip()
+        return text if text else "Текст не обнаружен"
+    
+    def find_text_regions(self, image):
+        """
+        Поиск текстовых блоков, которые выгодно распознавать по отдельности
+        
+        Args:
+            image: обработанное изображение (массив NumPy)
+        
+        Returns:
+            list: список блоков (x, y, width, height) в порядке чтения
+                или пустой список, если изображение лучше распознать целиком
+        """
+        if not self.use_text_regions:
+            return []
+        
+        height, width = image.shape[:2]
+        if width * height < self.REGION_MIN_IMAGE_AREA:
+            return []
         
         try:
-            # Предварительная обработка изображения
-            image = self.preprocess_image(image_path)
-            if image is None:
-                return "Ошибка: не удалось обработать изображение."
-            
-            # Получение кода языка для Tesseract
-            tesseract_lang = self.supported_languages.get(language, "eng")
-            
-            # Распознавание текста с использованием Tesseract
-            text = pytesseract.image_to_string(image, lang=tesseract_lang)
-            
-            # Очистка текста от лишних символов
-            text = text.strip()
-            
-            return text if text else "Текст не обнаружен"
+            regions = self.region_detector.detect(image)
         except Exception as e:
-            return f"Ошибка OCR: {str(e)}"
+            print(f"Ошибка при поиске текстовых блоков: {e}")
+            return []
+        
+        if not regions or len(regions) > self.region_detector.max_regions:
+            return []
+        
+        covered = sum(w * h for _, _, w, h in regions)
+        if covered > self.REGION_MAX_COVERAGE * width * height:
+            return []
+        
+        return regions
+    
+    def recognize_regions(self, image, regions, language="en", scale=1.0, offset=(0, 0), cancel_token=None):
+        """
+        Параллельное распознавание текстовых блоков
+        
+        Args:
+            image: обработанное изображение (массив NumPy)
+            regions: список блоков (x, y, width, height) в порядке чтения
+            language: язык распознаваемого текста
+            scale: масштаб обработанного изображения относительно исходного
+            offset: смещение обработанного изображения в исходном
+            cancel_token: CancelToken для прекращения распознавания блоков
+        
+        Returns:
+            OCRResult: результаты блоков, объединенные в порядке чтения
+        
+        Raises:
+            CancelledError: задание отменено
+        """
+        def recognize_block(region):
+            # Отмена проверяется перед каждым блоком: начатый блок
+            # распознается до конца, остальные пропускаются
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            x, y, w, h = region
+            block = image[y:y + h, x:x + w]
+            # Мелкий текст интерфейса и крупные заголовки на одном снимке
+            # приводятся к оптимальной для Tesseract высоте по отдельности
+            block = rescale_to_x_height(block, self.profile.x_height)
+            block_scale = scale * block.shape[1] / float(w)
+            block_offset = (offset[0] + x / scale, offset[1] + y / scale)
+            # PSM 6: блок считается единым однородным фрагментом текста
+            return self.backend.recognize(
+                block, language, block_offset, block_scale,
+                config=self.tesseract_config(language, psm=6)
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(regions))) as executor:
+            results = list(executor.map(recognize_block, regions))
+        
+        return OCRResult.merge(results, language)
     
     def recognize_text_from_area(self, image_path, x1, y1, x2, y2, language="en"):
         """
@@ -119,35 +437,7 @@ class OCREngine:
         Returns:
             str: распознанный текст
         """
-        if not self.is_tesseract_available:
-            return "Ошибка: Tesseract OCR не доступен. Проверьте, установлен ли Tesseract и указан ли корректный путь."
-        
-        try:
-            # Открытие изображения
-            image = Image.open(image_path)
-            
-            # Вырезание указанной области
-            area = image.crop((x1, y1, x2, y2))
-            
-            # Увеличение контрастности области
-            enhancer = ImageEnhance.Contrast(area)
-            area = enhancer.enhance(1.5)
-            
-            # Увеличение резкости
-            area = area.filter(ImageFilter.SHARPEN)
-            
-            # Получение кода языка для Tesseract
-            tesseract_lang = self.supported_languages.get(language, "eng")
-            
-            # Распознавание текста
-            text = pytesseract.image_to_string(area, lang=tesseract_lang)
-            
-            # Очистка текста
-            text = text.strip()
-            
-            return text if text else "Текст не обнаружен"
-        except Exception as e:
-            return f"Ошибка OCR при анализе области: {str(e)}"
+        return self.result_to_text(self.recognize(image_path, language, (x1, y1, x2, y2)))
     
     def detect_language(self, image_path):
         """
@@ -159,8 +449,8 @@ class OCREngine:
         Returns:
             str: код языка (en, ru, ja или none, если не удалось определить)
         """
-        if not self.is_tesseract_available:
-            print("Ошибка: Tesseract OCR не доступен")
+        if not self.is_available:
+            print("Ошибка: OCR движок не доступен")
             return "none"
         
         try:
@@ -171,10 +461,10 @@ class OCREngine:
             
             # Пробуем распознать текст на разных языках и оцениваем результаты
             results = {}
-            for lang_code, tesseract_code in self.supported_languages.items():
+            for lang_code in self.supported_languages:
                 try:
                     # Распознавание с указанием языка
-                    text = pytesseract.image_to_string(image, lang=tesseract_code)
+                    text = self.backend.recognize(image, lang_code, config=self.tesseract_config(lang_code)).text()
                     
                     # Подсчет количества символов
                     text_len = len(text.strip())
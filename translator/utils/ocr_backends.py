@@ -0,0 +1,214 @@
+"""
+Модуль с реализациями OCR движков (бэкендов)
+
+Каждый бэкенд сообщает о своих возможностях: поддерживаемые языки, наличие
+координат слов и собственный поиск текста на изображении.
+"""
+
+import os
+import numpy as np
+
+from translator.utils.ocr_result import WORD_DTYPE, OCRResult
+
+class OCRBackend:
+    """Базовый класс OCR движка"""
+
+    # Имя движка, отображаемое в настройках
+    name = ""
+
+    # Соответствие кодов языков приложения (en, ru, ja) кодам движка
+    languages = {}
+
+    # Возвращает ли движок координаты слов или строк
+    supports_boxes = False
+
+    # Находит ли движок текстовые области самостоятельно (тогда отдельный
+    # поиск текстовых блоков не нужен)
+    detects_text_regions = False
+
+    def __init__(self):
+        """Инициализация движка"""
+        self.available = self._check_available()
+
+    def _check_available(self):
+        """
+        Проверка доступности движка
+
+        Returns:
+            bool: True, если движок можно использовать
+        """
+        return False
+
+    def supports_language(self, language):
+        """
+        Проверка поддержки языка
+
+        Args:
+            language: код языка (en, ru, ja)
+
+        Returns:
+            bool: True, если язык поддерживается
+        """
+        return language in self.languages
+
+    def recognize(self, image, language="en", offset=(0, 0), scale=1.0, config=""):
+        """
+        Распознавание текста на изображении
+
+        Args:
+            image: обработанное изображение (массив NumPy)
+            language: код языка (en, ru, ja)
+            offset: смещение изображения в исходном снимке
+            scale: масштаб изображения относительно исходного снимка
+            config: дополнительные параметры движка
+
+        Returns:
+            OCRResult: результат в координатах исходного снимка
+        """
+        raise NotImplementedError
+
+class TesseractBackend(OCRBackend):
+    """OCR движок на основе Tesseract"""
+
+    name = "Tesseract OCR"
+    languages = {
+        "en": "eng",  # Английский
+        "ru": "rus",  # Русский
+        "ja": "jpn"   # Японский
+    }
+    supports_boxes = True
+
+    def __init__(self, tesseract_path=""):
+        """
+        Инициализация движка Tesseract
+
+        Args:
+            tesseract_path: путь к исполняемому файлу Tesseract OCR
+        """
+        # Установка пути к Tesseract, если он указан
+        if tesseract_path and os.path.exists(tesseract_path):
+            import pytesseract
+            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+        super().__init__()
+
+    def _check_available(self):
+        """
+        Проверка доступности Tesseract OCR
+
+        Returns:
+            bool: True, если Tesseract доступен
+        """
+        try:
+            # Проверка версии Tesseract
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception as e:
+            print(f"Ошибка при проверке Tesseract OCR: {e}")
+            return False
+
+    def recognize(self, image, language="en", offset=(0, 0), scale=1.0, config=""):
+        """Распознавание текста с помощью pytesseract.image_to_data"""
+        import pytesseract
+        data = pytesseract.image_to_data(
+            image,
+            lang=self.languages.get(language, "eng"),
+            config=config,
+            output_type=pytesseract.Output.DICT
+        )
+        return OCRResult.from_tesseract_data(data, language, offset, scale)
+
+class RapidOCRBackend(OCRBackend):
+    """OCR движок RapidOCR (модели PaddleOCR в формате ONNX, только CPU)"""
+
+    name = "RapidOCR (ONNX)"
+    # Стандартная модель распознавания обучена на латинице и китайских
+    # иероглифах: русский и японский текст распознается только Tesseract
+    languages = {
+        "en": "en"
+    }
+    supports_boxes = True
+    detects_text_regions = True
+
+    def __init__(self, **options):
+        """
+        Инициализация движка RapidOCR
+
+        Args:
+            options: параметры, передаваемые в конструктор RapidOCR
+                (например, пути к моделям det_model_path и rec_model_path)
+        """
+        self.options = options
+        self.engine = None
+        super().__init__()
+
+    def _check_available(self):
+        """
+        Проверка наличия пакета rapidocr_onnxruntime
+
+        Returns:
+            bool: True, если движок загружен
+        """
+        try:
+            from rapidocr_onnxruntime import RapidOCR
+            self.engine = RapidOCR(**self.options)
+            return True
+        except ImportError:
+            print("Для использования RapidOCR установите библиотеку rapidocr_onnxruntime.")
+            print("Выполните команду: pip install rapidocr_onnxruntime")
+            return False
+        except Exception as e:
+            print(f"Ошибка при инициализации RapidOCR: {e}")
+            return False
+
+    def recognize(self, image, language="en", offset=(0, 0), scale=1.0, config=""):
+        """Распознавание текста; RapidOCR возвращает строки, рамки слов оцениваются по длине"""
+        lines, _ = self.engine(image)
+        boxes = []
+        words = []
+        for line_index, (quad, text, score) in enumerate(lines or []):
+            quad = np.asarray(quad, dtype=np.float32)
+            left, top = quad.min(axis=0)
+            right, bottom = quad.max(axis=0)
+
+            # Ширина слова пропорциональна количеству символов (с пробелом)
+            line_words = text.split()
+            total = sum(len(word) + 1 for word in line_words) or 1
+            cursor = float(left)
+            for word in line_words:
+                width = (right - left) * (len(word) + 1) / total
+                boxes.append((
+                    1, 1, line_index + 1,
+                    cursor / scale + offset[0], top / scale + offset[1],
+                    width / scale, (bottom - top) / scale,
+                    float(score) * 100.0
+                ))
+                words.append(word)
+                cursor += width
+
+        return OCRResult(np.array(boxes, dtype=WORD_DTYPE), words, language)
+
+# Доступные движки по имени из настроек
+BACKENDS = {
+    TesseractBackend.name: TesseractBackend,
+    RapidOCRBackend.name: RapidOCRBackend
+}
+
+DEFAULT_BACKEND = TesseractBackend.name
+
+def create_backend(name=DEFAULT_BACKEND, tesseract_path=""):
+    """
+    Создание OCR движка по имени
+
+    Args:
+        name: имя движка из BACKENDS
+        tesseract_path: путь к исполняемому файлу Tesseract OCR
+
+    Returns:
+        OCRBackend: экземпляр движка (Tesseract, если имя неизвестно)
+    """
+    if name == RapidOCRBackend.name:
+        return RapidOCRBackend()
+    if name not in BACKENDS:
+        print(f"Неизвестный OCR движок: {name}, используется {DEFAULT_BACKEND}")
+    return TesseractBackend(tesseract_path)
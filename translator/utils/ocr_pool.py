@@ -0,0 +1,256 @@
+"""
+Модуль пакетного распознавания текста в пуле процессов
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from translator.utils.job_scheduler import BATCH
+from translator.utils.ocr_result import OCRResult
+
+# OCR движок процесса-обработчика: создается один раз при запуске процесса
+_worker_engine = None
+
+# Пониженный приоритет процессов пакетной обработки: интерактивное
+# распознавание в основном процессе получает процессор первым
+BATCH_NICENESS = 10
+
+def _lower_priority(niceness):
+    """Понижение приоритета планирования текущего процесса"""
+    try:
+        if hasattr(os, "nice"):
+            os.nice(niceness)
+        else:
+            import psutil
+            psutil.Process().nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+    except Exception as e:
+        print(f"Не удалось понизить приоритет процесса OCR: {e}")
+
+def _init_worker(engine_options, niceness=0):
+    """
+    Инициализация процесса-обработчика: создание и прогрев OCR движка
+
+    Args:
+        engine_options: параметры конструктора OCREngine
+        niceness: понижение приоритета процесса (0 - без изменения)
+    """
+    global _worker_engine
+
+    if niceness:
+        _lower_priority(niceness)
+
+    # Параллелизм обеспечивается количеством процессов, поэтому каждый
+    # процесс Tesseract использует одно ядро
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+    from translator.utils.ocr import OCREngine
+    _worker_engine = OCREngine(max_workers=1, **engine_options)
+
+def _ping():
+    """Пустая задача для запуска процессов пула заранее"""
+    return os.getpid()
+
+def _recognize_item(image, language):
+    """
+    Распознавание одного изображения в процессе-обработчике
+
+    Args:
+        image: путь к изображению или изображение (массив NumPy)
+        language: код языка
+
+    Returns:
+        OCRResult: результат распознавания
+    """
+    return _worker_engine.recognize(image, language)
+
+class OCRWorkerPool:
+    """Пул процессов с заранее созданными OCR движками"""
+
+    # Период проверки отмены при ожидании результатов, в секундах
+    CANCEL_POLL_INTERVAL = 0.1
+
+    def __init__(self, processes=None, max_in_flight=None, niceness=BATCH_NICENESS, **engine_options):
+        """
+        Инициализация пула
+
+        Args:
+            processes: количество процессов (по умолчанию - количество ядер)
+            max_in_flight: максимальное количество изображений, одновременно
+                переданных в пул (ограничивает расход памяти)
+            niceness: понижение приоритета процессов пула (0 - без изменения)
+            engine_options: параметры конструктора OCREngine
+                (tesseract_path, engine, preprocessing и т.д.)
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.processes * 2
+        self.engine_options = engine_options
+        self.executor = None
+        self.niceness = niceness
+
+    def start(self):
+        """Запуск процессов и создание в них OCR движков"""
+        if self.executor is not None:
+            return
+
+        # spawn не копирует состояние Qt и потоков родительского процесса
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.engine_options, self.niceness)
+        )
+        for future in [self.executor.submit(_ping) for _ in range(self.processes)]:
+            future.result()
+
+    def shutdown(self):
+        """Остановка процессов пула"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _restart(self):
+        """Перезапуск пула после аварийного завершения процесса"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.start()
+
+    @staticmethod
+    def _collect(future, language):
+        """
+        Получение результата задачи с изоляцией ошибок
+
+        Returns:
+            OCRResult: результат или OCRResult с описанием ошибки
+        """
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            return OCRResult.failure("Ошибка OCR: процесс распознавания аварийно завершился", language)
+        except Exception as e:
+            return OCRResult.failure(f"Ошибка OCR: {str(e)}", language)
+
+    def _wait(self, futures, cancel_token):
+        """
+        Ожидание завершения хотя бы одной задачи
+
+        При заданном cancel_token ожидание периодически прерывается для
+        проверки отмены.
+
+        Returns:
+            set: завершившиеся задачи (пустое множество после отмены)
+        """
+        timeout = self.CANCEL_POLL_INTERVAL if cancel_token is not None else None
+        while True:
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            if done or cancel_token.cancelled:
+                return done
+
+    def recognize_many(self, images, language="en", ordered=True, cancel_token=None, scheduler=None, group=None):
+        """
+        Распознавание набора изображений
+
+        Args:
+            images: итерируемый набор путей к изображениям или массивов NumPy
+            language: код языка
+            ordered: True - результаты в порядке изображений,
+                False - по мере готовности
+            cancel_token: CancelToken; после отмены перебор завершается,
+                а задачи, еще не начатые процессами, снимаются с пула;
+                начатые задачи дорабатывают в процессах, но их результаты
+                не передаются
+            scheduler: JobScheduler; каждое изображение передается в пул
+                только после получения пакетного слота, поэтому пакет не
+                занимает слоты, зарезервированные для интерактивных заданий
+            group: идентификатор пакета в планировщике (по умолчанию -
+                отдельная группа для каждого вызова)
+
+        Yields:
+            tuple: (индекс изображения, OCRResult); ошибка одного изображения
+                не прерывает обработку остальных
+        """
+        self.start()
+
+        source = iter(enumerate(images))
+        pending = deque()
+        if scheduler is not None and group is None:
+            group = object()
+        try:
+            yield from self._recognize_pending(source, pending, language, ordered, cancel_token, scheduler, group)
+        finally:
+            # Перебор прерван (отмена или закрытие генератора): задачи,
+            # еще не начатые процессами, снимаются с пула
+            for _, future in pending:
+                future.cancel()
+
+    def _recognize_pending(self, source, pending, language, ordered, cancel_token, scheduler, group):
+        """Подача изображений в пул и выдача результатов (см. recognize_many)"""
+        exhausted = False
+        next_item = None
+        while True:
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+
+            # Поддерживаем ограниченное количество задач в пуле
+            while not exhausted and len(pending) < self.max_in_flight:
+                if next_item is None:
+                    try:
+                        next_item = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+
+                ticket = None
+                if scheduler is not None:
+                    # Пока в пуле есть задачи, слот не ждем: сначала выдаются
+                    # готовые результаты, слот освободится по их завершении
+                    ticket = scheduler.acquire(BATCH, group, cancel_token, timeout=0 if pending else None)
+                    if ticket is None:
+                        if cancel_token is not None and cancel_token.cancelled:
+                            return
+                        break
+
+                index, image = next_item
+                next_item = None
+                try:
+                    try:
+                        future = self.executor.submit(_recognize_item, image, language)
+                    except BrokenProcessPool:
+                        self._restart()
+                        future = self.executor.submit(_recognize_item, image, language)
+                except BaseException:
+                    if ticket is not None:
+                        scheduler.release(ticket)
+                    raise
+                if ticket is not None:
+                    future.add_done_callback(lambda _, ticket=ticket: scheduler.release(ticket))
+                pending.append((index, future))
+
+            if not pending:
+                return
+
+            # Следующий результат: первый по порядку или любой готовый
+            waiting = [pending[0][1]] if ordered else [future for _, future in pending]
+            done = self._wait(waiting, cancel_token)
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+            ready = [item for item in pending if item[1] in done]
+            for item in ready:
+                pending.remove(item)
+
+            broken = False
+            for index, future in ready:
+                result = self._collect(future, language)
+                broken = broken or (not future.cancelled() and isinstance(future.exception(), BrokenProcessPool))
+                yield index, result
+
+            # Аварийное завершение процесса ломает весь пул: задачи в полете
+            # отмечаются как ошибочные, пул перезапускается для остальных
+            if broken:
+                for index, future in pending:
+                    yield index, self._collect(future, language)
+                pending.clear()
+                self._restart()
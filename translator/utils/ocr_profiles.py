@@ -0,0 +1,104 @@
+"""
+Модуль профилей OCR: соотношение скорости и точности распознавания
+
+Профиль объединяет вариант моделей Tesseract (tessdata_fast или tessdata_best),
+режим движка (OEM), режим сегментации страницы (PSM), профиль предварительной
+обработки и целевую высоту строчных букв, до которой масштабируется текст.
+"""
+
+import os
+
+from translator.utils.preprocessing import DEFAULT_PROFILE, PreprocessingPipeline
+
+class OCRProfile:
+    """Именованный набор параметров распознавания"""
+
+    def __init__(self, name, model="", oem=None, psm=3, preprocessing=DEFAULT_PROFILE, x_height=20):
+        """
+        Инициализация профиля
+
+        Args:
+            name: имя профиля
+            model: вариант моделей Tesseract ("fast", "best" или "" - стандартные)
+            oem: режим движка Tesseract (None - по умолчанию, 1 - только LSTM)
+            psm: режим сегментации страницы при распознавании изображения целиком
+            preprocessing: имя профиля предварительной обработки
+            x_height: целевая высота строчных букв в пикселях (масштаб текста)
+        """
+        self.name = name
+        self.model = model
+        self.oem = oem
+        self.psm = psm
+        self.preprocessing = preprocessing
+        self.x_height = x_height
+
+    def create_pipeline(self, preprocessing=None):
+        """
+        Создание конвейера предварительной обработки с масштабом профиля
+
+        Args:
+            preprocessing: имя профиля обработки вместо указанного в профиле
+
+        Returns:
+            PreprocessingPipeline: конвейер обработки
+        """
+        return PreprocessingPipeline.from_profile(
+            preprocessing or self.preprocessing,
+            {"x_height": {"target": self.x_height}}
+        )
+
+    def tesseract_config(self, tessdata_dir="", psm=None):
+        """
+        Строка параметров Tesseract
+
+        Args:
+            tessdata_dir: каталог с моделями варианта профиля ("" - стандартный)
+            psm: режим сегментации вместо режима профиля
+
+        Returns:
+            str: параметры командной строки Tesseract
+        """
+        config = []
+        if self.oem is not None:
+            config.append(f"--oem {self.oem}")
+        config.append(f"--psm {psm or self.psm}")
+        if tessdata_dir:
+            config.append(f'--tessdata-dir "{tessdata_dir}"')
+        return " ".join(config)
+
+    def find_tessdata_dir(self, tessdata_dirs, language_code):
+        """
+        Каталог моделей варианта профиля, содержащий модель языка
+
+        Args:
+            tessdata_dirs: словарь {вариант моделей: каталог}
+            language_code: код языка Tesseract (eng, rus, jpn)
+
+        Returns:
+            str: путь к каталогу или "", если используются стандартные модели
+        """
+        tessdata_dir = (tessdata_dirs or {}).get(self.model, "")
+        if tessdata_dir and os.path.exists(os.path.join(tessdata_dir, f"{language_code}.traineddata")):
+            return tessdata_dir
+        return ""
+
+OCR_PROFILES = {
+    # Режим реального времени: быстрые модели, без анализа разметки страницы
+    # (PSM 6 - один блок текста), текст уменьшается до минимально надежной высоты
+    "fast": OCRProfile("fast", model="fast", oem=1, psm=6, x_height=16),
+    # Стандартные модели и параметры Tesseract
+    "balanced": OCRProfile("balanced"),
+    # Файлы: точные модели и более крупный текст
+    "best": OCRProfile("best", model="best", oem=1, psm=3, x_height=26)
+}
+
+DEFAULT_OCR_PROFILE = "balanced"
+
+# Режимы захвата и профили для них по умолчанию
+# (ключи настроек ocr/profile/<режим>)
+CAPTURE_MODE_PROFILES = {
+    "area": "balanced",
+    "window": "balanced",
+    "file": "best",
+    "realtime": "fast"
+}
@@ -0,0 +1,259 @@
+"""
+Модуль структурированных результатов OCR: блоки, строки и слова с координатами
+"""
+
+import numpy as np
+
+# Описание одного слова: номер блока, абзаца и строки, рамка и уверенность
+WORD_DTYPE = np.dtype([
+    ("block", np.int32),
+    ("paragraph", np.int32),
+    ("line", np.int32),
+    ("left", np.int32),
+    ("top", np.int32),
+    ("width", np.int32),
+    ("height", np.int32),
+    ("conf", np.float32)
+])
+
+class OCRResult:
+    """Результат распознавания в компактном виде на основе массива NumPy"""
+
+    def __init__(self, boxes=None, words=None, language="", error=None, profile=""):
+        """
+        Инициализация результата
+
+        Args:
+            boxes: структурированный массив с типом WORD_DTYPE
+            words: список слов, соответствующих строкам boxes
+            language: код языка распознавания (en, ru, ja)
+            error: сообщение об ошибке или None
+            profile: имя профиля OCR, с которым получен результат
+        """
+        self.boxes = boxes if boxes is not None else np.zeros(0, dtype=WORD_DTYPE)
+        self.words = list(words) if words is not None else []
+        self.language = language
+        self.error = error
+        self.profile = profile
+
+    @classmethod
+    def failure(cls, message, language=""):
+        """
+        Создание результата с ошибкой
+
+        Args:
+            message: сообщение об ошибке
+            language: код языка распознавания
+
+        Returns:
+            OCRResult: пустой результат с заполненным полем error
+        """
+        return cls(language=language, error=message)
+
+    @classmethod
+    def from_tesseract_data(cls, data, language="", offset=(0, 0), scale=1.0, block_offset=0):
+        """
+        Создание результата из словаря pytesseract.image_to_data
+
+        Args:
+            data: словарь, полученный с output_type=Output.DICT
+            language: код языка распознавания
+            offset: смещение (x, y), добавляемое к координатам
+            scale: коэффициент масштабирования изображения, переданного в Tesseract
+                (координаты делятся на него, чтобы вернуться к исходному снимку)
+            block_offset: число, добавляемое к номерам блоков
+
+        Returns:
+            OCRResult: результат распознавания
+        """
+        texts = data.get("text", [])
+        confs = np.asarray(data.get("conf", []), dtype=np.float32)
+
+        # Строки уровня 5 с непустым текстом - это слова; остальные строки
+        # описывают страницу, блоки, абзацы и строки
+        keep = [
+            i for i, text in enumerate(texts)
+            if data["level"][i] == 5 and text.strip() and confs[i] >= 0
+        ]
+
+        boxes = np.zeros(len(keep), dtype=WORD_DTYPE)
+        if keep:
+            index = np.asarray(keep)
+            boxes["block"] = np.asarray(data["block_num"])[index] + block_offset
+            boxes["paragraph"] = np.asarray(data["par_num"])[index]
+            boxes["line"] = np.asarray(data["line_num"])[index]
+            boxes["left"] = np.asarray(data["left"])[index] / scale + offset[0]
+            boxes["top"] = np.asarray(data["top"])[index] / scale + offset[1]
+            boxes["width"] = np.asarray(data["width"])[index] / scale
+            boxes["height"] = np.asarray(data["height"])[index] / scale
+            boxes["conf"] = confs[index]
+
+        return cls(boxes, [texts[i].strip() for i in keep], language)
+
+    @classmethod
+    def merge(cls, results, language=""):
+        """
+        Объединение результатов нескольких областей в порядке их следования
+
+        Номера блоков перенумеровываются, чтобы блоки разных областей не совпадали.
+
+        Args:
+            results: список OCRResult
+            language: код языка распознавания
+
+        Returns:
+            OCRResult: объединенный результат (с первой ошибкой, если она была)
+        """
+        boxes = []
+        words = []
+        error = None
+        next_block = 0
+        for result in results:
+            if result.error and error is None:
+                error = result.error
+            if not len(result):
+                continue
+            shifted = result.boxes.copy()
+            _, shifted["block"] = np.unique(shifted["block"], return_inverse=True)
+            shifted["block"] += next_block
+            next_block = int(shifted["block"].max()) + 1
+            boxes.append(shifted)
+            words.extend(result.words)
+
+        merged = np.concatenate(boxes) if boxes else None
+        return cls(merged, words, language, error)
+
+    @property
+    def ok(self):
+        """True, если распознавание завершилось без ошибки"""
+        return self.error is None
+
+    def __len__(self):
+        return len(self.words)
+
+    def filter(self, min_conf=0):
+        """
+        Отбор слов с уверенностью не ниже заданной
+
+        Args:
+            min_conf: минимальная уверенность (0-100)
+
+        Returns:
+            OCRResult: новый результат только с уверенно распознанными словами
+        """
+        mask = self.boxes["conf"] >= min_conf
+        words = [word for word, keep in zip(self.words, mask) if keep]
+        return OCRResult(self.boxes[mask], words, self.language, self.error, self.profile)
+
+    def transformed(self, offset=(0, 0), scale=1.0):
+        """
+        Перенос рамок в другую систему координат
+
+        Args:
+            offset: смещение (x, y), добавляемое к координатам
+            scale: коэффициент масштабирования (координаты делятся на него)
+
+        Returns:
+            OCRResult: новый результат с пересчитанными рамками
+        """
+        boxes = self.boxes.copy()
+        boxes["left"] = boxes["left"] / scale + offset[0]
+        boxes["top"] = boxes["top"] / scale + offset[1]
+        boxes["width"] = boxes["width"] / scale
+        boxes["height"] = boxes["height"] / scale
+        return OCRResult(boxes, self.words, self.language, self.error, self.profile)
+
+    @property
+    def mean_confidence(self):
+        """Средняя уверенность по словам (0, если слов нет)"""
+        return float(self.boxes["conf"].mean()) if len(self) else 0.0
+
+    def _groups(self, keys, min_conf):
+        """
+        Группировка слов по набору полей с сохранением порядка
+
+        Returns:
+            list: список словарей с текстом, рамкой и средней уверенностью группы
+        """
+        result = self.filter(min_conf)
+        if not len(result):
+            return []
+
+        boxes = result.boxes
+        group_keys = np.stack([boxes[key] for key in keys], axis=1)
+        # Новая группа начинается там, где меняется хотя бы одно поле ключа
+        starts = np.flatnonzero(np.any(np.diff(group_keys, axis=0) != 0, axis=1)) + 1
+        bounds = np.concatenate(([0], starts, [len(boxes)]))
+
+        groups = []
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            part = boxes[begin:end]
+            left = int(part["left"].min())
+            top = int(part["top"].min())
+            right = int((part["left"] + part["width"]).max())
+            bottom = int((part["top"] + part["height"]).max())
+            groups.append({
+                "text": " ".join(result.words[begin:end]),
+                "box": (left, top, right - left, bottom - top),
+                "conf": float(part["conf"].mean()),
+                "block": int(part["block"][0])
+            })
+        return groups
+
+    def lines(self, min_conf=0):
+        """
+        Строки текста
+
+        Args:
+            min_conf: минимальная уверенность слов, включаемых в строку
+
+        Returns:
+            list: словари {"text", "box": (x, y, width, height), "conf", "block"}
+        """
+        return self._groups(("block", "paragraph", "line"), min_conf)
+
+    def blocks(self, min_conf=0):
+        """
+        Текстовые блоки
+
+        Args:
+            min_conf: минимальная уверенность слов, включаемых в блок
+
+        Returns:
+            list: словари {"text", "box": (x, y, width, height), "conf", "block"};
+                строки внутри блока разделены переводом строки
+        """
+        blocks = []
+        for line in self.lines(min_conf):
+            if blocks and blocks[-1]["block"] == line["block"]:
+                block = blocks[-1]
+                x1, y1, w1, h1 = block["box"]
+                x2, y2, w2, h2 = line["box"]
+                left, top = min(x1, x2), min(y1, y2)
+                right, bottom = max(x1 + w1, x2 + w2), max(y1 + h1, y2 + h2)
+                block["box"] = (left, top, right - left, bottom - top)
+                block["text"] += "\n" + line["text"]
+                block["lines"].append(line)
+            else:
+                blocks.append({
+                    "text": line["text"],
+                    "box": line["box"],
+                    "block": line["block"],
+                    "lines": [line]
+                })
+        for block in blocks:
+            block["conf"] = float(np.mean([line["conf"] for line in block["lines"]]))
+            del block["lines"]
+        return blocks
+
+    def text(self, min_conf=0):
+        """
+        Полный текст: слова строки через пробел, строки через перевод строки
+
+        Args:
+            min_conf: минимальная уверенность включаемых слов
+
+        Returns:
+            str: распознанный текст
+        """
+        return "\n".join(line["text"] for line in self.lines(min_conf))
@@ -0,0 +1,345 @@
+"""
+Модуль общего сервиса распознавания и перевода
+
+Один экземпляр на процесс владеет прогретыми OCR движками (по одному на
+режим захвата), переводчиком, захватом экрана и менеджером окон. Потоки
+вкладок берут их у сервиса вместо создания своих: проверка Tesseract,
+инициализация базы переводов и чтение настроек выполняются один раз, а
+не при каждом нажатии горячей клавиши. Объекты пересоздаются только после
+изменения соответствующих настроек.
+
+Разовые захваты области и окна обрабатываются конвейером сервиса: этапы
+захвата, предварительной обработки, OCR, перевода и доставки результата
+связаны ограниченными очередями и выполняются одновременно для разных
+заданий. Результаты передаются вкладкам по частям: снимок после захвата,
+распознанный текст после OCR, перевод по мере ответа сервера и итог.
+"""
+
+import os
+import threading
+
+from PyQt5.QtCore import QSettings
+
+from translator.models.translator import LLMTranslator
+from translator.utils.job_scheduler import INTERACTIVE, JobScheduler
+from translator.utils.ocr import OCREngine
+from translator.utils.screenshot import ScreenCapture
+from translator.utils.staged_pipeline import Job, Stage, StagedPipeline
+from translator.utils.window_manager import get_window_manager
+
+# Группы настроек, от которых зависят OCR движки и переводчик (настройки
+# режима реального времени читаются при каждом запуске и сюда не входят)
+OCR_SETTINGS = ("ocr/engine", "ocr/tesseract_path", "ocr/profile/", "ocr/tessdata_", "ocr/batch_workers")
+TRANSLATOR_SETTINGS = ("translator/", "openai/", "deepseek/")
+
+# Этапы конвейера захвата: {имя: (количество обработчиков, размер очереди)}.
+# Перевод в основном ждет ответа сервера, поэтому обработчиков у него
+# больше; результаты доставляются одним обработчиком по очереди
+CAPTURE_STAGES = {
+    "capture": (1, 2),
+    "preprocess": (1, 4),
+    "ocr": (2, 4),
+    "translate": (4, 8),
+    "emit": (1, 8)
+}
+
+def default_db_path():
+    """Путь к базе переводов в папке приложения"""
+    db_dir = os.path.join(os.path.expanduser("~"), ".translator")
+    if not os.path.exists(db_dir):
+        os.makedirs(db_dir)
+    return os.path.join(db_dir, "translations.db")
+
+class PipelineService:
+    """Общие для всех вкладок OCR движки, переводчик и средства захвата"""
+
+    def __init__(self, settings=None, db_path=None):
+        """
+        Инициализация сервиса (сами объекты создаются при первом обращении)
+
+        Args:
+            settings: объект QSettings (по умолчанию - настройки приложения)
+            db_path: путь к базе переводов
+        """
+        self.settings = settings or QSettings("TranslatorApp", "Translator")
+        self.db_path = db_path or default_db_path()
+
+        self._lock = threading.RLock()
+        self._engines = {}
+        self._translator = None
+        self._capture_pipeline = None
+        self._ocr_snapshot = self._snapshot(OCR_SETTINGS)
+        self._translator_snapshot = self._snapshot(TRANSLATOR_SETTINGS)
+
+        # Слоты распознавания, общие для разовых захватов, режима реального
+        # времени и обработки файлов (интерактивные задания - вне очереди)
+        self.scheduler = JobScheduler()
+
+        # Захват экрана хранит соединения отдельно для каждого потока,
+        # поэтому один экземпляр используется всеми вкладками
+        self.screenshot = ScreenCapture()
+        self.window_manager = get_window_manager()
+
+    def _snapshot(self, prefixes):
+        """Значения настроек с заданными префиксами"""
+        return {
+            key: self.settings.value(key)
+            for key in self.settings.allKeys()
+            if key.startswith(prefixes)
+        }
+
+    def ocr_engine(self, mode="area"):
+        """
+        OCR движок режима захвата (создается при первом обращении)
+
+        Args:
+            mode: режим захвата ("area", "window", "file", "realtime")
+
+        Returns:
+            OCREngine: движок с профилем OCR режима
+        """
+        with self._lock:
+            engine = self._engines.get(mode)
+            if engine is None:
+                engine = self._engines[mode] = OCREngine.from_settings(self.settings, mode)
+            return engine
+
+    @property
+    def translator(self):
+        """Переводчик с ключами API и провайдером из настроек"""
+        with self._lock:
+            if self._translator is None:
+                self._translator = self._create_translator()
+            return self._translator
+
+    def _create_translator(self):
+        """Создание и настройка переводчика"""
+        translator = LLMTranslator(self.db_path)
+
+        # Ключи устанавливаются для всех провайдеров, чтобы смена провайдера
+        # по умолчанию не требовала пересоздания
+        for provider, default_url in (
+            ("openai", "https://api.openai.com/v1"),
+            ("deepseek", "https://api.aiguoguo199.com/v1")
+        ):
+            api_key = self.settings.value(f"{provider}/api_key", "")
+            base_url = self.settings.value(f"{provider}/base_url", default_url)
+            if api_key:
+                translator.set_api_key(provider, api_key, base_url)
+
+        translator.set_default_provider(self.settings.value("translator/provider", "openai"))
+        return translator
+
+    @property
+    def provider(self):
+        """
+        Провайдер перевода по умолчанию
+
+        Берется из переводчика, настроенного под блокировкой при создании:
+        потоки конвейера не читают QSettings, которые одновременно
+        записывает поток интерфейса.
+        """
+        return self.translator.default_provider
+
+    def translate(self, text, source_lang, target_lang, cancel_token=None, on_delta=None):
+        """
+        Перевод текста провайдером по умолчанию (отмена прерывает запрос,
+        on_delta получает части перевода по мере ответа сервера)
+        """
+        # Переводчик и провайдер берутся из одного снимка настроек, даже
+        # если reload() заменит переводчик во время перевода
+        translator = self.translator
+        return translator.translate(text, source_lang, target_lang, translator.default_provider, cancel_token, on_delta)
+
+    @property
+    def capture_pipeline(self):
+        """Конвейер разовых захватов (создается при первом обращении)"""
+        with self._lock:
+            if self._capture_pipeline is None:
+                self._capture_pipeline = self._create_capture_pipeline()
+            return self._capture_pipeline
+
+    def _create_capture_pipeline(self):
+        """Создание конвейера захват - обработка - OCR - перевод - доставка"""
+        functions = {
+            "capture": self._capture_stage,
+            "preprocess": self._preprocess_stage,
+            "ocr": self._ocr_stage,
+            "translate": self._translate_stage,
+            "emit": self._emit_stage
+        }
+        stages = [
+            Stage(
+                name, functions[name], workers, queue_size,
+                # Соединения захвата закрываются в потоке, который их открыл
+                on_exit=self.screenshot.release_thread if name == "capture" else None
+            )
+            for name, (workers, queue_size) in CAPTURE_STAGES.items()
+        ]
+        return StagedPipeline(stages, name="Capture")
+
+    def submit_capture(self, grab, mode, source_lang, target_lang, callback=None, progress=None, block=False,
+                       priority=INTERACTIVE):
+        """
+        Отправка разового захвата в конвейер
+
+        Args:
+            grab: функция без аргументов, возвращающая изображение или None
+                (см. translator.utils.realtime.area_grabber)
+            mode: режим захвата, определяющий профиль OCR ("area", "window")
+            source_lang: код языка оригинала
+            target_lang: код языка перевода
+            callback: функция callback(job), вызываемая после обработки
+                (в потоке конвейера)
+            progress: функция progress(job, stage) о готовых частях результата
+                (в потоке конвейера): "capture" - заполнено job.image,
+                "ocr" - job.text, "translate_delta" - получена очередная часть
+                перевода, job.translated содержит перевод на данный момент
+            block: ждать места в очереди захвата
+            priority: класс приоритета распознавания в планировщике
+
+        Returns:
+            Job: задание (job.cancel() прерывает его обработку); после
+                обработки заполнены поля image, text, translated или error
+                и failed_stage
+
+        Raises:
+            queue.Full: очередь захвата заполнена (при block=False)
+        """
+        job = Job(
+            callback, progress, grab=grab, mode=mode, priority=priority,
+            source_lang=source_lang, target_lang=target_lang,
+            image=None, engine=None, prepared=None, ocr_result=None,
+            text="", translated=""
+        )
+        return self.capture_pipeline.submit(job, block=block)
+
+    def _capture_stage(self, job):
+        """Этап захвата изображения"""
+        job.image = job.grab()
+        if job.image is None:
+            job.fail("capture", "Не удалось захватить изображение")
+
+    def _preprocess_stage(self, job):
+        """Этап предварительной обработки"""
+        # Движок запоминается в задании, чтобы распознавание после смены
+        # настроек выполнялось тем же движком, что и обработка
+        job.engine = self.ocr_engine(job.mode)
+        if not job.engine.is_available:
+            job.fail("preprocess", job.engine.TESSERACT_UNAVAILABLE)
+            return
+        job.prepared = job.engine.prepare(job.image)
+        if job.prepared is None:
+            job.fail("preprocess", "Ошибка: не удалось обработать изображение.")
+
+    def _ocr_stage(self, job):
+        """Этап распознавания текста"""
+        prepared, job.prepared = job.prepared, None
+        with self.scheduler.slot(job.priority, cancel_token=job.token):
+            job.ocr_result = job.engine.recognize_prepared(prepared, job.source_lang, job.token)
+        if not job.ocr_result.ok:
+            job.fail("ocr", job.ocr_result.error)
+            return
+        job.text = job.ocr_result.text(job.engine.DEFAULT_MIN_CONFIDENCE).strip()
+        if job.text:
+            job.mark_content()
+
+    def _translate_stage(self, job):
+        """Этап перевода (пропускается, если текст не найден)"""
+        if not job.text:
+            return
+
+        def on_delta(delta):
+            # Перевод накапливается в задании; получатель читает его целиком
+            job.translated += delta
+            job.notify("translate_delta")
+
+        job.translated = self.translate(job.text, job.source_lang, job.target_lang, job.token, on_delta)
+
+    @staticmethod
+    def _emit_stage(job):
+        """Этап доставки результата"""
+        if job.callback is not None:
+            job.callback(job)
+
+    def reload(self):
+        """
+        Применение изменившихся настроек
+
+        Пересоздаются только объекты, настройки которых изменились. Потоки,
+        уже получившие прежние объекты, завершают работу с ними; пакетная
+        обработка файлов, начатая с прежними настройками OCR, прерывается
+        (ее пул процессов останавливается).
+
+        Returns:
+            bool: True, если что-либо было пересоздано
+        """
+        with self._lock:
+            self.settings.sync()
+            reloaded = False
+
+            ocr_snapshot = self._snapshot(OCR_SETTINGS)
+            if ocr_snapshot != self._ocr_snapshot:
+                self._ocr_snapshot = ocr_snapshot
+                engines, self._engines = self._engines, {}
+                for engine in engines.values():
+                    engine.shutdown()
+                reloaded = True
+
+            translator_snapshot = self._snapshot(TRANSLATOR_SETTINGS)
+            if translator_snapshot != self._translator_snapshot:
+                self._translator_snapshot = translator_snapshot
+                self._translator = None
+                reloaded = True
+
+            return reloaded
+
+    def warm_up(self, modes=("area",)):
+        """
+        Создание движков и переводчика в фоновом потоке
+
+        Args:
+            modes: режимы захвата, движки которых нужны первыми
+
+        Returns:
+            threading.Thread: поток прогрева
+        """
+        def run():
+            try:
+                for mode in modes:
+                    self.ocr_engine(mode)
+                self.translator
+            except Exception as e:
+                print(f"Ошибка при подготовке OCR и переводчика: {e}")
+
+        thread = threading.Thread(target=run, name="PipelineWarmUp", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        """Остановка конвейера, пулов процессов и закрытие соединений захвата"""
+        with self._lock:
+            if self._capture_pipeline is not None:
+                # Задания, ожидающие ответа сервера перевода, не задерживают выход
+                self._capture_pipeline.stop(wait=False)
+                self._capture_pipeline = None
+            for engine in self._engines.values():
+                engine.shutdown()
+            self._engines = {}
+            self.screenshot.cleanup()
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_pipeline_service():
+    """
+    Общий сервис распознавания и перевода (создается при первом обращении)
+
+    Returns:
+        PipelineService: сервис
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PipelineService()
+        return _service
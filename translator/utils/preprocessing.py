@@ -0,0 +1,342 @@
+"""
+Модуль предварительной обработки изображений для OCR
+
+Все этапы работают с массивами NumPy и не создают промежуточных копий PIL.
+"""
+
+import threading
+import time
+import cv2
+import numpy as np
+
+# Ядро повышения резкости, совпадающее с PIL.ImageFilter.SHARPEN
+SHARPEN_KERNEL = np.array([
+    [-2, -2, -2],
+    [-2, 32, -2],
+    [-2, -2, -2]
+], dtype=np.float32) / 16.0
+
+def load_image(image_path):
+    """
+    Загрузка изображения в массив NumPy
+
+    Args:
+        image_path: путь к изображению (поддерживаются пути с не-ASCII символами)
+
+    Returns:
+        numpy.ndarray: изображение BGR или None в случае ошибки
+    """
+    try:
+        data = np.fromfile(image_path, dtype=np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+    except Exception as e:
+        print(f"Ошибка при загрузке изображения: {e}")
+        return None
+
+def to_grayscale(image):
+    """Перевод изображения в оттенки серого"""
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+def normalize_polarity(image):
+    """Инвертирование светлого текста на темном фоне (Tesseract ожидает темный текст)"""
+    # Фон занимает большую часть изображения, поэтому средняя яркость
+    # определяется в основном им
+    if cv2.mean(image)[0] < 128:
+        return cv2.bitwise_not(image)
+    return image
+
+def enhance_contrast(image, factor=1.5):
+    """Повышение контраста относительно средней яркости (аналог ImageEnhance.Contrast)"""
+    mean = float(image.mean())
+    # addWeighted выполняет насыщение к [0, 255], в отличие от convertScaleAbs
+    return cv2.addWeighted(image, factor, image, 0.0, mean * (1.0 - factor))
+
+def sharpen(image):
+    """Повышение резкости (аналог ImageFilter.SHARPEN)"""
+    return cv2.filter2D(image, -1, SHARPEN_KERNEL)
+
+def denoise(image, ksize=3):
+    """Подавление шума медианным фильтром"""
+    return cv2.medianBlur(image, ksize)
+
+def rescale_dpi(image, source_dpi=96, target_dpi=300):
+    """
+    Масштабирование изображения к целевому разрешению
+
+    Args:
+        image: изображение
+        source_dpi: разрешение исходного изображения (96 для экрана)
+        target_dpi: целевое разрешение
+    """
+    scale = float(target_dpi) / float(source_dpi)
+    if abs(scale - 1.0) < 0.05:
+        return image
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=interpolation)
+
+def _measure_x_height(image):
+    """
+    Измерение x-высоты по связным компонентам без масштабирования
+
+    Args:
+        image: изображение в оттенках серого
+
+    Returns:
+        float: x-высота в пикселях или 0, если символы не найдены
+    """
+    _, binary = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    # Символы должны быть передним планом: если "текст" занимает больше
+    # половины изображения, полярность определена неверно
+    if cv2.countNonZero(binary) > binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if count <= 1:
+        return 0.0
+
+    # Статистика без фоновой компоненты
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    areas = stats[1:, cv2.CC_STAT_AREA]
+
+    # Отсеиваем шум, линии и крупную графику
+    max_height = image.shape[0] * 0.5
+    mask = (
+        (heights >= 2) & (heights <= max_height) &
+        (widths <= heights * 4) & (heights <= widths * 8) &
+        (areas >= 4)
+    )
+    if np.count_nonzero(mask) < 3:
+        return 0.0
+
+    # Нижняя часть распределения высот соответствует строчным буквам без
+    # выносных элементов; для иероглифов все высоты примерно одинаковы
+    return float(np.percentile(heights[mask], 30))
+
+def estimate_x_height(image, max_side=1600, min_reliable=8):
+    """
+    Оценка высоты строчных символов текста на изображении
+
+    Сначала оценка выполняется по уменьшенной копии; если символы на ней
+    слишком мелкие для надежного измерения, разрешение удваивается.
+
+    Args:
+        image: изображение в оттенках серого
+        max_side: максимальная сторона уменьшенной копии для первой оценки
+        min_reliable: минимальная измеренная высота (в пикселях уменьшенной
+            копии), при которой оценке можно доверять
+
+    Returns:
+        float: оценка x-высоты в пикселях исходного изображения или 0
+    """
+    factor = 1
+    while max(image.shape[:2]) // (factor * 2) >= max_side:
+        factor *= 2
+
+    while True:
+        if factor > 1:
+            reduced = cv2.resize(
+                image, (image.shape[1] // factor, image.shape[0] // factor),
+                interpolation=cv2.INTER_AREA
+            )
+        else:
+            reduced = image
+
+        x_height = _measure_x_height(reduced)
+        if factor == 1 or x_height >= min_reliable:
+            return x_height * factor
+        factor //= 2
+
+def rescale_to_x_height(image, target=20, min_scale=0.25, max_scale=4.0, tolerance=0.15,
+                        max_pixels=12000000):
+    """
+    Масштабирование изображения так, чтобы x-высота текста была близка к целевой
+
+    Tesseract работает быстрее и точнее всего, когда высота строчных символов
+    около 20 пикселей: мелкий текст интерфейса увеличивается, а крупные
+    заголовки и скриншоты 4K уменьшаются.
+
+    Args:
+        image: изображение в оттенках серого
+        target: целевая x-высота в пикселях
+        min_scale: минимальный коэффициент масштабирования
+        max_scale: максимальный коэффициент масштабирования
+        tolerance: допустимое относительное отклонение, при котором
+            масштабирование не выполняется
+        max_pixels: ограничение на размер результата при увеличении
+    """
+    x_height = estimate_x_height(image)
+    if x_height <= 0:
+        return image
+
+    height, width = image.shape[:2]
+    max_scale = min(max_scale, max(1.0, (max_pixels / float(width * height)) ** 0.5))
+    scale = min(max_scale, max(min_scale, target / x_height))
+    if abs(scale - 1.0) <= tolerance:
+        return image
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=interpolation)
+
+def adaptive_threshold(image, block_size=31, c=15):
+    """Адаптивная бинаризация (устойчива к неравномерной подсветке и градиентам фона)"""
+    return cv2.adaptiveThreshold(
+        image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, c
+    )
+
+def deskew(image, max_angle=15.0, min_angle=0.3):
+    """
+    Выравнивание наклона текста
+
+    Args:
+        image: изображение в оттенках серого с темным текстом на светлом фоне
+        max_angle: максимальный исправляемый угол в градусах
+        min_angle: угол, меньше которого поворот не выполняется
+    """
+    coords = cv2.findNonZero(cv2.bitwise_not(image))
+    if coords is None or len(coords) < 50:
+        return image
+
+    angle = cv2.minAreaRect(coords)[-1]
+    # В зависимости от версии OpenCV угол лежит в [-90, 0) или (0, 90]
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+    if abs(angle) < min_angle or abs(angle) > max_angle:
+        return image
+
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(
+        image, matrix, (width, height),
+        flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE
+    )
+
+# Доступные этапы обработки
+STAGES = {
+    "grayscale": to_grayscale,
+    "polarity": normalize_polarity,
+    "contrast": enhance_contrast,
+    "sharpen": sharpen,
+    "denoise": denoise,
+    "rescale_dpi": rescale_dpi,
+    "x_height": rescale_to_x_height,
+    "threshold": adaptive_threshold,
+    "deskew": deskew
+}
+
+# Профили обработки: список этапов и их параметров
+PROFILES = {
+    # Прежняя обработка: контраст 1.5 и повышение резкости
+    "legacy": [
+        ("grayscale", {}),
+        ("contrast", {"factor": 1.5}),
+        ("sharpen", {})
+    ],
+    # Четкий экранный текст: минимум этапов ради скорости
+    "screen": [
+        ("grayscale", {}),
+        ("polarity", {}),
+        ("x_height", {}),
+        ("contrast", {"factor": 1.5})
+    ],
+    # Сканы и фотографии документов
+    "document": [
+        ("grayscale", {}),
+        ("x_height", {}),
+        ("denoise", {}),
+        ("polarity", {}),
+        ("threshold", {}),
+        ("deskew", {})
+    ],
+    # Текст поверх видео и неоднородного фона (субтитры, игры)
+    "video": [
+        ("grayscale", {}),
+        ("denoise", {}),
+        ("polarity", {}),
+        ("x_height", {}),
+        ("threshold", {"block_size": 41, "c": 20})
+    ]
+}
+
+DEFAULT_PROFILE = "screen"
+
+class PreprocessingPipeline:
+    """Последовательность этапов предварительной обработки изображения"""
+
+    def __init__(self, stages=None):
+        """
+        Инициализация конвейера
+
+        Args:
+            stages: список кортежей (имя_этапа, параметры) из STAGES
+        """
+        self.stages = []
+        for name, params in stages or []:
+            if name not in STAGES:
+                raise ValueError(f"Неизвестный этап обработки: {name}")
+            self.stages.append((name, STAGES[name], dict(params)))
+
+        # Результаты последнего запуска хранятся отдельно для каждого потока:
+        # один конвейер используется параллельно разными вкладками
+        self._last_run = threading.local()
+
+    @property
+    def last_timings(self):
+        """Время выполнения этапов при последнем запуске в этом потоке (в секундах)"""
+        return getattr(self._last_run, "timings", {})
+
+    @property
+    def last_scale(self):
+        """Итоговый коэффициент масштабирования при последнем запуске в этом потоке"""
+        return getattr(self._last_run, "scale", 1.0)
+
+    @classmethod
+    def from_profile(cls, profile, overrides=None):
+        """
+        Создание конвейера по имени профиля
+
+        Args:
+            profile: имя профиля из PROFILES
+            overrides: словарь {имя_этапа: параметры}, дополняющий параметры
+                этапов профиля (этапы, которых нет в профиле, не добавляются)
+
+        Returns:
+            PreprocessingPipeline: конвейер обработки
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Неизвестный профиль обработки: {profile}")
+        overrides = overrides or {}
+        return cls([
+            (name, {**params, **overrides.get(name, {})})
+            for name, params in PROFILES[profile]
+        ])
+
+    @property
+    def stage_names(self):
+        """Имена этапов конвейера"""
+        return [name for name, _, _ in self.stages]
+
+    def run(self, image):
+        """
+        Применение всех этапов к изображению
+
+        Args:
+            image: изображение в виде массива NumPy
+
+        Returns:
+            numpy.ndarray: обработанное изображение
+        """
+        timings = {}
+        source_width = image.shape[1]
+        for name, stage, params in self.stages:
+            start = time.perf_counter()
+            image = stage(image, **params)
+            timings[name] = time.perf_counter() - start
+        self._last_run.timings = timings
+        self._last_run.scale = image.shape[1] / float(source_width) if source_width else 1.0
+        return image
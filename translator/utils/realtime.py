@@ -0,0 +1,371 @@
+"""
+Модуль непрерывного захвата кадров для режима реального времени
+
+Поток захвата снимает область или окно с заданным интервалом и хранит только
+последний кадр: если обработка (OCR и перевод) не успевает, промежуточные
+кадры отбрасываются, а не накапливаются в очереди. Потребителю передаются
+только кадры, содержимое которых изменилось. Интервал захвата может
+подстраиваться под частоту изменений, время обработки и бюджет ЦП.
+"""
+
+import os
+import re
+import threading
+import time
+
+from translator.utils.frame_diff import FrameDiffDetector
+
+# Единицы интервалов в настройках ("0.5 seconds", "1 секунда", "2 minutes", "1 минута")
+_DURATION_UNITS = (
+    ("сек", 1), ("sec", 1),
+    ("мин", 60), ("min", 60),
+    ("час", 3600), ("hour", 3600)
+)
+
+def parse_duration(text, default=None):
+    """
+    Разбор интервала из настроек
+
+    Args:
+        text: строка вида "0.5 seconds", "1 секунда", "2 минуты" или "Infinite"
+        default: значение при ошибке разбора
+
+    Returns:
+        float: длительность в секундах или None для бесконечной длительности
+    """
+    if text is None:
+        return default
+    text = str(text).strip().lower()
+    if text in ("infinite", "бесконечно", "без ограничений", "∞"):
+        return None
+
+    match = re.match(r"([0-9]+(?:[.,][0-9]+)?)\s*(\S*)", text)
+    if not match:
+        return default
+    value = float(match.group(1).replace(",", "."))
+    unit = match.group(2)
+    if not unit:
+        return value
+    for prefix, multiplier in _DURATION_UNITS:
+        if unit.startswith(prefix):
+            return value * multiplier
+    return default
+
+def parse_percent(text, default=None):
+    """
+    Разбор процентов из настроек ("50%", "50")
+
+    Returns:
+        float: доля (0.5 для "50%")
+    """
+    try:
+        return float(str(text).strip().rstrip("%").replace(",", ".")) / 100.0
+    except (TypeError, ValueError):
+        return default
+
+def area_grabber(screenshot, x1, y1, x2, y2):
+    """
+    Функция захвата области экрана
+
+    Args:
+        screenshot: экземпляр ScreenCapture
+
+    Returns:
+        callable: функция без аргументов, возвращающая изображение или None;
+            ее атрибут release закрывает соединения захвата потока
+    """
+    def grab():
+        return screenshot.grab_area(x1, y1, x2, y2)
+    # Соединения захвата потока FrameSource закрываются при его завершении
+    grab.release = screenshot.release_thread
+    return grab
+
+def window_grabber(screenshot, window_manager, window_title):
+    """
+    Функция захвата окна; положение окна определяется при каждом захвате,
+    поэтому перемещение окна не прерывает наблюдение
+
+    Args:
+        screenshot: экземпляр ScreenCapture
+        window_manager: экземпляр WindowManager
+        window_title: заголовок окна
+
+    Returns:
+        callable: функция без аргументов, возвращающая изображение или None
+    """
+    def grab():
+        # Пиксели окна читаются напрямую, если это поддерживается (X11)
+        window_handle = window_manager.find_window(window_title)
+        if window_handle is not None:
+            image = screenshot.grab_window(window_handle)
+            if image is not None:
+                return image
+        window_rect = window_manager.capture_window(window_title)
+        if not window_rect:
+            return None
+        x, y, width, height = window_rect
+        return screenshot.grab_area(x, y, x + width, y + height)
+    grab.release = screenshot.release_thread
+    return grab
+
+class Frame:
+    """Захваченный кадр"""
+
+    def __init__(self, image, index, timestamp):
+        """
+        Args:
+            image: изображение (массив NumPy)
+            index: порядковый номер захвата
+            timestamp: время захвата (time.monotonic)
+        """
+        self.image = image
+        self.index = index
+        self.timestamp = timestamp
+        # Изменения относительно предыдущего переданного кадра (FrameChange)
+        self.change = None
+
+class AdaptiveScheduler:
+    """
+    Подбор интервала захвата
+
+    Интервал уменьшается, пока кадры меняются, и увеличивается на статичных
+    кадрах. Он не становится меньше времени обработки кадра (иначе кадры
+    только отбрасываются), а загрузка ЦП процессом (включая дочерние
+    процессы OCR) удерживается в пределах бюджета.
+    """
+
+    # Множители интервала при изменившемся и неизменившемся кадре
+    SPEED_UP = 0.7
+    SLOW_DOWN = 1.25
+    # Сглаживание оценок загрузки ЦП и времени обработки
+    SMOOTHING = 0.3
+
+    def __init__(self, interval=1.0, min_interval=0.2, max_interval=5.0, cpu_budget=0.5):
+        """
+        Инициализация
+
+        Args:
+            interval: начальный интервал в секундах
+            min_interval: минимальный интервал
+            max_interval: максимальный интервал
+            cpu_budget: допустимая доля всех ядер ЦП (0.0 - 1.0,
+                None - без ограничения)
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.cpu_budget = cpu_budget
+        self.interval = self._clamp(interval)
+
+        self.cpu_count = os.cpu_count() or 1
+        # Текущая загрузка ЦП процессом (доля всех ядер) и время обработки кадра
+        self.cpu_usage = 0.0
+        self.processing_time = 0.0
+        self._last_sample = self._cpu_sample()
+
+    def _clamp(self, interval):
+        """Ограничение интервала допустимыми пределами"""
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    @staticmethod
+    def _cpu_sample():
+        """Время работы и процессорное время процесса и его дочерних процессов"""
+        times = os.times()
+        cpu = times.user + times.system + times.children_user + times.children_system
+        return time.monotonic(), cpu
+
+    def _update_cpu_usage(self):
+        """Обновление оценки загрузки ЦП с момента предыдущего замера"""
+        wall, cpu = self._cpu_sample()
+        last_wall, last_cpu = self._last_sample
+        if wall - last_wall < 0.05:
+            return
+        self._last_sample = (wall, cpu)
+        usage = (cpu - last_cpu) / ((wall - last_wall) * self.cpu_count)
+        self.cpu_usage += self.SMOOTHING * (usage - self.cpu_usage)
+
+    @property
+    def budget_usage(self):
+        """Использование бюджета ЦП (1.0 - бюджет исчерпан), None без бюджета"""
+        if not self.cpu_budget:
+            return None
+        return self.cpu_usage / self.cpu_budget
+
+    def record(self, changed, processing_time=0.0):
+        """
+        Учет очередного кадра
+
+        Args:
+            changed: изменилось ли содержимое кадра
+            processing_time: время обработки кадра потребителем в секундах
+
+        Returns:
+            float: новый интервал захвата
+        """
+        self._update_cpu_usage()
+        if processing_time:
+            self.processing_time += self.SMOOTHING * (processing_time - self.processing_time)
+
+        interval = self.interval * (self.SPEED_UP if changed else self.SLOW_DOWN)
+        # Захват чаще обработки только увеличивает число отброшенных кадров
+        interval = max(interval, self.processing_time)
+        # При превышении бюджета интервал растет пропорционально превышению
+        usage = self.budget_usage
+        if usage is not None and usage > 1.0:
+            interval = max(interval, self.interval * usage)
+
+        self.interval = self._clamp(interval)
+        return self.interval
+
+class FrameSource:
+    """Источник кадров с заданным или подбираемым интервалом и отбрасыванием кадров при занятости"""
+
+    def __init__(self, grab, interval=1.0, max_duration=60.0, change_detector=None, scheduler=None):
+        """
+        Инициализация источника
+
+        Args:
+            grab: функция без аргументов, возвращающая изображение или None
+            interval: интервал захвата в секундах
+            max_duration: максимальная длительность наблюдения в секундах
+                (None - без ограничения)
+            change_detector: экземпляр FrameDiffDetector (по умолчанию - с
+                параметрами по умолчанию)
+            scheduler: экземпляр AdaptiveScheduler; если задан, интервал
+                захвата подбирается им, а interval не используется
+        """
+        self.grab = grab
+        self._interval = max(0.05, float(interval))
+        self.max_duration = max_duration
+        self.change_detector = change_detector or FrameDiffDetector()
+        self.scheduler = scheduler
+
+        self._condition = threading.Condition()
+        self._pending = None
+        self._stopped = threading.Event()
+        self._thread = None
+        self._started_at = None
+
+        # Счетчики для отображения состояния
+        self.captured_frames = 0
+        self.dropped_frames = 0
+        self.unchanged_frames = 0
+        self.delivered_frames = 0
+
+    @property
+    def interval(self):
+        """Текущий интервал захвата в секундах"""
+        if self.scheduler is not None:
+            return self.scheduler.interval
+        return self._interval
+
+    @property
+    def running(self):
+        """True, пока поток захвата работает"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def elapsed(self):
+        """Время с начала наблюдения в секундах"""
+        return time.monotonic() - self._started_at if self._started_at is not None else 0.0
+
+    def start(self):
+        """Запуск потока захвата"""
+        if self.running:
+            return
+        self._stopped.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._capture_loop, name="FrameSource", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Остановка захвата; ожидающий потребитель завершает перебор кадров"""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def _capture_loop(self):
+        """Цикл потока захвата"""
+        next_tick = time.monotonic()
+        try:
+            while not self._stopped.is_set():
+                if self.max_duration is not None and self.elapsed >= self.max_duration:
+                    break
+
+                image = self.grab()
+                if image is not None:
+                    self.captured_frames += 1
+                    frame = Frame(image, self.captured_frames, time.monotonic())
+                    with self._condition:
+                        # Необработанный кадр заменяется более свежим
+                        if self._pending is not None:
+                            self.dropped_frames += 1
+                        self._pending = frame
+                        self._condition.notify_all()
+
+                # Интервал отсчитывается от плановых моментов, а не от конца
+                # захвата; пропущенные из-за долгого захвата моменты не навёрстываются
+                next_tick += self.interval
+                now = time.monotonic()
+                if next_tick < now:
+                    next_tick = now
+                self._stopped.wait(next_tick - now)
+        finally:
+            self._stopped.set()
+            with self._condition:
+                self._condition.notify_all()
+            release = getattr(self.grab, "release", None)
+            if release is not None:
+                release()
+
+    def _take(self):
+        """
+        Ожидание следующего кадра
+
+        Returns:
+            Frame: последний захваченный кадр или None после остановки
+        """
+        with self._condition:
+            while self._pending is None and not self._stopped.is_set():
+                self._condition.wait()
+            frame, self._pending = self._pending, None
+            return frame
+
+    def frames(self, include_unchanged=False):
+        """
+        Перебор изменившихся кадров (запускает захват, если он не запущен)
+
+        Пока потребитель обрабатывает кадр, новые кадры заменяют друг друга,
+        поэтому после обработки он получает самый свежий кадр.
+
+        Args:
+            include_unchanged: передавать и неизменившиеся кадры (например,
+                чтобы отсчитывать, сколько времени текст остается прежним)
+
+        Yields:
+            Frame: кадр с изменившимся содержимым; в поле change - рамка
+                и блоки изменений относительно предыдущего переданного кадра
+        """
+        self.start()
+        self.change_detector.reset()
+        try:
+            while True:
+                frame = self._take()
+                if frame is None:
+                    return
+                frame.change = self.change_detector.compare(frame.image)
+                if not frame.change.changed:
+                    self.unchanged_frames += 1
+                    started = time.monotonic()
+                    if include_unchanged:
+                        yield frame
+                else:
+                    self.delivered_frames += 1
+                    started = time.monotonic()
+                    yield frame
+                # Время между передачей изменившегося кадра и запросом
+                # следующего - время его обработки (OCR и перевод)
+                if self.scheduler is not None:
+                    changed = frame.change.changed
+                    self.scheduler.record(changed, time.monotonic() - started if changed else 0.0)
+        finally:
+            self.stop()
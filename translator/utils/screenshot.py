@@ -4,23 +4,58 @@
 
 import os
 import sys
-import time
+import shutil
 import tempfile
 import platform
-from PIL import Image, ImageGrab
+import threading
+from importlib.util import find_spec
+
+import cv2
+import numpy as np
 
 class ScreenCapture:
     """Класс для создания скриншотов"""
     
-    def __init__(self):
-        """Инициализация захватчика экрана"""
-        # Создание временной директории для скриншотов
-        self.temp_dir = tempfile.mkdtemp(prefix="translator_")
+    # Способы захвата экрана
+    BACKEND_MSS = "mss"
+    BACKEND_PIL = "pil"
+    
+    def __init__(self, backend=None):
+        """
+        Инициализация захватчика экрана
+        
+        Args:
+            backend: способ захвата ("mss" - только запрошенная область,
+                "pil" - PIL.ImageGrab); по умолчанию mss, если библиотека установлена
+        """
+        # Временная директория для снимков, сохраняемых в файл (capture_*);
+        # создается при первом сохранении и удаляется в cleanup. Экземпляр
+        # общий для процесса (см. PipelineService), поэтому директория одна
+        self.temp_dir = None
         self.screenshot_count = 0
+        self._save_lock = threading.Lock()
         
         # Определение операционной системы
         self.os_type = platform.system()
         
+        # mss копирует с экрана только нужную область (XShmGetImage на Linux,
+        # BitBlt области на Windows), а не весь виртуальный рабочий стол.
+        # Модуль здесь только ищется, импортируется он в _get_mss
+        self.mss_available = find_spec("mss") is not None
+        if not self.mss_available and backend == self.BACKEND_MSS:
+            print("Для быстрого захвата областей экрана установите библиотеку mss")
+            print("pip install mss")
+        
+        if backend is None or (backend == self.BACKEND_MSS and not self.mss_available):
+            backend = self.BACKEND_MSS if self.mss_available else self.BACKEND_PIL
+        self.backend = backend
+        
+        # Экземпляр mss нельзя использовать из другого потока, поэтому у
+        # каждого потока (например, QThread захвата) он свой
+        self._local = threading.local()
+        self._grabbers = []
+        self._grabbers_lock = threading.Lock()
+        
         # Проверка и импорт дополнительных библиотек в зависимости от ОС
         if self.os_type == 'Windows':
             try:
@@ -34,73 +69,232 @@ class ScreenCapture:
                 print("Для оптимального захвата окон на Windows установите библиотеку pywin32")
                 print("pip install pywin32")
     
-    def capture_fullscreen(self):
+    def _get_mss(self):
+        """Экземпляр mss текущего потока"""
+        grabber = getattr(self._local, "mss", None)
+        if grabber is None:
+            import mss
+            # mss.MSS появился в mss 10, прежние версии создают экземпляр через mss.mss()
+            factory = getattr(mss, "MSS", None) or mss.mss
+            grabber = self._local.mss = factory()
+            with self._grabbers_lock:
+                self._grabbers.append(grabber)
+        return grabber
+    
+    def monitors(self):
         """
-        Создание скриншота всего экрана
+        Список мониторов
         
         Returns:
-            str: путь к файлу скриншота
+            list: словари {"left", "top", "width", "height"} в координатах
+                виртуального рабочего стола; пустой, если мониторы нельзя
+                определить (без mss)
         """
-        # Генерация пути для сохранения скриншота
-        self.screenshot_count += 1
-        screenshot_path = os.path.join(
-            self.temp_dir, 
-            f"fullscreen_{int(time.time())}_{self.screenshot_count}.png"
-        )
-        
-        # Захват экрана с помощью PIL
+        if self.backend != self.BACKEND_MSS:
+            return []
         try:
-            screenshot = ImageGrab.grab()
-            screenshot.save(screenshot_path)
-            return screenshot_path
+            # Первый элемент списка mss - прямоугольник всех мониторов
+            return [dict(monitor) for monitor in self._get_mss().monitors[1:]]
         except Exception as e:
-            print(f"Ошибка при захвате экрана: {e}")
-            # Возвращаем пустой путь в случае ошибки
-            return ""
+            print(f"Ошибка при получении списка мониторов: {e}")
+            return []
     
-    def capture_area(self, x1, y1, x2, y2):
+    def monitors_for_area(self, x1, y1, x2, y2):
         """
-        Создание скриншота указанной области экрана
+        Мониторы, которые пересекает область
+        
+        Returns:
+            list: пересечения области с мониторами (x1, y1, x2, y2); если
+                мониторы неизвестны - сама область
+        """
+        monitors = self.monitors()
+        if not monitors:
+            return [(x1, y1, x2, y2)]
+        parts = []
+        for monitor in monitors:
+            left = max(x1, monitor["left"])
+            top = max(y1, monitor["top"])
+            right = min(x2, monitor["left"] + monitor["width"])
+            bottom = min(y2, monitor["top"] + monitor["height"])
+            if left < right and top < bottom:
+                parts.append((left, top, right, bottom))
+        return parts
+    
+    def grab_monitor(self, index=0):
+        """
+        Захват одного монитора
         
         Args:
-            x1: координата X левого верхнего угла
-            y1: координата Y левого верхнего угла
-            x2: координата X правого нижнего угла
-            y2: координата Y правого нижнего угла
+            index: номер монитора в списке monitors()
         
         Returns:
-            str: путь к файлу скриншота
+            numpy.ndarray: изображение или None в случае ошибки
         """
-        # Генерация пути для сохранения скриншота
-        self.screenshot_count += 1
-        screenshot_path = os.path.join(
-            self.temp_dir, 
-            f"area_{int(time.time())}_{self.screenshot_count}.png"
+        monitors = self.monitors()
+        if not monitors:
+            return self.grab_fullscreen()
+        if not 0 <= index < len(monitors):
+            print(f"Монитор {index} не найден")
+            return None
+        monitor = monitors[index]
+        return self.grab_area(
+            monitor["left"], monitor["top"],
+            monitor["left"] + monitor["width"], monitor["top"] + monitor["height"]
         )
+    
+    def grab_area(self, x1, y1, x2, y2):
+        """
+        Захват области экрана в память без сохранения в файл
+        
+        Args:
+            x1, y1: координаты левого верхнего угла (в системе виртуального рабочего стола)
+            x2, y2: координаты правого нижнего угла
         
-        # Расчет размеров области
+        Returns:
+            numpy.ndarray: изображение BGRA (mss) или BGR (PIL), None в случае ошибки
+        """
         width = x2 - x1
         height = y2 - y1
-        
-        # Проверка корректности параметров
         if width <= 0 or height <= 0:
             print("Некорректные размеры области для захвата")
-            return ""
+            return None
         
-        # Захват указанной области экрана
         try:
-            # Полный скриншот экрана
-            full_screenshot = ImageGrab.grab()
+            if self.backend == self.BACKEND_MSS:
+                # Захватываются только части области на мониторах: область
+                # обрезается до прямоугольника этих частей, а промежутки между
+                # мониторами разного размера заполняются черным
+                parts = self.monitors_for_area(x1, y1, x2, y2)
+                if not parts:
+                    print("Область не пересекает ни один монитор")
+                    return None
+                left = min(part[0] for part in parts)
+                top = min(part[1] for part in parts)
+                right = max(part[2] for part in parts)
+                bottom = max(part[3] for part in parts)
+                if len(parts) == 1:
+                    return self._grab_rect(left, top, right, bottom)
+                
+                image = np.zeros((bottom - top, right - left, 4), dtype=np.uint8)
+                for part in parts:
+                    px1, py1, px2, py2 = part
+                    image[py1 - top:py2 - top, px1 - left:px2 - left] = self._grab_rect(*part)
+                return image
             
-            # Вырезание нужной области
-            area_screenshot = full_screenshot.crop((x1, y1, x2, y2))
-            area_screenshot.save(screenshot_path)
+            # PIL на Windows и X11 захватывает весь рабочий стол и обрезает его;
+            # all_screens нужен для областей на дополнительных мониторах
+            from PIL import ImageGrab
+            screenshot = ImageGrab.grab(bbox=(x1, y1, x2, y2), all_screens=True)
+            return cv2.cvtColor(np.asarray(screenshot.convert("RGB")), cv2.COLOR_RGB2BGR)
+        except Exception as e:
+            print(f"Ошибка при захвате области экрана: {e}")
+            return None
+    
+    def _grab_rect(self, x1, y1, x2, y2):
+        """Захват прямоугольника через mss"""
+        shot = self._get_mss().grab({"left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1})
+        # Буфер mss уже имеет раскладку BGRA, массив создается без копирования
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+    
+    def grab_fullscreen(self):
+        """
+        Захват всего виртуального рабочего стола в память
+        
+        Returns:
+            numpy.ndarray: изображение BGRA (mss) или BGR (PIL), None в случае ошибки
+        """
+        try:
+            if self.backend == self.BACKEND_MSS:
+                # Первый элемент списка mss - прямоугольник всех мониторов
+                monitor = self._get_mss().monitors[0]
+                return self.grab_area(
+                    monitor["left"], monitor["top"],
+                    monitor["left"] + monitor["width"], monitor["top"] + monitor["height"]
+                )
             
+            from PIL import ImageGrab
+            screenshot = ImageGrab.grab(all_screens=True)
+            return cv2.cvtColor(np.asarray(screenshot.convert("RGB")), cv2.COLOR_RGB2BGR)
+        except Exception as e:
+            print(f"Ошибка при захвате экрана: {e}")
+            return None
+    
+    def grab_window(self, window_handle):
+        """
+        Захват пикселей окна в память без захвата экрана (пока только X11)
+        
+        Args:
+            window_handle: идентификатор окна (из WindowManager.window_handles)
+        
+        Returns:
+            numpy.ndarray: изображение BGRA или None, если прямой захват окна
+                недоступен (тогда окно захватывается как область экрана)
+        """
+        if self.os_type != 'Linux':
+            return None
+        x11 = getattr(self._local, "x11", None)
+        if x11 is None:
+            # Соединение с X сервером открывается один раз на поток
+            from translator.utils.x11_capture import X11WindowCapture, XLIB_AVAILABLE
+            if not XLIB_AVAILABLE:
+                return None
+            x11 = self._local.x11 = X11WindowCapture()
+            with self._grabbers_lock:
+                self._grabbers.append(x11)
+        return x11.grab_window(window_handle)
+    
+    def _save(self, image, prefix):
+        """
+        Сохранение захваченного изображения во временный файл
+        
+        Returns:
+            str: путь к файлу или "" в случае ошибки
+        """
+        if image is None:
+            return ""
+        
+        with self._save_lock:
+            if self.temp_dir is None:
+                self.temp_dir = tempfile.mkdtemp(prefix="translator_")
+            self.screenshot_count += 1
+            screenshot_path = os.path.join(self.temp_dir, f"{prefix}_{self.screenshot_count}.png")
+        
+        try:
+            # imencode + tofile поддерживают пути с не-ASCII символами
+            ok, data = cv2.imencode(".png", image)
+            if not ok:
+                return ""
+            data.tofile(screenshot_path)
             return screenshot_path
         except Exception as e:
-            print(f"Ошибка при захвате области экрана: {e}")
+            print(f"Ошибка при сохранении скриншота: {e}")
             return ""
     
+    def capture_fullscreen(self):
+        """
+        Создание скриншота всего экрана
+        
+        Returns:
+            str: путь к файлу скриншота или "" в случае ошибки
+        """
+        return self._save(self.grab_fullscreen(), "fullscreen")
+    
+    def capture_area(self, x1, y1, x2, y2):
+        """
+        Создание скриншота указанной области экрана
+        
+        Args:
+            x1: координата X левого верхнего угла
+            y1: координата Y левого верхнего угла
+            x2: координата X правого нижнего угла
+            y2: координата Y правого нижнего угла
+        
+        Returns:
+            str: путь к файлу скриншота или "" в случае ошибки
+        """
+        # Захватывается только указанная область, а не весь экран
+        return self._save(self.grab_area(x1, y1, x2, y2), "area")
+    
     def capture_window(self, hwnd=None):
         """
         Создание скриншота указанного окна (только для Windows)
@@ -109,20 +303,13 @@ class ScreenCapture:
             hwnd: хендл окна для захвата
         
         Returns:
-            str: путь к файлу скриншота
+            str: путь к файлу скриншота или "" в случае ошибки
         """
         # Проверка ОС и наличия необходимых модулей
         if self.os_type != 'Windows' or not self.windows_modules_available:
             print("Захват окна доступен только на Windows с установленным pywin32")
             return self.capture_fullscreen()
         
-        # Генерация пути для сохранения скриншота
-        self.screenshot_count += 1
-        screenshot_path = os.path.join(
-            self.temp_dir, 
-            f"window_{int(time.time())}_{self.screenshot_count}.png"
-        )
-        
         try:
             import win32gui
             import win32con
@@ -156,6 +343,7 @@ class ScreenCapture:
             )
             
             # Конвертация в формат PIL
+            from PIL import Image
             bmpinfo = save_bitmap.GetInfo()
             bmpstr = save_bitmap.GetBitmapBits(True)
             img = Image.frombuffer(
@@ -164,31 +352,51 @@ class ScreenCapture:
                 bmpstr, 'raw', 'BGRX', 0, 1
             )
             
-            # Сохранение изображения
-            img.save(screenshot_path)
-            
             # Освобождение ресурсов
             save_dc.DeleteDC()
             mfc_dc.DeleteDC()
             win32gui.ReleaseDC(hwnd, hwnd_dc)
             win32gui.DeleteObject(save_bitmap.GetHandle())
             
-            return screenshot_path
+            # Сохранение изображения
+            return self._save(cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR), "window")
         except Exception as e:
             print(f"Ошибка при захвате окна: {e}")
             # В случае ошибки пробуем захватить весь экран
             return self.capture_fullscreen()
     
+    def release_thread(self):
+        """
+        Закрытие соединений захвата текущего потока
+        
+        Общий экземпляр используется многими потоками; завершающийся поток
+        освобождает только свои соединения, не затрагивая остальные.
+        """
+        grabbers = [getattr(self._local, name, None) for name in ("mss", "x11")]
+        grabbers = [grabber for grabber in grabbers if grabber is not None]
+        with self._grabbers_lock:
+            self._grabbers = [grabber for grabber in self._grabbers if grabber not in grabbers]
+        for grabber in grabbers:
+            try:
+                grabber.close()
+            except Exception as e:
+                print(f"Ошибка при закрытии захвата экрана: {e}")
+        self._local.mss = None
+        self._local.x11 = None
+    
     def cleanup(self):
-        """Очистка временных файлов"""
-        try:
-            # Удаление всех файлов во временной директории
-            for filename in os.listdir(self.temp_dir):
-                file_path = os.path.join(self.temp_dir, filename)
-                if os.path.isfile(file_path):
-                    os.unlink(file_path)
-            
-            # Удаление временной директории
-            os.rmdir(self.temp_dir)
-        except Exception as e:
-            print(f"Ошибка при очистке временных файлов: {e}") 
\ No newline at end of file
+        """Освобождение ресурсов захвата и удаление временных файлов"""
+        # Закрытие экземпляров mss всех потоков, выполнявших захват
+        with self._grabbers_lock:
+            grabbers, self._grabbers = self._grabbers, []
+        for grabber in grabbers:
+            try:
+                grabber.close()
+            except Exception as e:
+                print(f"Ошибка при закрытии захвата экрана: {e}")
+        self._local = threading.local()
+        
+        with self._save_lock:
+            temp_dir, self.temp_dir = self.temp_dir, None
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,112 @@
+"""
+Модуль стабилизации распознанного текста в режиме реального времени
+
+Субтитры появляются и исчезают плавно, и промежуточные кадры дают мусорный
+OCR. Текст передается на перевод, только когда он не меняется заданное
+количество кадров или заданное время, и только если он отличается от
+последнего переведенного.
+"""
+
+import difflib
+import re
+import time
+
+def normalize_text(text):
+    """
+    Нормализация текста для сравнения кадров
+
+    Схлопывает пробельные символы, приводит к нижнему регистру и убирает
+    знаки препинания по краям строки, которые OCR часто путает.
+    """
+    text = " ".join(text.split()).casefold()
+    return re.sub(r"^[\W_]+|[\W_]+$", "", text)
+
+class TextStabilizer:
+    """Отбор устоявшегося текста из последовательности результатов OCR"""
+
+    def __init__(self, min_frames=2, min_duration=0.5, similarity=0.9, clock=time.monotonic):
+        """
+        Инициализация
+
+        Args:
+            min_frames: количество кадров подряд с тем же текстом
+            min_duration: время в секундах, в течение которого текст не менялся
+                (текст считается устоявшимся при выполнении любого из условий)
+            similarity: минимальное сходство (0.0 - 1.0), при котором тексты
+                соседних кадров считаются одинаковыми (OCR одного и того же
+                субтитра может отличаться на символ)
+            clock: источник времени
+        """
+        self.min_frames = max(1, min_frames)
+        self.min_duration = min_duration
+        self.similarity = similarity
+        self.clock = clock
+
+        self.reset()
+
+        # Статистика для отображения экономии обращений к переводчику
+        self.emitted = 0
+        self.suppressed = 0
+
+    def reset(self):
+        """Сброс текущего и последнего переданного текста"""
+        self.candidate = ""
+        self.candidate_text = ""
+        self.candidate_frames = 0
+        self.candidate_since = None
+        self.candidate_done = False
+        self.last_emitted = None
+
+    def _same(self, first, second):
+        """Сравнение нормализованных текстов с допуском на ошибки OCR"""
+        if first == second:
+            return True
+        if not first or not second:
+            return False
+        return difflib.SequenceMatcher(None, first, second).ratio() >= self.similarity
+
+    def update(self, text, timestamp=None):
+        """
+        Учет результата OCR очередного кадра
+
+        Args:
+            text: распознанный текст ("" - текста нет)
+            timestamp: время кадра (по умолчанию - текущее)
+
+        Returns:
+            str: текст для перевода, если он только что устоялся и отличается
+                от последнего переведенного; иначе None
+        """
+        now = self.clock() if timestamp is None else timestamp
+        normalized = normalize_text(text)
+
+        if self.candidate_since is None or not self._same(normalized, self.candidate):
+            # Текст изменился: начинается отсчет для нового кандидата
+            self.candidate = normalized
+            self.candidate_frames = 0
+            self.candidate_since = now
+            self.candidate_done = False
+
+        self.candidate_frames += 1
+        # Сохраняется последний вариант текста: к концу появления субтитра
+        # он обычно распознан лучше всего
+        self.candidate_text = text
+
+        if self.candidate_done or not self.candidate:
+            return None
+
+        stable = (
+            self.candidate_frames >= self.min_frames
+            or (self.min_duration is not None and now - self.candidate_since >= self.min_duration)
+        )
+        if not stable:
+            return None
+
+        self.candidate_done = True
+        if self.last_emitted is not None and self._same(self.candidate, self.last_emitted):
+            self.suppressed += 1
+            return None
+
+        self.last_emitted = self.candidate
+        self.emitted += 1
+        return self.candidate_text
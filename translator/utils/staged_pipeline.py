@@ -0,0 +1,418 @@
+"""
+Модуль конвейера обработки с этапами, связанными ограниченными очередями
+
+Задание последовательно проходит этапы (например, захват, предварительная
+обработка, OCR, перевод и доставка результата). У каждого этапа своя очередь
+и свое количество потоков-обработчиков, поэтому этапы разных заданий
+выполняются одновременно: пока одно задание переводится, следующее уже
+распознается. Пропускная способность определяется самым медленным этапом.
+
+Очереди ограничены: когда очередь следующего этапа заполнена, обработчик
+ждет (обратное давление), и задания не накапливаются в памяти.
+
+Задание можно отменить: отмененное задание удаляется из конвейера перед
+следующим этапом, а этап, выполняющийся в момент отмены, прерывается
+в ближайшей точке проверки (см. translator.utils.cancellation).
+
+Результаты передаются получателю по мере готовности: после каждого этапа и
+из самих этапов (например, части перевода), а не только после последнего.
+Конвейер учитывает время до первого видимого пользователю результата и до
+полного результата.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+from translator.utils.cancellation import CancelledError, CancelToken
+
+# Признак остановки обработчика этапа
+_STOP = object()
+
+# Количество последних заданий, по которым считаются задержки
+LATENCY_HISTORY = 100
+
+def _percentile(values, fraction):
+    """Перцентиль по отсортированному списку (без интерполяции)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class Job:
+    """Задание конвейера: входные данные и результаты этапов в атрибутах"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, callback=None, progress=None, **data):
+        """
+        Создание задания
+
+        Args:
+            callback: функция callback(job), вызываемая последним этапом
+            progress: функция progress(job, stage), вызываемая после каждого
+                успешно выполненного этапа и для промежуточных результатов
+                этапов (см. notify)
+            data: входные данные задания (становятся атрибутами)
+        """
+        self.id = next(Job._ids)
+        self.token = CancelToken()
+        self.callback = callback
+        self.progress = progress
+        self.error = None
+        self.failed_stage = None
+        # Время выполнения этапов и ожидания в очередях в секундах, а также
+        # время от создания до первого результата (first_content)
+        self.timings = {}
+        self.created = time.monotonic()
+        self.queued_at = None
+        self.__dict__.update(data)
+
+    @property
+    def cancelled(self):
+        """True, если задание отменено"""
+        return self.token.cancelled
+
+    def cancel(self):
+        """Отмена задания: оставшиеся этапы не выполняются, результат не доставляется"""
+        self.token.cancel()
+
+    def notify(self, stage):
+        """
+        Уведомление получателя о ходе задания: progress(job, stage)
+
+        Вызывается конвейером после этапа и функциями этапов для
+        промежуточных результатов. Отмененное задание не уведомляет, ошибка
+        получателя не прерывает обработку.
+        """
+        if self.progress is None or self.cancelled:
+            return
+        try:
+            self.progress(self, stage)
+        except Exception as e:
+            print(f"Ошибка при уведомлении о ходе задания: {e}")
+
+    def mark_content(self):
+        """Отметка появления первого результата, который увидит пользователь"""
+        self.timings.setdefault("first_content", time.monotonic() - self.created)
+
+    @property
+    def ok(self):
+        """True, если ни один этап не завершился ошибкой"""
+        return self.error is None
+
+    def fail(self, stage, error):
+        """
+        Отметка ошибки; оставшиеся этапы, кроме последнего, пропускаются
+
+        Args:
+            stage: имя этапа
+            error: сообщение или исключение
+        """
+        self.failed_stage = stage
+        self.error = str(error) or error.__class__.__name__
+
+class Stage:
+    """Этап конвейера: функция обработки, очередь и счетчики"""
+
+    def __init__(self, name, func, workers=1, queue_size=4, on_exit=None):
+        """
+        Описание этапа
+
+        Args:
+            name: имя этапа
+            func: функция func(job), изменяющая задание; исключение отмечает
+                задание как завершившееся ошибкой
+            workers: количество потоков-обработчиков
+            queue_size: размер входной очереди
+            on_exit: функция без аргументов, вызываемая в потоке обработчика
+                при его завершении (например, для закрытия соединений потока)
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.on_exit = on_exit
+
+        self._lock = threading.Lock()
+        self.active = 0
+        self.processed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.busy_time = 0.0
+
+    def record(self, elapsed, failed):
+        """Учет обработанного задания"""
+        with self._lock:
+            self.processed += 1
+            self.busy_time += elapsed
+            if failed:
+                self.failed += 1
+
+    def record_cancelled(self):
+        """Учет задания, отмененного до или во время этапа"""
+        with self._lock:
+            self.cancelled += 1
+
+class StagedPipeline:
+    """Конвейер этапов с ограниченными очередями и потоками-обработчиками"""
+
+    def __init__(self, stages, name="Pipeline"):
+        """
+        Инициализация (потоки запускаются при первой отправке задания)
+
+        Args:
+            stages: список Stage в порядке обработки; последний этап получает
+                и задания, завершившиеся ошибкой на предыдущих этапах
+            name: префикс имен потоков
+        """
+        if not stages:
+            raise ValueError("Конвейер должен содержать хотя бы один этап")
+        self.stages = list(stages)
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._threads = []
+        self._started = False
+        self._closed = False
+        self.in_flight = 0
+        # Задержки последних заданий: до первого результата и до полного
+        self._latencies = {
+            "first_content": deque(maxlen=LATENCY_HISTORY),
+            "total": deque(maxlen=LATENCY_HISTORY)
+        }
+
+    def start(self):
+        """Запуск потоков-обработчиков всех этапов"""
+        with self._lock:
+            if self._started:
+                return
+            if self._closed:
+                raise RuntimeError("Конвейер остановлен")
+            self._started = True
+            for index, stage in enumerate(self.stages):
+                for worker in range(stage.workers):
+                    thread = threading.Thread(
+                        target=self._work, args=(index,),
+                        name=f"{self.name}-{stage.name}-{worker}", daemon=True
+                    )
+                    thread.start()
+                    self._threads.append((index, thread))
+
+    def submit(self, job, block=True, timeout=None):
+        """
+        Отправка задания на первый этап
+
+        Args:
+            job: Job
+            block: ждать места в очереди первого этапа
+            timeout: максимальное время ожидания
+
+        Returns:
+            Job: отправленное задание
+
+        Raises:
+            queue.Full: очередь первого этапа заполнена (block=False или
+                истек timeout)
+        """
+        self.start()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Конвейер остановлен")
+            self.in_flight += 1
+        job.queued_at = time.monotonic()
+        try:
+            self.stages[0].queue.put(job, block, timeout)
+        except queue.Full:
+            self._finished()
+            raise
+        return job
+
+    def _finished(self):
+        """Учет задания, покинувшего конвейер"""
+        with self._lock:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.notify_all()
+
+    def _forward(self, index, job):
+        """Передача задания следующему этапу (или последнему при ошибке)"""
+        last = len(self.stages) - 1
+        if index == last:
+            self._finished()
+            return
+        next_index = index + 1 if job.ok else last
+        job.queued_at = time.monotonic()
+        # Блокирующая запись: заполненная очередь останавливает предыдущий этап
+        self.stages[next_index].queue.put(job)
+
+    def _work(self, index):
+        """Цикл обработчика этапа"""
+        stage = self.stages[index]
+        last = index == len(self.stages) - 1
+        try:
+            while True:
+                job = stage.queue.get()
+                if job is _STOP:
+                    break
+                job.timings[f"{stage.name}_wait"] = time.monotonic() - job.queued_at
+
+                # Отмененное задание покидает конвейер без доставки результата
+                if job.cancelled:
+                    stage.record_cancelled()
+                    self._finished()
+                    continue
+
+                if job.ok or last:
+                    if last:
+                        # Задержка учитывается до доставки результата, чтобы
+                        # получатель уже видел ее в latency_stats
+                        self._record_latency(job)
+                    with stage._lock:
+                        stage.active += 1
+                    started = time.monotonic()
+                    try:
+                        stage.func(job)
+                    except CancelledError:
+                        job.cancel()
+                    except Exception as e:
+                        job.fail(stage.name, e)
+                    elapsed = time.monotonic() - started
+                    job.timings[stage.name] = elapsed
+                    with stage._lock:
+                        stage.active -= 1
+                    if job.cancelled:
+                        stage.record_cancelled()
+                        self._finished()
+                        continue
+                    stage.record(elapsed, not job.ok)
+
+                    if not last and job.ok:
+                        job.notify(stage.name)
+
+                self._forward(index, job)
+        finally:
+            if stage.on_exit is not None:
+                try:
+                    stage.on_exit()
+                except Exception as e:
+                    print(f"Ошибка при завершении обработчика этапа {stage.name}: {e}")
+
+    def _record_latency(self, job):
+        """Учет задержек задания, дошедшего до последнего этапа"""
+        total = time.monotonic() - job.created
+        with self._lock:
+            self._latencies["total"].append(total)
+            # Без промежуточных результатов первым становится полный
+            self._latencies["first_content"].append(job.timings.get("first_content", total))
+
+    def latency_stats(self):
+        """
+        Задержки последних заданий
+
+        Returns:
+            dict: {"first_content" | "total": {"count", "p50", "p95"}} в секундах
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": len(values),
+                    "p50": _percentile(values, 0.5) if values else 0.0,
+                    "p95": _percentile(values, 0.95) if values else 0.0
+                }
+                for name, values in self._latencies.items()
+            }
+
+    def queue_depths(self):
+        """
+        Количество заданий, ожидающих в очередях этапов
+
+        Returns:
+            dict: {имя этапа: количество заданий в очереди}
+        """
+        return {stage.name: stage.queue.qsize() for stage in self.stages}
+
+    def stats(self):
+        """
+        Состояние этапов
+
+        Returns:
+            list: словари с именем этапа, количеством обработчиков, глубиной
+                и размером очереди, числом занятых обработчиков, обработанных
+                заданий, ошибок, отмененных заданий и средним временем
+                обработки в секундах
+        """
+        result = []
+        for stage in self.stages:
+            with stage._lock:
+                processed = stage.processed
+                result.append({
+                    "stage": stage.name,
+                    "workers": stage.workers,
+                    "depth": stage.queue.qsize(),
+                    "capacity": stage.queue.maxsize,
+                    "active": stage.active,
+                    "processed": processed,
+                    "failed": stage.failed,
+                    "cancelled": stage.cancelled,
+                    "average": stage.busy_time / processed if processed else 0.0
+                })
+        return result
+
+    def format_stats(self):
+        """Строка состояния: очереди и занятость этапов, задержки заданий"""
+        stages = ", ".join(
+            f"{item['stage']}: {item['depth']}/{item['capacity']} "
+            f"({item['active']}/{item['workers']} заняты)"
+            for item in self.stats()
+        )
+        latency = self.latency_stats()
+        if not latency["total"]["count"]:
+            return stages
+        return (
+            f"{stages}; первый результат: {latency['first_content']['p50']:.2f} с, "
+            f"полный: {latency['total']['p50']:.2f} с (медиана)"
+        )
+
+    def join(self, timeout=None):
+        """
+        Ожидание обработки всех отправленных заданий
+
+        Returns:
+            bool: True, если конвейер пуст
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self.in_flight == 0, timeout)
+
+    def stop(self, wait=True):
+        """
+        Остановка конвейера после обработки отправленных заданий
+
+        Этапы останавливаются по порядку: обработчики этапа завершаются после
+        того, как передали свои задания дальше.
+
+        Args:
+            wait: дождаться завершения обработчиков (иначе остановка
+                выполняется в фоновом потоке)
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._started
+
+        def shutdown():
+            for index, stage in enumerate(self.stages):
+                for _ in range(stage.workers):
+                    stage.queue.put(_STOP)
+                for stage_index, thread in self._threads:
+                    if stage_index == index:
+                        thread.join()
+
+        if not started:
+            return
+        if wait:
+            shutdown()
+        else:
+            threading.Thread(target=shutdown, name=f"{self.name}-stop", daemon=True).start()
@@ -0,0 +1,109 @@
+"""
+Модуль для поиска областей с текстом на изображении
+"""
+
+import cv2
+import numpy as np
+
+class TextRegionDetector:
+    """Класс для поиска текстовых блоков с помощью морфологического анализа строк"""
+
+    def __init__(self, min_width=8, min_height=6, padding=4, max_regions=64):
+        """
+        Инициализация детектора текстовых областей
+
+        Args:
+            min_width: минимальная ширина блока в пикселях
+            min_height: минимальная высота блока в пикселях
+            padding: отступ, добавляемый вокруг найденного блока
+            max_regions: максимальное количество блоков (при превышении
+                изображение выгоднее распознавать целиком)
+        """
+        self.min_width = min_width
+        self.min_height = min_height
+        self.padding = padding
+        self.max_regions = max_regions
+
+    def detect(self, image):
+        """
+        Поиск текстовых блоков на изображении
+
+        Args:
+            image: изображение в виде массива NumPy (оттенки серого или BGR)
+
+        Returns:
+            list: список кортежей (x, y, width, height) в порядке чтения
+        """
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape
+
+        # Морфологический градиент выделяет контуры символов независимо от
+        # того, светлый текст на темном фоне или наоборот
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, kernel)
+        _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+        # Горизонтальное замыкание склеивает символы одной строки в полосу
+        line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(9, width // 80), 1))
+        lines = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, line_kernel)
+
+        # Вертикальное замыкание на величину межстрочного интервала
+        # объединяет соседние строки в абзацы
+        line_contours, _ = cv2.findContours(lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        line_heights = [cv2.boundingRect(c)[3] for c in line_contours]
+        line_height = int(np.median(line_heights)) if line_heights else 0
+        block_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(3, line_height)))
+        blocks = cv2.morphologyEx(lines, cv2.MORPH_CLOSE, block_kernel)
+
+        contours, _ = cv2.findContours(blocks, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        regions = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if w < self.min_width or h < self.min_height:
+                continue
+
+            # Отсеиваем графику: у текстовой полосы заметная, но не сплошная
+            # доля контурных пикселей
+            fill_ratio = cv2.countNonZero(binary[y:y + h, x:x + w]) / float(w * h)
+            if fill_ratio < 0.05 or fill_ratio > 0.9:
+                continue
+
+            x1 = max(0, x - self.padding)
+            y1 = max(0, y - self.padding)
+            x2 = min(width, x + w + self.padding)
+            y2 = min(height, y + h + self.padding)
+            regions.append((x1, y1, x2 - x1, y2 - y1))
+
+        return self.sort_reading_order(regions)
+
+    @staticmethod
+    def sort_reading_order(regions):
+        """
+        Сортировка блоков в порядке чтения (сверху вниз, слева направо)
+
+        Args:
+            regions: список кортежей (x, y, width, height)
+
+        Returns:
+            list: отсортированный список блоков
+        """
+        if not regions:
+            return []
+
+        # Блоки, верхние границы которых отличаются меньше чем на половину
+        # медианной высоты, считаются одной строкой
+        median_height = float(np.median([h for _, _, _, h in regions]))
+        tolerance = max(1.0, median_height / 2)
+
+        rows = []
+        for region in sorted(regions, key=lambda r: r[1]):
+            if rows and region[1] - rows[-1][0] <= tolerance:
+                rows[-1][1].append(region)
+            else:
+                rows.append([region[1], [region]])
+
+        ordered = []
+        for _, row in rows:
+            ordered.extend(sorted(row, key=lambda r: r[0]))
+        return ordered
@@ -4,7 +4,9 @@
 
 import os
 import sys
+import time
 import platform
+import threading
 
 # Обнаружение операционной системы
 OS_TYPE = platform.system()
@@ -22,7 +24,9 @@ if OS_TYPE == 'Windows':
 elif OS_TYPE == 'Linux':
     try:
         import Xlib
+        import Xlib.X
         import Xlib.display
+        import Xlib.error
     except ImportError:
         print("Для работы с окнами на Linux необходимо установить библиотеку python-xlib.")
         print("Выполните команду: pip install python-xlib")
@@ -33,23 +37,182 @@ elif OS_TYPE == 'Darwin':  # MacOS
         print("Для работы с окнами на MacOS необходимо установить библиотеку pyobjc.")
         print("Выполните команду: pip install pyobjc")
 
+class _X11WindowWatcher:
+    """
+    Поддержание списка окон X11 по событиям
+    
+    Поток слушает PropertyNotify корневого окна (изменение _NET_CLIENT_LIST)
+    и окон приложений (изменение заголовка), а также ConfigureNotify и
+    DestroyNotify окон приложений, и обновляет индекс WindowManager.
+    Перечисление окон выполняется только при изменении их списка.
+    """
+    
+    def __init__(self, manager):
+        self.manager = manager
+        self.display = Xlib.display.Display()
+        self.root = self.display.screen().root
+        self.client_list_atom = self.display.intern_atom('_NET_CLIENT_LIST')
+        self.title_atoms = (
+            self.display.intern_atom('_NET_WM_NAME'),
+            self.display.intern_atom('WM_NAME')
+        )
+        self.utf8_atom = self.display.intern_atom('UTF8_STRING')
+        self.titles = {}
+        self.thread = None
+    
+    @property
+    def running(self):
+        """True, пока поток обработки событий работает"""
+        return self.thread is not None and self.thread.is_alive()
+    
+    def start(self):
+        """Построение индекса и запуск потока обработки событий"""
+        self.root.change_attributes(event_mask=Xlib.X.PropertyChangeMask)
+        self.refresh_clients()
+        self.thread = threading.Thread(target=self.run, name="X11WindowWatcher", daemon=True)
+        self.thread.start()
+    
+    def window_title(self, window):
+        """Заголовок окна (_NET_WM_NAME в UTF-8 или WM_NAME)"""
+        prop = window.get_full_property(self.title_atoms[0], self.utf8_atom)
+        if prop and prop.value:
+            value = prop.value
+            return value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+        return window.get_wm_name()
+    
+    def refresh_clients(self):
+        """Обновление индекса по _NET_CLIENT_LIST"""
+        prop = self.root.get_full_property(self.client_list_atom, Xlib.X.AnyPropertyType)
+        window_ids = list(prop.value) if prop else []
+        
+        titles = {}
+        for window_id in window_ids:
+            if window_id in self.titles:
+                titles[window_id] = self.titles[window_id]
+                continue
+            # Новое окно: подписка на изменения заголовка и геометрии
+            try:
+                window = self.display.create_resource_object('window', window_id)
+                window.change_attributes(event_mask=Xlib.X.PropertyChangeMask | Xlib.X.StructureNotifyMask)
+                titles[window_id] = self.window_title(window)
+            except Xlib.error.XError:
+                # Окно закрылось во время перечисления
+                continue
+        self.titles = titles
+        self.publish()
+    
+    def publish(self):
+        """Передача индекса в WindowManager"""
+        windows = []
+        handles = {}
+        for window_id, title in self.titles.items():
+            if title:
+                windows.append(title)
+                handles[title] = window_id
+        self.manager._set_index(windows, handles, set(self.titles))
+    
+    def run(self):
+        """Цикл обработки событий X11"""
+        try:
+            while True:
+                event = self.display.next_event()
+                if event.type == Xlib.X.PropertyNotify:
+                    if event.window.id == self.root.id:
+                        if event.atom == self.client_list_atom:
+                            self.refresh_clients()
+                    elif event.atom in self.title_atoms and event.window.id in self.titles:
+                        try:
+                            self.titles[event.window.id] = self.window_title(event.window)
+                        except Xlib.error.XError:
+                            continue
+                        self.publish()
+                elif event.type == Xlib.X.ConfigureNotify:
+                    self.manager._invalidate_geometry(event.window.id)
+                elif event.type == Xlib.X.DestroyNotify:
+                    if self.titles.pop(event.window.id, None) is not None:
+                        self.publish()
+        except Exception as e:
+            # После потери соединения WindowManager возвращается к перечислению
+            print(f"Ошибка при отслеживании окон X11: {e}")
+
 class WindowManager:
     """Класс для работы с окнами операционной системы"""
     
-    def __init__(self):
-        """Инициализация менеджера окон"""
+    # Время жизни списка окон на платформах без уведомлений об изменениях (секунды)
+    CACHE_TTL = 1.0
+    
+    def __init__(self, live=True):
+        """
+        Инициализация менеджера окон
+        
+        Args:
+            live: поддерживать список окон по событиям X11 (Linux), а не
+                перечислять окна при каждом запросе
+        """
         self.windows = []
         self.window_handles = {}
+        self._lock = threading.RLock()
+        self._listed_at = None
+        # Соединение с X сервером для запросов геометрии открывается один раз (Linux)
+        self._display = None
+        # Кэш геометрии окон (Linux): сбрасывается по ConfigureNotify
+        self._geometry = {}
+        
+        self._watcher = None
+        if live and OS_TYPE == 'Linux' and 'Xlib.display' in sys.modules:
+            try:
+                self._watcher = _X11WindowWatcher(self)
+                self._watcher.start()
+            except Exception as e:
+                print(f"Отслеживание окон X11 недоступно: {e}")
+                self._watcher = None
+    
+    @property
+    def live(self):
+        """True, если список окон обновляется по событиям"""
+        return self._watcher is not None and self._watcher.running
+    
+    def _set_index(self, windows, handles, window_ids):
+        """Замена индекса окон (вызывается потоком отслеживания)"""
+        with self._lock:
+            self.windows = windows
+            self.window_handles = handles
+            self._listed_at = time.monotonic()
+            for window_id in list(self._geometry):
+                if window_id not in window_ids:
+                    del self._geometry[window_id]
     
-    def get_window_list(self):
+    def _invalidate_geometry(self, window_id):
+        """Сброс кэша геометрии окна после его перемещения или изменения размера"""
+        with self._lock:
+            self._geometry.pop(window_id, None)
+    
+    def _get_display(self):
+        """Постоянное соединение с X сервером"""
+        if self._display is None:
+            self._display = Xlib.display.Display()
+        return self._display
+    
+    def get_window_list(self, force=False):
         """
         Получение списка всех окон в системе
         
+        Список поддерживается по событиям (Linux) или кэшируется на CACHE_TTL
+        секунд, поэтому повторные вызовы не перечисляют окна.
+        
+        Args:
+            force: перечислить окна заново
+        
         Returns:
-            list: список кортежей (имя_окна, хендл_окна)
+            list: список имен окон
         """
-        self.windows = []
-        self.window_handles = {}
+        with self._lock:
+            fresh = self._listed_at is not None and time.monotonic() - self._listed_at < self.CACHE_TTL
+            if not force and (self.live or fresh):
+                return list(self.windows)
+        
+        windows = []
+        window_handles = {}
         
         if OS_TYPE == 'Windows':
             # На Windows используем win32gui для получения всех окон
@@ -59,32 +222,37 @@ class WindowManager:
                     # Фильтрация служебных и пустых окон
                     if window_text and len(window_text) > 1 and window_text != "Program Manager" and window_text != "Рабочий стол":
                         # Добавляем окно в список
-                        self.windows.append(window_text)
-                        self.window_handles[window_text] = hwnd
+                        windows.append(window_text)
+                        window_handles[window_text] = hwnd
                 return True
             
             # Перечисление всех окон
             win32gui.EnumWindows(enum_windows_callback, [])
             
         elif OS_TYPE == 'Linux':
+            if self._watcher is not None and not self._watcher.running:
+                # Поток отслеживания завершился: дальше список перечисляется
+                self._watcher = None
             # На Linux используем Xlib для получения окон
             try:
-                display = Xlib.display.Display()
-                root = display.screen().root
-                
-                window_ids = root.get_full_property(
-                    display.intern_atom('_NET_CLIENT_LIST'),
-                    Xlib.X.AnyPropertyType
-                ).value
-                
-                for window_id in window_ids:
-                    window = display.create_resource_object('window', window_id)
-                    name = window.get_wm_name()
-                    if name:
-                        self.windows.append(name)
-                        self.window_handles[name] = window_id
+                with self._lock:
+                    display = self._get_display()
+                    root = display.screen().root
+                    
+                    window_ids = root.get_full_property(
+                        display.intern_atom('_NET_CLIENT_LIST'),
+                        Xlib.X.AnyPropertyType
+                    ).value
+                    
+                    for window_id in window_ids:
+                        window = display.create_resource_object('window', window_id)
+                        name = window.get_wm_name()
+                        if name:
+                            windows.append(name)
+                            window_handles[name] = window_id
             except Exception as e:
                 print(f"Ошибка при получении списка окон в Linux: {e}")
+                self._display = None
                 
         elif OS_TYPE == 'Darwin':  # MacOS
             # На MacOS используем AppKit
@@ -94,12 +262,33 @@ class WindowManager:
                 for app in running_apps:
                     app_name = app.localizedName()
                     if app_name:
-                        self.windows.append(app_name)
-                        self.window_handles[app_name] = app
+                        windows.append(app_name)
+                        window_handles[app_name] = app
             except Exception as e:
                 print(f"Ошибка при получении списка окон в MacOS: {e}")
         
-        return self.windows
+        with self._lock:
+            self.windows = windows
+            self.window_handles = window_handles
+            self._listed_at = time.monotonic()
+            self._geometry.clear()
+        return list(windows)
+    
+    def find_window(self, window_name):
+        """
+        Хендл окна по имени
+        
+        Индекс перечисляется заново, только если окна нет в нем и список не
+        поддерживается по событиям (окно могло появиться после перечисления).
+        
+        Returns:
+            хендл окна или None
+        """
+        handle = self.window_handles.get(window_name)
+        if handle is None and not self.live:
+            self.get_window_list()
+            handle = self.window_handles.get(window_name)
+        return handle
     
     def capture_window(self, window_name):
         """
@@ -111,11 +300,12 @@ class WindowManager:
         Returns:
             tuple: (x, y, width, height) координаты и размеры окна или None в случае ошибки
         """
-        if window_name not in self.window_handles:
+        handle = self.find_window(window_name)
+        if handle is None:
             return None
         
         if OS_TYPE == 'Windows':
-            hwnd = self.window_handles[window_name]
+            hwnd = handle
             try:
                 # Получение размеров и позиции окна
                 rect = win32gui.GetWindowRect(hwnd)
@@ -126,17 +316,27 @@ class WindowManager:
                 return None
                 
         elif OS_TYPE == 'Linux':
-            window_id = self.window_handles[window_name]
-            try:
-                display = Xlib.display.Display()
-                window = display.create_resource_object('window', window_id)
-                geometry = window.get_geometry()
-                x, y = geometry.x, geometry.y
-                width, height = geometry.width, geometry.height
-                return (x, y, width, height)
-            except Exception as e:
-                print(f"Ошибка при получении размеров окна: {e}")
-                return None
+            window_id = handle
+            with self._lock:
+                geometry = self._geometry.get(window_id)
+                # Без отслеживания событий кэш не сбрасывается, поэтому не используется
+                if geometry is not None and self.live:
+                    return geometry
+                try:
+                    display = self._get_display()
+                    window = display.create_resource_object('window', window_id)
+                    geometry = window.get_geometry()
+                    # Координаты get_geometry отсчитываются от родительского окна
+                    # (рамки оконного менеджера), поэтому переводятся в экранные
+                    origin = window.translate_coords(display.screen().root, 0, 0)
+                    x, y = -origin.x, -origin.y
+                    width, height = geometry.width, geometry.height
+                    self._geometry[window_id] = (x, y, width, height)
+                    return (x, y, width, height)
+                except Exception as e:
+                    print(f"Ошибка при получении размеров окна: {e}")
+                    self._display = None
+                    return None
                 
         elif OS_TYPE == 'Darwin':  # MacOS
             # На MacOS получение размеров окна может быть сложнее
@@ -156,7 +356,7 @@ class WindowManager:
         Returns:
             bool: True в случае успеха, False в случае ошибки
         """
-        if window_name not in self.window_handles:
+        if self.find_window(window_name) is None:
             return False
         
         if OS_TYPE == 'Windows':
@@ -184,4 +384,20 @@ class WindowManager:
                 print(f"Ошибка при выводе окна на передний план: {e}")
                 return False
         
-        return False 
\ No newline at end of file
+        return False 
+
+_window_manager = None
+_window_manager_lock = threading.Lock()
+
+def get_window_manager():
+    """
+    Общий для приложения менеджер окон (создается при первом обращении)
+    
+    Returns:
+        WindowManager: менеджер окон
+    """
+    global _window_manager
+    with _window_manager_lock:
+        if _window_manager is None:
+            _window_manager = WindowManager()
+        return _window_manager
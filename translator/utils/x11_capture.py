@@ -0,0 +1,162 @@
+"""
+Модуль прямого захвата окон на Linux (X11)
+
+Пиксели окна читаются запросом GetImage к самому окну, а не вырезаются из
+снимка экрана: объем передаваемых данных равен размеру окна, а перекрытие
+окна другими окнами не попадает в снимок при включенном композитинге.
+Соединение с X сервером открывается один раз и используется повторно.
+
+При use_shm окно захватывается как область корневого окна через mss
+(XShmGetImage): данные передаются через разделяемую память без копирования
+по сокету, но в снимок попадают перекрывающие окно окна.
+"""
+
+import threading
+
+import numpy as np
+
+try:
+    import Xlib.X
+    import Xlib.display
+    import Xlib.error
+    XLIB_AVAILABLE = True
+except ImportError:
+    XLIB_AVAILABLE = False
+
+class X11WindowCapture:
+    """Захват окон X11 по идентификатору окна"""
+
+    def __init__(self, use_shm=False, display_name=None):
+        """
+        Инициализация
+
+        Args:
+            use_shm: захватывать область экрана под окном через разделяемую
+                память (XShmGetImage), а не пиксели самого окна
+            display_name: имя дисплея (по умолчанию - из переменной DISPLAY)
+        """
+        self.use_shm = use_shm
+        self.display_name = display_name
+        self._display = None
+        self._root = None
+        self._mss = None
+        # Соединение Xlib не потокобезопасно
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """True, если python-xlib установлен и X сервер доступен"""
+        if not XLIB_AVAILABLE:
+            return False
+        try:
+            with self._lock:
+                self._get_display()
+            return True
+        except Exception:
+            return False
+
+    def _get_display(self):
+        """Постоянное соединение с X сервером (открывается при первом обращении)"""
+        if self._display is None:
+            self._display = Xlib.display.Display(self.display_name)
+            self._root = self._display.screen().root
+        return self._display
+
+    def _reset(self):
+        """Закрытие соединения после ошибки; следующий захват откроет новое"""
+        if self._display is not None:
+            try:
+                self._display.close()
+            except Exception:
+                pass
+        self._display = None
+        self._root = None
+
+    def window_geometry(self, window_id):
+        """
+        Положение и размер окна в координатах экрана
+
+        Args:
+            window_id: идентификатор окна X11
+
+        Returns:
+            tuple: (x, y, width, height) или None в случае ошибки
+        """
+        with self._lock:
+            try:
+                return self._geometry(window_id)[1]
+            except Exception as e:
+                print(f"Ошибка при получении размеров окна: {e}")
+                self._reset()
+                return None
+
+    def _geometry(self, window_id):
+        """Окно и его прямоугольник в координатах корневого окна"""
+        display = self._get_display()
+        window = display.create_resource_object("window", window_id)
+        geometry = window.get_geometry()
+        # get_geometry возвращает координаты относительно родителя (рамки
+        # оконного менеджера), поэтому они пересчитываются в экранные
+        origin = window.translate_coords(self._root, 0, 0)
+        return window, (-origin.x, -origin.y, geometry.width, geometry.height)
+
+    def grab_window(self, window_id):
+        """
+        Захват окна в память
+
+        Args:
+            window_id: идентификатор окна X11
+
+        Returns:
+            numpy.ndarray: изображение BGRA или None в случае ошибки (окно
+                закрыто, свернуто или имеет неподдерживаемую глубину цвета)
+        """
+        if not XLIB_AVAILABLE:
+            return None
+        with self._lock:
+            try:
+                window, (x, y, width, height) = self._geometry(window_id)
+                if width <= 0 or height <= 0:
+                    return None
+                if self.use_shm:
+                    return self._grab_shm(x, y, width, height)
+                return self._grab_direct(window, width, height)
+            except Xlib.error.BadMatch:
+                # Окно не отображается (свернуто или не на экране)
+                return None
+            except Exception as e:
+                print(f"Ошибка при захвате окна X11: {e}")
+                self._reset()
+                return None
+
+    def _grab_direct(self, window, width, height):
+        """Чтение пикселей окна запросом GetImage"""
+        reply = window.get_image(0, 0, width, height, Xlib.X.ZPixmap, 0xFFFFFFFF)
+        # Глубины 24 и 32 передаются по 4 байта на пиксель в порядке BGRX
+        if reply.depth not in (24, 32):
+            print(f"Неподдерживаемая глубина цвета окна: {reply.depth}")
+            return None
+        data = reply.data if isinstance(reply.data, bytes) else bytes(reply.data)
+        if len(data) != width * height * 4:
+            return None
+        return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+
+    def _grab_shm(self, x, y, width, height):
+        """Захват области экрана под окном через XShmGetImage (mss)"""
+        if self._mss is None:
+            import mss
+            factory = getattr(mss, "MSS", None) or mss.mss
+            self._mss = factory(display=self.display_name) if self.display_name else factory()
+        shot = self._mss.grab({"left": x, "top": y, "width": width, "height": height})
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self):
+        """Закрытие соединений с X сервером"""
+        with self._lock:
+            self._reset()
+            if self._mss is not None:
+                try:
+                    self._mss.close()
+                except Exception:
+                    pass
+                self._mss = None